@@ -1,4 +1,7 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import connections, models
+
+from apps.accounts.signals import user_pair_changed
 
 
 class UserManager(BaseUserManager):
@@ -31,3 +34,60 @@ class UserManager(BaseUserManager):
             raise ValueError("Superuser must have is_superuser=True.")
 
         return self._create_user(email, password, **extra_fields)
+
+
+class UserPairManager(models.Manager):
+    """
+    Manager of models relating two users, whose rows are identified by the
+    pair of users, e.g. ContentPermit.objects.toggle(grantor=a, grantee=b).
+    """
+
+    def _pair_sql(self, pair):
+        columns = [self.model._meta.get_field(name).column for name in pair]
+        values = [getattr(user, "pk", user) for user in pair.values()]
+        return columns, values
+
+    def add(self, **pair):
+        """Insert the row of the pair unless it exists, in one statement."""
+        columns, values = self._pair_sql(pair)
+        with connections["default"].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO {table} ({columns}, created) "
+                "VALUES ({placeholders}, NOW()) "
+                "ON CONFLICT DO NOTHING".format(
+                    table=self.model._meta.db_table,
+                    columns=", ".join(columns),
+                    placeholders=", ".join(["%s"] * len(values)),
+                ),
+                values,
+            )
+            inserted = cursor.rowcount > 0
+        if inserted:
+            user_pair_changed.send(sender=self.model, pair=pair)
+
+    def toggle(self, **pair):
+        """
+        Delete the row of the pair, or insert it if there was none, in one
+        statement. Returns whether the row was inserted.
+        """
+        columns, values = self._pair_sql(pair)
+        with connections["default"].cursor() as cursor:
+            cursor.execute(
+                "WITH deleted AS ("
+                "DELETE FROM {table} WHERE {condition} RETURNING 1"
+                ") "
+                "INSERT INTO {table} ({columns}, created) "
+                "SELECT {placeholders}, NOW() "
+                "WHERE NOT EXISTS (SELECT 1 FROM deleted) "
+                "ON CONFLICT DO NOTHING "
+                "RETURNING 1".format(
+                    table=self.model._meta.db_table,
+                    condition=" AND ".join(f"{column} = %s" for column in columns),
+                    columns=", ".join(columns),
+                    placeholders=", ".join(["%s"] * len(values)),
+                ),
+                values + values,
+            )
+            inserted = cursor.fetchone() is not None
+        user_pair_changed.send(sender=self.model, pair=pair)
+        return inserted
@@ -0,0 +1,107 @@
+# Generated by Django 2.2.28 on 2026-10-17 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# (model, JSON list field of User, field of the list's owner, field of the listed user)
+PAIRS = [
+    ("ContentPermit", "content_permits", "grantor_id", "grantee_id"),
+    ("PerformancePermit", "performance_permits", "grantor_id", "grantee_id"),
+    ("ConnectionPin", "connections_list", "user_id", "pinned_id"),
+]
+
+
+def copy_lists_to_tables(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    db_alias = schema_editor.connection.alias
+    user_ids = set(User.objects.using(db_alias).values_list("id", flat=True))
+
+    for model_name, list_field, owner_field, listed_field in PAIRS:
+        model = apps.get_model("accounts", model_name)
+        rows = []
+        for owner_id, listed_ids in (
+            User.objects.using(db_alias).values_list("id", list_field).iterator()
+        ):
+            for listed_id in set(listed_ids or []):
+                # lists may hold ids of deleted users
+                if listed_id in user_ids and listed_id != owner_id:
+                    rows.append(
+                        model(**{owner_field: owner_id, listed_field: listed_id})
+                    )
+        model.objects.using(db_alias).bulk_create(
+            rows, batch_size=1000, ignore_conflicts=True
+        )
+
+
+def copy_tables_to_lists(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    db_alias = schema_editor.connection.alias
+
+    for model_name, list_field, owner_field, listed_field in PAIRS:
+        model = apps.get_model("accounts", model_name)
+        lists = {}
+        for owner_id, listed_id in (
+            model.objects.using(db_alias)
+            .order_by("created", "id")
+            .values_list(owner_field, listed_field)
+        ):
+            lists.setdefault(owner_id, [])
+            lists[owner_id].append(listed_id)
+        for owner_id, listed_ids in lists.items():
+            User.objects.using(db_alias).filter(id=owner_id).update(
+                **{list_field: listed_ids}
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0023_auto_20231221_1537'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerformancePermit',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('grantee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='received_performance_permits', to=settings.AUTH_USER_MODEL)),
+                ('grantor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='granted_performance_permits', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Performance Permit',
+                'verbose_name_plural': 'Performance Permits',
+                'unique_together': {('grantor', 'grantee')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ContentPermit',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('grantee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='received_content_permits', to=settings.AUTH_USER_MODEL)),
+                ('grantor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='granted_content_permits', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Content Permit',
+                'verbose_name_plural': 'Content Permits',
+                'unique_together': {('grantor', 'grantee')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ConnectionPin',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('pinned', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='connection_pins', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Connection Pin',
+                'verbose_name_plural': 'Connection Pins',
+                'unique_together': {('user', 'pinned')},
+            },
+        ),
+        migrations.RunPython(copy_lists_to_tables, reverse_code=copy_tables_to_lists),
+    ]
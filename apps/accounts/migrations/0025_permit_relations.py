@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-17 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_permit_tables'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='connections_list',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='content_permits',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='performance_permits',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='pinned_connections',
+            field=models.ManyToManyField(blank=True, related_name='pinned_by', through='accounts.ConnectionPin', to=settings.AUTH_USER_MODEL, verbose_name='Pinned Connections'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='content_permits',
+            field=models.ManyToManyField(blank=True, related_name='content_permitted_by', through='accounts.ContentPermit', to=settings.AUTH_USER_MODEL, verbose_name='Content Permits'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='performance_permits',
+            field=models.ManyToManyField(blank=True, related_name='performance_permitted_by', through='accounts.PerformancePermit', to=settings.AUTH_USER_MODEL, verbose_name='Performance Permissions'),
+        ),
+    ]
@@ -7,7 +7,7 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Q
 
-from apps.accounts.managers import UserManager
+from apps.accounts.managers import UserManager, UserPairManager
 
 DEFAULT_KEYBOARD_SIZE = 49
 # Supported keyboard choices
@@ -123,75 +123,131 @@ class User(AbstractBaseUser, PermissionsMixin):
     #         message=f"Your AnalyticPiano password is: {self.raw_password}",
     #     )
 
-    # TODO: convert these to One-to-Many fields
-    # sets aren't JSON serializable, but if performance proves too poor and a 1-M field isn't practical,
-    #   revert these fields back to sets and add lots of getters and setters to convert from array -> set and back
-
-    content_permits = JSONField(
-        default=list, verbose_name="Content Permits", blank=True
+    content_permits = models.ManyToManyField(
+        "self",
+        through="ContentPermit",
+        through_fields=("grantor", "grantee"),
+        symmetrical=False,
+        related_name="content_permitted_by",
+        blank=True,
+        verbose_name="Content Permits",
     )
-    # list of users with permission to access the User's content
-
-    performance_permits = JSONField(
-        default=list, verbose_name="Performance Permissions", blank=True
+    # users with permission to access the User's content
+
+    performance_permits = models.ManyToManyField(
+        "self",
+        through="PerformancePermit",
+        through_fields=("grantor", "grantee"),
+        symmetrical=False,
+        related_name="performance_permitted_by",
+        blank=True,
+        verbose_name="Performance Permissions",
     )
-    # list of users with permission to access the User's performances
-
-    connections_list = JSONField(
-        default=list, verbose_name="Connections List", blank=True
+    # users with permission to access the User's performances
+
+    pinned_connections = models.ManyToManyField(
+        "self",
+        through="ConnectionPin",
+        through_fields=("user", "pinned"),
+        symmetrical=False,
+        related_name="pinned_by",
+        blank=True,
+        verbose_name="Pinned Connections",
     )
 
     @property
     def connections(self):
         _listed_connections = User.objects.filter(
-            Q(id__in=self.connections_list)
-            | Q(id__in=self.content_permits)
-            | Q(id__in=self.performance_permits)
-            | Q(content_permits__contains=self.id)
-            | Q(performance_permits__contains=self.id)
+            Q(pk__in=ConnectionPin.objects.filter(user=self).values("pinned"))
+            | Q(pk__in=ContentPermit.objects.filter(grantor=self).values("grantee"))
+            | Q(pk__in=PerformancePermit.objects.filter(grantor=self).values("grantee"))
+            | Q(pk__in=ContentPermit.objects.filter(grantee=self).values("grantor"))
+            | Q(pk__in=PerformancePermit.objects.filter(grantee=self).values("grantor"))
         )
         return _listed_connections
 
+    def permits_content_to(self, other_user):
+        return ContentPermit.objects.filter(grantor=self, grantee=other_user).exists()
+
+    def permits_performances_to(self, other_user):
+        return PerformancePermit.objects.filter(
+            grantor=self, grantee=other_user
+        ).exists()
+
     def toggle_content_permit(self, other_user):  # new
         if self.id == other_user.id:
             return
-        second_party = int(other_user.id)
-        if second_party in self.content_permits:
-            self.content_permits.remove(second_party)
-        else:
-            self.content_permits.append(second_party)
-        self.save()
+        ContentPermit.objects.toggle(grantor=self, grantee=other_user)
 
     def toggle_performance_permit(self, other_user):  # new
         if self.id == other_user.id:
             return
-        second_party = int(other_user.id)
-        if second_party in self.performance_permits:
-            self.performance_permits.remove(second_party)
-        else:
-            self.performance_permits.append(second_party)
-        self.save()
+        PerformancePermit.objects.toggle(grantor=self, grantee=other_user)
 
     def pin_connection(self, other_user):  # new
         if self.id == other_user.id:
             return
-        second_party = int(other_user.id)
-        if second_party not in self.connections_list:
-            self.connections_list.append(second_party)
-        else:
-            self.connections_list.remove(second_party)
-            self.connections_list.append(second_party)
-        self.save()
+        ConnectionPin.objects.add(user=self, pinned=other_user)
 
     def toggle_connection_pin(self, other_user):  # new
         if self.id == other_user.id:
             return
-        second_party = int(other_user.id)
-        if second_party in self.connections_list:
-            self.connections_list.remove(second_party)
-        else:
-            self.connections_list.append(second_party)
-        self.save()
+        ConnectionPin.objects.toggle(user=self, pinned=other_user)
+
+
+class ContentPermit(models.Model):
+    """`grantor` lets `grantee` access their content."""
+
+    grantor = models.ForeignKey(
+        User, related_name="granted_content_permits", on_delete=models.CASCADE
+    )
+    grantee = models.ForeignKey(
+        User, related_name="received_content_permits", on_delete=models.CASCADE
+    )
+    created = models.DateTimeField("Created", auto_now_add=True)
+
+    objects = UserPairManager()
+
+    class Meta:
+        verbose_name = "Content Permit"
+        verbose_name_plural = "Content Permits"
+        unique_together = (("grantor", "grantee"),)
+
+
+class PerformancePermit(models.Model):
+    """`grantor` lets `grantee` access their performances."""
+
+    grantor = models.ForeignKey(
+        User, related_name="granted_performance_permits", on_delete=models.CASCADE
+    )
+    grantee = models.ForeignKey(
+        User, related_name="received_performance_permits", on_delete=models.CASCADE
+    )
+    created = models.DateTimeField("Created", auto_now_add=True)
+
+    objects = UserPairManager()
+
+    class Meta:
+        verbose_name = "Performance Permit"
+        verbose_name_plural = "Performance Permits"
+        unique_together = (("grantor", "grantee"),)
+
+
+class ConnectionPin(models.Model):
+    """`user` pinned `pinned` to their connections."""
+
+    user = models.ForeignKey(
+        User, related_name="connection_pins", on_delete=models.CASCADE
+    )
+    pinned = models.ForeignKey(User, related_name="+", on_delete=models.CASCADE)
+    created = models.DateTimeField("Created", auto_now_add=True)
+
+    objects = UserPairManager()
+
+    class Meta:
+        verbose_name = "Connection Pin"
+        verbose_name_plural = "Connection Pins"
+        unique_together = (("user", "pinned"),)
 
 
 class Group(models.Model):
@@ -0,0 +1,81 @@
+from django.db.models import BooleanField, Exists, OuterRef, Value
+from django.utils.functional import cached_property
+
+from apps.accounts.models import ContentPermit, PerformancePermit
+
+
+class PermissionResolver:
+    """
+    What the user of a request may view, given the permits they were granted.
+
+    The permits are loaded once per request, so that checks on single objects
+    are answered from memory, and lists of users are annotated in SQL.
+    Attached to requests as `request.permissions` (see harmony.middleware).
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def content_grantor_ids(self):
+        """Ids of the users who permit the user to view their content."""
+        if not self.user.is_authenticated:
+            return frozenset()
+        return frozenset(
+            ContentPermit.objects.filter(grantee=self.user).values_list(
+                "grantor_id", flat=True
+            )
+        )
+
+    @cached_property
+    def performance_grantor_ids(self):
+        """Ids of the users who permit the user to view their performances."""
+        if not self.user.is_authenticated:
+            return frozenset()
+        return frozenset(
+            PerformancePermit.objects.filter(grantee=self.user).values_list(
+                "grantor_id", flat=True
+            )
+        )
+
+    def can_view(self, obj):
+        """Whether the user may view an exercise, playlist or course."""
+        if obj.is_public:
+            return True
+        if not self.user.is_authenticated:
+            return False
+        return (
+            obj.authored_by_id == self.user.pk
+            or obj.authored_by_id in self.content_grantor_ids
+        )
+
+    def can_view_performances(self, performer):
+        """Whether the user may view the performances of `performer`."""
+        if not self.user.is_authenticated:
+            return False
+        return (
+            performer.pk == self.user.pk
+            or performer.pk in self.performance_grantor_ids
+        )
+
+    def annotate_access(self, users):
+        """
+        Annotate a queryset of users with whether they permit the user to
+        view their content (`content_access`) and their performances
+        (`performance_access`), for lists of users.
+        """
+        if not self.user.is_authenticated:
+            return users.annotate(
+                content_access=Value(False, output_field=BooleanField()),
+                performance_access=Value(False, output_field=BooleanField()),
+            )
+        return users.annotate(
+            content_access=Exists(
+                ContentPermit.objects.filter(grantor=OuterRef("pk"), grantee=self.user)
+            ),
+            performance_access=Exists(
+                PerformancePermit.objects.filter(
+                    grantor=OuterRef("pk"), grantee=self.user
+                )
+            ),
+        )
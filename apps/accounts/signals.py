@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent by UserPairManager when it inserts or deletes the row of a pair of
+# users, since its single-statement SQL sends no post_save/post_delete.
+# `sender` is the model, `pair` the users by field name, e.g.
+# {"grantor": a, "grantee": b}.
+user_pair_changed = Signal(providing_args=["pair"])
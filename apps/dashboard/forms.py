@@ -384,6 +384,26 @@ class ManyField(ModelMultipleChoiceField):
         return parsed_value
 
 
+def in_bulk_pairs(form, field_name, model, value_pairs):
+    """
+    The (ID, through data) pairs of a ManyField as (instance, through data)
+    pairs, fetched in one query. Unknown IDs are form errors.
+    """
+    instances = model.objects.in_bulk(
+        [value_pair[0] for value_pair in value_pairs], field_name="id"
+    )
+    unknown_ids = [
+        value_pair[0] for value_pair in value_pairs if value_pair[0] not in instances
+    ]
+    if unknown_ids:
+        form.add_error(field_name, f"Unknown ID(s): {', '.join(map(str, unknown_ids))}")
+    return [
+        (instances[value_pair[0]], value_pair[1])
+        for value_pair in value_pairs
+        if value_pair[0] in instances
+    ]
+
+
 class DashboardPlaylistForm(PlaylistForm):
     editable_fields = ["is_public"]
 
@@ -443,10 +463,9 @@ class DashboardPlaylistForm(PlaylistForm):
     )
 
     def clean(self):
-        self.cleaned_data["exercises"] = [
-            (Exercise.objects.get(id=value_pair[0]), value_pair[1])
-            for value_pair in self.cleaned_data["exercises"]
-        ]
+        self.cleaned_data["exercises"] = in_bulk_pairs(
+            self, "exercises", Exercise, self.cleaned_data["exercises"]
+        )
         return super().clean()
 
     def save(self, commit=True):
@@ -536,10 +555,9 @@ class DashboardCourseForm(CourseForm):
         )
         self.cleaned_data["visible_to"] = Group.objects.filter(pk__in=visible_to_ids)
 
-        self.cleaned_data["playlists"] = [
-            (Playlist.objects.get(id=value_pair[0]), value_pair[1])
-            for value_pair in self.cleaned_data["playlists"]
-        ]
+        self.cleaned_data["playlists"] = in_bulk_pairs(
+            self, "playlists", Playlist, self.cleaned_data["playlists"]
+        )
         for value_pair in self.cleaned_data["playlists"]:
             if (
                 "publish_date" in value_pair[1]
@@ -584,7 +602,7 @@ class BaseDashboardGroupForm(forms.ModelForm):
         user = kwargs.pop("user")
         super(forms.ModelForm, self).__init__(*args, **kwargs)
         self.fields["members"].queryset = User.objects.filter(
-            performance_permits__contains=user.pk
+            performance_permits=user
         )
         if self.instance.pk != None:
             self.fields["members"].queryset = self.fields[
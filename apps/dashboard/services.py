@@ -0,0 +1,320 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    FilteredRelation,
+    Max,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Concat, Upper
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from apps.accounts.models import Group, User
+from apps.exercises.models import CourseProgress, PlaylistCourseOrdered
+
+
+class CourseActivityMatrix:
+    """
+    Performers by playlists of a course with their pass marks, for the
+    course activity table.
+
+    The columns take two queries, and the rows are a single annotated
+    queryset of performers, so that the table sorts and paginates them
+    in the database.
+    """
+
+    def __init__(
+        self, course, author, group_ids=None, min_unit_num=None, max_unit_num=None
+    ):
+        self.course = course
+        self.author = author
+        self.group_ids = group_ids or []
+        self.min_unit_num = min_unit_num
+        self.max_unit_num = max_unit_num
+
+    @cached_property
+    def is_compiled(self):
+        """
+        False for courses graded before CourseProgress, whose progress is
+        yet to be rebuilt by the gradebook job queued by migration 0062.
+        """
+        return (
+            not self.course.performance_dict
+            or CourseProgress.objects.filter(course=self.course).exists()
+        )
+
+    @cached_property
+    def performer_filter(self):
+        # course's performers + author
+        performers = Q(pk__in=self.author.content_permits.values("pk"))
+        if self.group_ids:
+            performers &= Q(
+                pk__in=User.objects.filter(
+                    participant_groups__id__in=self.group_ids
+                ).values("pk")
+            )
+        return performers | Q(pk=self.author.pk)
+
+    @cached_property
+    def columns(self):
+        """
+        (playlist pk, playlist id, verbose name) of the playlists performed in the
+        course: those in the course by unit number, then those since
+        removed from it, by id.
+        """
+        pcos = PlaylistCourseOrdered.objects.filter(course=self.course)
+        filtered_unit_num = self.min_unit_num or self.max_unit_num
+        if self.min_unit_num:
+            pcos = pcos.filter(order__gte=self.min_unit_num)
+        if self.max_unit_num:
+            pcos = pcos.filter(order__lte=self.max_unit_num)
+        orders = dict(pcos.values_list("playlist_id", "order"))
+
+        performed = (
+            CourseProgress.objects.filter(
+                course=self.course,
+                user__in=User.objects.filter(self.performer_filter).values("pk"),
+            )
+            .values_list("playlist_id", "playlist__id")
+            .distinct()
+        )
+        columns = [
+            (playlist_pk, playlist_id)
+            for playlist_pk, playlist_id in performed
+            # playlists no longer in the course are filtered out by unit number
+            if playlist_pk in orders or not filtered_unit_num
+        ]
+        columns.sort(
+            key=lambda column: (
+                0 if column[0] in orders else 1,
+                orders.get(column[0], 0),
+                column[1],
+            )
+        )
+        return [
+            (
+                playlist_pk,
+                playlist_id,
+                f"#{orders[playlist_pk]}" if playlist_pk in orders else playlist_id,
+            )
+            for playlist_pk, playlist_id in columns
+        ]
+
+    @cached_property
+    def groups_by_performer(self):
+        """Names of the course's groups, filtered or not, of each performer."""
+        groups = self.course.visible_to.all()
+        if self.group_ids:
+            groups = groups.filter(id__in=self.group_ids)
+        groups_by_performer = {}
+        for performer_id, group_name in (
+            Group.members.through.objects.filter(group__in=groups)
+            .values_list("user_id", "group__name")
+            .order_by("group__name")
+        ):
+            groups_by_performer.setdefault(performer_id, [])
+            groups_by_performer[performer_id].append(group_name)
+        return groups_by_performer
+
+    @cached_property
+    def rows(self):
+        """
+        The performers annotated with their pass mark per column, the count
+        of each pass mark, their score and their time spent in the course.
+        """
+        column_pks = [playlist_pk for playlist_pk, _, _ in self.columns]
+        in_columns = Q(course_progress_in_course__playlist_id__in=column_pks)
+        credit = {
+            "P": self.course.timely_credit,
+            "C": self.course.timely_credit,
+            "T": self.course.tardy_credit,
+            "L": self.course.late_credit,
+        }
+
+        performers = User.objects.annotate(
+            course_progress_in_course=FilteredRelation(
+                "course_progress",
+                condition=Q(course_progress__course=self.course),
+            )
+        ).filter(self.performer_filter)
+        if not self.group_ids:
+            # omit performers who have zero performances for this course
+            performers = performers.filter(
+                Q(course_progress_in_course__isnull=False) | Q(pk=self.author.pk)
+            )
+
+        return performers.annotate(
+            # author with special name formatting to bring it to the top/bottom when sorting
+            performer_first_name=Case(
+                When(
+                    pk=self.author.pk,
+                    then=Concat(Value("*"), Upper("first_name"), Value("*")),
+                ),
+                default=F("first_name"),
+            ),
+            performer_last_name=Case(
+                When(
+                    pk=self.author.pk,
+                    then=Concat(Value("*"), Upper("last_name"), Value("*")),
+                ),
+                default=F("last_name"),
+            ),
+            time_elapsed=Coalesce(
+                Sum("course_progress_in_course__time_elapsed"), Value(0.0)
+            ),
+            score=Sum(
+                Case(
+                    *[
+                        When(
+                            in_columns & Q(course_progress_in_course__pass_mark=mark),
+                            then=Value(points),
+                        )
+                        for mark, points in credit.items()
+                    ],
+                    default=Value(0),
+                    output_field=DecimalField(),
+                )
+            ),
+            **{
+                f"count_{mark}": Count(
+                    "course_progress_in_course",
+                    filter=in_columns
+                    & Q(course_progress_in_course__pass_mark=mark),
+                )
+                for mark in CourseProgress.PASS_MARKS_WORST_TO_BEST
+            },
+            **{
+                playlist_id: Max(
+                    "course_progress_in_course__pass_mark",
+                    filter=Q(course_progress_in_course__playlist_id=playlist_pk),
+                )
+                for playlist_pk, playlist_id, _ in self.columns
+            },
+        ).order_by("performer_last_name", "performer_first_name")
+
+    def records(self, chunk_size=2000):
+        """
+        The header, then a list of values per row, for export. The rows are
+        read through a server-side cursor `chunk_size` at a time.
+        """
+        yield [
+            "Surname",
+            "Given name",
+            "Email",
+            "Group(s)",
+            "Score",
+            "Time (seconds)",
+            *[verbose_name for _, _, verbose_name in self.columns],
+        ]
+        for performer in self.rows.iterator(chunk_size=chunk_size):
+            yield [
+                performer.last_name,
+                performer.first_name,
+                performer.email,
+                ", ".join(self.groups_by_performer.get(performer.pk, [])),
+                round(performer.score, 1),
+                round(performer.time_elapsed),
+                *[
+                    getattr(performer, playlist_id) or ""
+                    for _, playlist_id, _ in self.columns
+                ],
+            ]
+
+
+def through_value(through_model, field_name, value):
+    """
+    `value` of a field of `through_model` as it reads back from the
+    database, e.g. a date string as a datetime, and a naive datetime made
+    aware as per DateTimeField.get_prep_value, so that unchanged rows
+    compare equal.
+    """
+    value = through_model._meta.get_field(field_name).to_python(value)
+    if isinstance(value, datetime) and settings.USE_TZ and timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_default_timezone())
+    return value
+
+
+def apply_memberships(through_model, owner_field, owner, member_field, pairs):
+    """
+    Make the rows of `through_model` for `owner` those of `pairs`, the
+    (member, through data) pairs cleaned by a ManyField, e.g.
+    apply_memberships(ExercisePlaylistOrdered, "playlist", playlist,
+    "exercise", [(exercise, {"order": 1}), ...]).
+
+    The current rows are read once and compared with the pairs; then, in a
+    transaction, new rows are inserted with bulk_create, changed rows
+    updated with bulk_update and the others deleted with one DELETE. As
+    with update_or_create per pair, a member listed twice gets the data of
+    its last pair. No signals are sent. Returns the numbers of rows
+    created, updated and deleted.
+    """
+    wanted = {}
+    for member, through_data in pairs:
+        wanted[member.pk] = (
+            member,
+            {
+                field: through_value(through_model, field, value)
+                for field, value in through_data.items()
+            },
+        )
+
+    with transaction.atomic():
+        current = {}
+        stale_pks = []
+        for row in (
+            through_model.objects.filter(**{owner_field: owner})
+            .select_for_update()
+            .order_by("pk")
+        ):
+            member_pk = getattr(row, f"{member_field}_id")
+            if member_pk in current:
+                stale_pks.append(row.pk)  # duplicate of the member
+            else:
+                current[member_pk] = row
+
+        created, updated, update_fields = [], [], set()
+        for member_pk, (member, through_data) in wanted.items():
+            row = current.pop(member_pk, None)
+            if row is None:
+                created.append(
+                    through_model(
+                        **{owner_field: owner, member_field: member}, **through_data
+                    )
+                )
+                continue
+            changed_fields = [
+                field
+                for field, value in through_data.items()
+                if getattr(row, field) != value
+            ]
+            for field in changed_fields:
+                setattr(row, field, through_data[field])
+            if changed_fields:
+                updated.append(row)
+                update_fields.update(changed_fields)
+        stale_pks.extend(row.pk for row in current.values())
+
+        if created:
+            through_model.objects.bulk_create(created)
+        if updated:
+            through_model.objects.bulk_update(updated, sorted(update_fields))
+        if stale_pks:
+            with connections["default"].cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM {table} WHERE {pk} = ANY(%s)".format(
+                        table=through_model._meta.db_table,
+                        pk=through_model._meta.pk.column,
+                    ),
+                    [stale_pks],
+                )
+
+    return len(created), len(updated), len(stale_pks)
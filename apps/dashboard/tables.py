@@ -66,59 +66,52 @@ class ConnectionsTable(tables.Table):
         orderable=False,
     )
 
+    # the permits are annotated on each connection (see connections_view)
+
     def render_last_name(self, record):
-        if (
-            self.request.user.id in record["other"].content_permits
-            or self.request.user.id in record["other"].performance_permits
-        ):
+        if not record["other"].no_access:
             return record["other"].last_name
         else:
             return ""
 
     def render_first_name(self, record):
-        if (
-            self.request.user.id in record["other"].content_permits
-            or self.request.user.id in record["other"].performance_permits
-        ):
+        if not record["other"].no_access:
             return record["other"].first_name
         else:
             return ""
 
     def render_signup_date(self, record):
-        if (
-            self.request.user.id in record["other"].content_permits
-            or self.request.user.id in record["other"].performance_permits
-        ):
+        if not record["other"].no_access:
             return record["other"].date_joined
         else:
             return ""
 
     def render_toggle_content_permit(self, record):
-        if int(record["other"].id) in self.request.user.content_permits:
+        if record["other"].content_permit:
             return "YES"
         else:
             return "no"
         return ""
 
     def render_toggle_performance_permit(self, record):
-        if int(record["other"].id) in self.request.user.performance_permits:
+        if record["other"].performance_permit:
             return "YES"
         else:
             return "no"
         return ""
 
     def render_content_access(self, record):
-        if self.request.user.id in record["other"].content_permits:
+        if record["other"].content_access:
             return "Courses"
         return ""
 
     def render_performance_access(self, record):
-        if self.request.user.id in record["other"].performance_permits:
+        if record["other"].performance_access:
             return "Performances"
         return ""
 
     def render_pinned(self, record):
-        if int(record["other"].id) in self.request.user.connections_list:
+        if record["other"].pinned:
             return "YES"
         else:
             return "no"
@@ -620,30 +613,12 @@ class CourseActivityTable(tables.Table):
         return rendered_time
 
     def render_result_count(self, record):
-        result_count = {"P": 0, "C": 0, "T": 0, "L": 0, "X": 0}
-        for key, value in record.items():
-            if value in result_count:
-                result_count[value] += 1
         return format_html(
-            f"{result_count['X']} {x_element} / {result_count['P']} {p_element} / {result_count['C']} {c_element} / {result_count['T']} {t_element} / {result_count['L']} {l_element}"
+            f"{record.count_X} {x_element} / {record.count_P} {p_element} / {record.count_C} {c_element} / {record.count_T} {t_element} / {record.count_L} {l_element}"
         )
 
     def render_score(self, record):
-        timely_credit = self.course.timely_credit
-        tardy_credit = self.course.tardy_credit
-        late_credit = self.course.late_credit
-        result_count = {"P": 0, "C": 0, "T": 0, "L": 0, "X": 0}
-        for key, value in record.items():
-            if value in result_count:
-                result_count[value] += 1
-        score = (
-            result_count["P"] * timely_credit
-            + result_count["C"] * timely_credit
-            + result_count["T"] * tardy_credit
-            + result_count["L"] * late_credit
-        )
-        # make this column orderable
-        return round(score, 1)
+        return round(record.score, 1)
 
 
 class GroupsListTable(tables.Table):
@@ -705,7 +680,8 @@ class GroupMembersTable(tables.Table):
     )
 
     def render_performance_access(self, record):
-        return self.request.user.id in record["member"].performance_permits
+        # annotated by the view, see get_members_table
+        return record["member"].performance_access
 
     class Meta:
         attrs = {"class": "paleblue"}
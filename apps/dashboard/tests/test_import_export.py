@@ -0,0 +1,41 @@
+import csv
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.exercises.tests.utils import create_exercise, create_user
+
+
+class ExerciseExportViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author@example.com")
+        cls.exercise = create_exercise(cls.author, is_public=True)
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def export(self, export_format):
+        response = self.client.get(
+            reverse("dashboard:export-exercises"), {"format": export_format}
+        )
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_values_are_native(self):
+        lines = self.export("ndjson").splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual(record["id"], self.exercise.id)
+        self.assertEqual(record["authored_by"], "author@example.com")
+        self.assertEqual(record["data"], self.exercise.data)
+        self.assertIs(record["is_public"], True)
+        self.assertIs(record["locked"], False)
+
+    def test_csv_values_are_text(self):
+        header, row = csv.reader(self.export("csv").splitlines())
+        record = dict(zip(header, row))
+        self.assertEqual(json.loads(record["data"]), self.exercise.data)
+        self.assertEqual(record["is_public"], "1")
+        self.assertEqual(record["locked"], "0")
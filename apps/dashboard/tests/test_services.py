@@ -0,0 +1,214 @@
+from datetime import datetime
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import ContentPermit, Group, User
+from apps.dashboard.services import (
+    CourseActivityMatrix,
+    apply_memberships,
+    through_value,
+)
+from apps.exercises.models import CourseProgress, PlaylistCourseOrdered
+from apps.exercises.tests.utils import create_course, create_playlist
+from apps.jobs.models import Job
+
+
+class CourseActivityMatrixQueriesTest(TestCase):
+    page_size = 35
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("author@example.com")
+        cls.course = create_course(cls.author)
+        cls.group = Group.objects.create(name="Group", manager=cls.author)
+        cls.course.visible_to.add(cls.group)
+
+    def setUp(self):
+        self.performers = []
+        self.playlists = []
+
+    def grow(self, performers, playlists):
+        """Add performers and playlists, with progress in every playlist."""
+        num = len(self.performers)
+        new_performers = [
+            User.objects.create_user(f"performer{num + i}@example.com")
+            for i in range(performers)
+        ]
+        ContentPermit.objects.bulk_create(
+            [
+                ContentPermit(grantor=self.author, grantee=performer)
+                for performer in new_performers
+            ]
+        )
+        self.group.members.add(*new_performers)
+        self.performers.extend(new_performers)
+
+        num = len(self.playlists)
+        new_playlists = [create_playlist(self.author) for _ in range(playlists)]
+        PlaylistCourseOrdered.objects.bulk_create(
+            [
+                PlaylistCourseOrdered(course=self.course, playlist=playlist, order=order)
+                for order, playlist in enumerate(new_playlists, num + 1)
+            ]
+        )
+        self.playlists.extend(new_playlists)
+
+        CourseProgress.objects.filter(course=self.course).delete()
+        CourseProgress.objects.bulk_create(
+            [
+                CourseProgress(
+                    course=self.course, user=performer, playlist=playlist, pass_mark="P"
+                )
+                for performer in self.performers
+                for playlist in self.playlists
+            ]
+        )
+
+    def build(self, **kwargs):
+        """Read the matrix as the course activity view and its export do."""
+        matrix = CourseActivityMatrix(self.course, self.author, **kwargs)
+        self.assertTrue(matrix.is_compiled)
+        page = list(matrix.rows[: self.page_size])
+        records = list(matrix.records())
+        return matrix, page, records
+
+    def assert_constant_queries(self, **kwargs):
+        self.grow(performers=2, playlists=1)
+        with CaptureQueriesContext(connection) as queries:
+            _, page, records = self.build(**kwargs)
+        self.assertEqual(len(page), 3)  # with the author
+        self.assertEqual(len(records), 4)  # with the header
+
+        self.grow(performers=40, playlists=6)
+        with self.assertNumQueries(len(queries)):
+            matrix, page, records = self.build(**kwargs)
+        self.assertEqual(len(matrix.columns), 7)
+        self.assertEqual(len(page), self.page_size)
+        self.assertEqual(len(records), 44)
+
+    def test_constant_queries(self):
+        self.assert_constant_queries()
+
+    def test_constant_queries_by_group(self):
+        self.assert_constant_queries(group_ids=[self.group.id])
+
+
+class CourseActivityMatrixCompiledTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("author@example.com")
+        cls.playlist = create_playlist(cls.author)
+
+    def test_new_course(self):
+        course = create_course(self.author)
+        self.assertTrue(CourseActivityMatrix(course, self.author).is_compiled)
+
+    def test_legacy_course(self):
+        course = create_course(
+            self.author, performance_dict={"Joe - joe@example.com": {"PA00AA": "P"}}
+        )
+        self.assertFalse(CourseActivityMatrix(course, self.author).is_compiled)
+        # the rebuild is queued by migration, not by reading the matrix
+        self.assertFalse(Job.objects.exists())
+
+        CourseProgress.objects.create(
+            course=course, user=self.author, playlist=self.playlist, pass_mark="P"
+        )
+        self.assertTrue(CourseActivityMatrix(course, self.author).is_compiled)
+
+
+class ThroughValueTest(SimpleTestCase):
+    def test_naive_datetime_made_aware(self):
+        value = through_value(PlaylistCourseOrdered, "due_date", datetime(2024, 10, 1))
+        self.assertFalse(timezone.is_naive(value))
+        self.assertEqual(
+            value,
+            timezone.make_aware(datetime(2024, 10, 1), timezone.get_default_timezone()),
+        )
+
+    def test_values_as_read_back(self):
+        self.assertEqual(through_value(PlaylistCourseOrdered, "order", "3"), 3)
+        self.assertIsNone(through_value(PlaylistCourseOrdered, "publish_date", None))
+
+
+class ApplyMembershipsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("author@example.com")
+        cls.course = create_course(cls.author)
+        cls.playlists = [create_playlist(cls.author) for _ in range(3)]
+
+    def apply(self, *pairs):
+        return apply_memberships(
+            PlaylistCourseOrdered, "course", self.course, "playlist", pairs
+        )
+
+    def assert_rows(self, *rows):
+        self.assertEqual(
+            list(
+                PlaylistCourseOrdered.objects.filter(course=self.course)
+                .order_by("order")
+                .values_list("playlist_id", "order")
+            ),
+            [(playlist.pk, order) for playlist, order in rows],
+        )
+
+    def test_insert(self):
+        self.assertEqual(
+            self.apply(
+                (self.playlists[0], {"order": 1}), (self.playlists[1], {"order": 2})
+            ),
+            (2, 0, 0),
+        )
+        self.assert_rows((self.playlists[0], 1), (self.playlists[1], 2))
+
+    def test_unchanged(self):
+        # dates as cleaned by DashboardCourseForm: naive, while stored aware
+        pairs = [
+            (
+                playlist,
+                {
+                    "order": order,
+                    "due_date": datetime(2024, 10, order),
+                    "publish_date": None,
+                },
+            )
+            for order, playlist in enumerate(self.playlists, 1)
+        ]
+        self.assertEqual(self.apply(*pairs), (3, 0, 0))
+        self.assertEqual(self.apply(*pairs), (0, 0, 0))
+
+    def test_update(self):
+        self.apply((self.playlists[0], {"order": 1}), (self.playlists[1], {"order": 2}))
+        self.assertEqual(
+            self.apply(
+                (self.playlists[0], {"order": 1}), (self.playlists[1], {"order": 3})
+            ),
+            (0, 1, 0),
+        )
+        self.assert_rows((self.playlists[0], 1), (self.playlists[1], 3))
+
+    def test_delete(self):
+        self.apply((self.playlists[0], {"order": 1}), (self.playlists[1], {"order": 2}))
+        self.assertEqual(self.apply((self.playlists[1], {"order": 2})), (0, 0, 1))
+        self.assert_rows((self.playlists[1], 2))
+
+    def test_duplicate_member(self):
+        # as with update_or_create per pair, the last pair wins
+        self.assertEqual(
+            self.apply(
+                (self.playlists[0], {"order": 1}), (self.playlists[0], {"order": 2})
+            ),
+            (1, 0, 0),
+        )
+        self.assert_rows((self.playlists[0], 2))
+
+        # as do stored duplicates, of which the extra rows are deleted
+        PlaylistCourseOrdered.objects.create(
+            course=self.course, playlist=self.playlists[0], order=3
+        )
+        self.assertEqual(self.apply((self.playlists[0], {"order": 2})), (0, 0, 1))
+        self.assert_rows((self.playlists[0], 2))
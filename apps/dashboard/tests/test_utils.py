@@ -0,0 +1,13 @@
+from django.test import SimpleTestCase
+
+from apps.dashboard.utils import escape_formula
+
+
+class EscapeFormulaTest(SimpleTestCase):
+    def test_formulas_are_quoted(self):
+        for value in ["=HYPERLINK(A1)", "+1", "-1+1", "@SUM(A1)", "\t=1", "\r=1"]:
+            self.assertEqual(escape_formula(value), f"'{value}")
+
+    def test_other_values_are_kept(self):
+        for value in ["Smith", "", "#1", 12, -1.5, None]:
+            self.assertEqual(escape_formula(value), value)
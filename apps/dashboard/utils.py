@@ -0,0 +1,19 @@
+# characters which make spreadsheet applications read a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value):
+    """
+    Prefix text values which start like a formula with a quote, so that
+    exported user input such as names is not run by spreadsheets.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+class Echo:
+    """A file-like object whose writes return the written value, for csv.writer."""
+
+    def write(self, value):
+        return value
@@ -6,6 +6,7 @@ from django_tables2 import RequestConfig
 from django.db.models.functions import Concat
 from django.db.models import F, Value, CharField, Case, Value, When, BooleanField
 
+from apps.accounts.models import ConnectionPin, ContentPermit, PerformancePermit
 from apps.dashboard.forms import (
     AddConnectionForm,
     RemoveConnectionConfirmationForm,
@@ -22,14 +23,7 @@ from apps.exercises.models import Course
 
 @login_required
 def courses_by_others_view(request):
-    visible_users = User.objects.filter(
-        Q(content_permits__contains=request.user.id)
-    ).distinct()
-
-    visible_courses = Course.objects.filter(
-        Q(visible_to__members__id__contains=request.user.id) | Q(open=True),
-        authored_by__in=visible_users,
-    ).distinct()
+    visible_courses = Course.objects.filter(visibility__viewer=request.user)
 
     visible_course_table = CoursesByOthersTable(visible_courses)
     RequestConfig(request).configure(visible_course_table)
@@ -44,13 +38,18 @@ def courses_by_others_view(request):
 @login_required
 def connections_view(request):
     # initial solution for desired ordering of connections table
-    q1 = Q(id__in=request.user.connections_list)
-    q2 = Q(id__in=request.user.content_permits)
-    q3 = Q(id__in=request.user.performance_permits)
-    q4 = Q(content_permits__contains=request.user.id)
-    q5 = Q(performance_permits__contains=request.user.id)
+    q1 = Q(id__in=ConnectionPin.objects.filter(user=request.user).values("pinned"))
+    q2 = Q(id__in=ContentPermit.objects.filter(grantor=request.user).values("grantee"))
+    q3 = Q(
+        id__in=PerformancePermit.objects.filter(grantor=request.user).values("grantee")
+    )
+    # content_access and performance_access: whether the connection permits
+    # the user to view their content and performances
+    connections = request.permissions.annotate_access(request.user.connections)
+    q4 = Q(content_access=True)
+    q5 = Q(performance_access=True)
 
-    connections = User.objects.filter(id__in=request.user.connections).annotate(
+    connections = connections.annotate(
         combined_info=Concat(
             F("last_name"), # TO DO: do not expose this information to search unless q4 or q5
             Value(", "),
@@ -75,11 +74,11 @@ def connections_view(request):
             default=Value(False),
             output_field=BooleanField(),
         ),
-        content_access=Case(
-            When(q4, then=Value(True)),
+        content_permit=Case(
+            When(q2, then=Value(True)),
             default=Value(False),
             output_field=BooleanField(),
-        )
+        ),
     ).order_by("-pinned", "-no_access", "-performance_permit", "-content_access", "-date_joined")
 
     combined_info_filter = ConnectionCombinedInfoFilter(
@@ -70,6 +70,19 @@ def parse_member(user):
     return {"name": str(user), "id": user.id}
 
 
+def get_members_table(request, group):
+    """The GroupMembersTable of `group`, which the group pages do not show yet."""
+    # performance_access is read by GroupMembersTable.render_performance_access
+    members = request.permissions.annotate_access(group.members.all()).order_by(
+        "last_name", "first_name"
+    )
+    table = GroupMembersTable(
+        [{"member": member, "group_id": group.id} for member in members]
+    )
+    RequestConfig(request, paginate=False).configure(table)
+    return table
+
+
 @login_required
 def group_edit_view(request, group_id):
     group = get_object_or_404(Group, id=group_id)
@@ -1,46 +1,137 @@
+import csv
+import json
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db import connection
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import (
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render_to_response
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
+from django.utils.encoding import force_str
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import FormView
 from django.views.generic.base import View
 from django_extensions.management.color import no_style
+from import_export.widgets import (
+    BooleanWidget,
+    FloatWidget,
+    IntegerWidget,
+    JSONWidget,
+    ManyToManyWidget,
+    SimpleArrayWidget,
+)
 from tablib import Dataset
 
 from apps.dashboard.forms import ContentImportForm
+from apps.dashboard.utils import Echo
 from apps.exercises.models import Exercise, Playlist, Course
 from apps.exercises.resources import ExerciseResource, PlaylistResource, CourseResource
 
 
+EXPORT_CHUNK_SIZE = 500
+
+# widgets of values which JSON holds as they are, rather than as CSV text
+NATIVE_WIDGETS = (
+    BooleanWidget,
+    FloatWidget,
+    IntegerWidget,
+    JSONWidget,
+    SimpleArrayWidget,
+)
+
+
 @method_decorator(login_required, name="dispatch")
 @method_decorator(csrf_exempt, name="dispatch")
 class BaseExportView(View):
+    """
+    Streams the rows of the resource, as CSV or, with `?format=ndjson`, as
+    one JSON object per line, loading EXPORT_CHUNK_SIZE objects at a time.
+    """
+
     resource_class = None
     model = None
     filename_prefix = None
+    formats = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
 
     def get(self, *args, **kwargs):
         assert self.resource_class is not None
         assert self.model is not None
         assert self.filename_prefix is not None
 
+        export_format = self.request.GET.get("format", "csv")
+        if export_format not in self.formats:
+            return HttpResponseBadRequest(f"Unknown export format: {export_format}")
+
         is_sample_file = self.request.GET.get("sample")
         if is_sample_file:
             objs = self.model.objects.none()
-            dataset = self.resource_class(is_sample=True).export(objs)
+            resource = self.resource_class(is_sample=True)
         else:
             objs = self.model.objects.filter(authored_by=self.request.user)
-            dataset = self.resource_class().export(objs)
-        response = HttpResponse(dataset.csv, content_type="text/csv")
+            resource = self.resource_class()
+
+        if export_format == "ndjson":
+            records = self.export_records(resource, objs)
+            content = (json.dumps(record) + "\n" for record in records)
+        else:
+            writer = csv.writer(Echo())
+            rows = self.export_rows(resource, objs)
+            content = (writer.writerow(row) for row in rows)
+        response = StreamingHttpResponse(
+            content, content_type=self.formats[export_format]
+        )
         filename = f'{self.filename_prefix}_{timezone.now().date() if not is_sample_file else "import_sample"}'
-        response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+        response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
         return response
 
+    def export_rows(self, resource, queryset):
+        """The headers, then the row of each object, as per resource.export."""
+        yield resource.get_export_headers()
+        for obj in self.iter_objects(resource, queryset):
+            yield resource.export_resource(obj)
+
+    def export_records(self, resource, queryset):
+        """The object of each row, by header, with native values where JSON has them."""
+        fields = resource.get_export_fields()
+        for obj in self.iter_objects(resource, queryset):
+            yield {
+                force_str(field.column_name): (
+                    field.get_value(obj)
+                    if isinstance(field.widget, NATIVE_WIDGETS)
+                    else resource.export_field(field, obj)
+                )
+                for field in fields
+            }
+
+    def iter_objects(self, resource, queryset):
+        queryset = queryset.select_related("authored_by").order_by("pk")
+        m2m_fields = [
+            field.attribute
+            for field in resource.get_export_fields()
+            if isinstance(field.widget, ManyToManyWidget)
+        ]
+        if not m2m_fields:
+            yield from queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            return
+
+        # iterator() ignores prefetch_related, so the objects are instead
+        # loaded by pages of primary keys, each with its own prefetch
+        queryset = queryset.prefetch_related(*m2m_fields)
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            page = list(page[:EXPORT_CHUNK_SIZE])
+            if not page:
+                return
+            yield from page
+            last_pk = page[-1].pk
+
 
 class ExerciseExportView(BaseExportView):
     resource_class = ExerciseResource
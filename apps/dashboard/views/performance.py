@@ -5,10 +5,11 @@ from django.shortcuts import get_object_or_404, render
 from django.utils.safestring import mark_safe
 from django_tables2 import RequestConfig, Column
 from datetime import datetime
+from functools import lru_cache
 import pytz
 
 from apps.dashboard.tables import MyActivityTable, MyActivityDetailsTable
-from apps.exercises.models import Course, PerformanceData, Playlist
+from apps.exercises.models import PerformanceData, Playlist
 from django.conf import settings
 
 User = get_user_model()
@@ -19,7 +20,7 @@ def performances_list_view(request, other_id=None):
     other_id = other_id or request.user.id
     other = get_object_or_404(User, id=other_id)
 
-    if request.user != other and not request.user.pk in other.performance_permits:
+    if not request.permissions.can_view_performances(other):
         raise PermissionDenied
 
     performances = PerformanceData.objects.filter(user=other).select_related(
@@ -37,87 +38,8 @@ def performances_list_view(request, other_id=None):
     )
 
 
-def playlist_pass_bool(exercise_list, exercises_data, playlist_length):
-    parsed_data = {}
-
-    for completion in exercises_data:
-        c_id = completion["id"]
-        if c_id not in parsed_data.keys():
-            parsed_data[c_id] = []
-        parsed_data[c_id].append(completion["error_tally"])
-        del c_id
-
-    playlist_pass = True
-    if len(parsed_data.keys()) < playlist_length:
-        playlist_pass = False
-    else:
-        for item in exercise_list:
-            if item not in parsed_data.keys():
-                playlist_pass = False
-                break
-        for key in parsed_data:
-            least_err = sorted(parsed_data[key])[0]
-            if isinstance(least_err, int) and least_err > 0:
-                playlist_pass = False
-                break
-    return playlist_pass
-
-
-def playlist_pass_date(
-    exercise_list, exercises_data, playlist_length, make_concise_and_localize=True
-):
-    if not playlist_pass_bool(exercise_list, exercises_data, playlist_length):
-        return None
-
-    parsed_data = {}
-    for completion in exercises_data:
-        c_id = completion["id"]
-        if c_id not in parsed_data.keys():
-            parsed_data[c_id] = []
-        parsed_data[c_id].append(
-            {
-                "date": completion["performed_at"],
-                "dur": completion["performance_duration_in_seconds"],
-                "err": completion["error_tally"],
-            }
-        )
-        del c_id
-
-    ex_pass_dates = []
-    for key in parsed_data:
-        error_free = []
-        for occasion in parsed_data[key]:
-            if (
-                not isinstance(occasion["err"], int) or occasion["err"] == 0
-            ):  # why err < 6 previously ?!
-                error_free.append(occasion["date"])
-        if len(error_free) > 0:
-            ex_pass_dates.append(sorted(error_free)[0])
-
-    if len(ex_pass_dates) < playlist_length:
-        return None
-    else:
-        pl_pass_date_utc_str = sorted(ex_pass_dates)[-1]
-
-    if make_concise_and_localize:  # for certain Django table renders
-        # UTC is assumed here since the performed_at property is written to the performance database per UTC
-        pl_pass_date = datetime.strptime(
-            pl_pass_date_utc_str, "%Y-%m-%d %H:%M:%S"
-        ).replace(tzinfo=pytz.timezone("UTC"))
-        # for the user, interpret the pass_date in terms of the timezone for the course
-        return datetime.strftime(
-            pl_pass_date.astimezone(pytz.timezone(settings.TIME_ZONE)),
-            "%Y_%m_%d (%a) %H:%M",
-        )
-    else:
-        return pl_pass_date_utc_str
-
-
-def playing_time(exercises_data):
-    total_seconds = 0
-    for completion in exercises_data:
-        total_seconds += completion["performance_duration_in_seconds"]
-        # data gives seconds down to milliseconds
+def playing_time(total_seconds):
+    # data gives seconds down to milliseconds
     # total_seconds = int(total_seconds * 10) / 10 # gives seconds down to one decimal place
     hours = int(total_seconds // 3600)
     minutes = int((total_seconds // 60) % 60)
@@ -132,20 +54,73 @@ def playing_time(exercises_data):
         return str(seconds) + "s"
 
 
-def playlist_performance_view(request, performance_id):
-    performance = (
-        PerformanceData.objects.filter(id=performance_id)
-        .select_related("user", "playlist", "course")  # redundant?
-        .first()
+@lru_cache(maxsize=4096)
+def localize_performed_at(performed_at):
+    # UTC is assumed here since the performed_at property is written to the performance database per UTC
+    return datetime.strftime(
+        datetime.strptime(performed_at, "%Y-%m-%d %H:%M:%S")
+        .replace(tzinfo=pytz.timezone("UTC"))
+        .astimezone(pytz.timezone(settings.TIME_ZONE)),
+        "%y_%m_%d %H:%M",
+    )
+
+
+def exercise_cell(exercise, first_pass, url):
+    tempo_display_factor = 1
+    # TO DO: include time signature in the performance data for this purpose?
+    # try:
+    #     print(exercise)
+    #     # get beat information from time signature
+    #     time_sig = exercise["time_signature"]
+    #     time_sig_numerator = int(time_sig.split("/")[0])
+    #     tempo_display_factor = int(time_sig.split("/")[1])
+    #     if time_sig_numerator > 3 and time_sig_numerator % 3 == 0:
+    #         # compound meter
+    #         tempo_display_factor /= 3
+    #     try:
+    #         float(tempo_display_factor)
+    #     except ValueError:
+    #         print("Unable to retrieve beat value from time signature")
+    # except:
+    #     print("Unable to retrieve beat value from time signature")
+
+    return mark_safe(
+        f'{"PASS " + localize_performed_at(first_pass) + "<br><br>" if first_pass else "TO DO<br><br>"}'
+        f'{"Latest: errors (" + str(exercise["error_tally"]) + ")." if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] > 0) else ""}'
+        f'{"Done " if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] == -1) else ""}'  # when is this shown?
+        f'{"Latest: without error." if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] == 0) else ""}'
+        f'{"" if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] > 0 or exercise["tempo_rating"] == None) else ["", "<br>Tempo erratic", "<br>Tempo unsteady", "<br>Tempo steady", "<br>Tempo very steady", "<br>Tempo perfectly steady"][round(exercise["tempo_rating"])]}'
+        f'{"" if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] > 0 or "tempo_mean_semibreves_per_min" not in exercise) else "<br> at " + str(round(exercise["tempo_mean_semibreves_per_min"] * tempo_display_factor)) + " w.n.p.m.<br>"}'
+        f'<br><a href="{url}">Play again</a>'
     )
 
-    performer_id = performance.user.id
-    performer = get_object_or_404(User, id=performer_id)
 
-    if (
-        not request.user.pk in performer.performance_permits
-        and not performer == request.user
-    ):
+def exercise_cells(exercises_data, summary, exercise_urls_by_id):
+    """
+    Cells of the performance details table, per exercise: the first pass
+    and the latest attempt of the exercise, in one pass over the attempts.
+    """
+    latest_attempts = {}
+    for exercise in exercises_data:
+        latest_attempts[exercise["id"]] = exercise
+    return {
+        exercise_id: exercise_cell(
+            exercise,
+            summary["exercises"].get(exercise_id, {}).get("first_pass"),
+            exercise_urls_by_id.get(exercise_id),
+        )
+        for exercise_id, exercise in latest_attempts.items()
+    }
+
+
+def playlist_performance_view(request, performance_id):
+    performance = get_object_or_404(
+        PerformanceData.objects.select_related("user", "playlist", "course"),
+        id=performance_id,
+    )
+    performer = performance.user
+
+    if not request.permissions.can_view_performances(performer):
         raise PermissionDenied
 
     # coded more cautiously because some of our performance data did not yet
@@ -153,7 +128,7 @@ def playlist_performance_view(request, performance_id):
     course_id = getattr(performance.course, "id", None)
     course_name = "None"
     if course_id:
-        course_name = Course.objects.get(id=course_id).title
+        course_name = performance.course.title
 
     user_data = {
         "performance_obj": performance,
@@ -164,60 +139,35 @@ def playlist_performance_view(request, performance_id):
         "playlist_id": performance.playlist.id,
         "playlist_name": performance.playlist.name,
         "playlist_length": len(performance.playlist.exercise_list),
-        "performance_data": performance.data,
-        # "exercise_count": len(performance.data), # replace line below?
+        "performance_data": performance.attempt_data,
+        "exercise_count": performance.attempt_summary["attempts"],
     }
-    user_data.update({"exercise_count": len(user_data["performance_data"])})
 
     data = []
     data.append(user_data)
 
     exercises = [exercise for exercise in performance.playlist.exercise_list]
+    exercise_urls = performance.playlist.get_exercise_urls(course_id=course_id)
+    exercise_urls_by_id = {}
+    for exercise_id, url in zip(exercises, exercise_urls):
+        # as per Playlist.get_exercise_url_by_id, the first occurrence wins
+        exercise_urls_by_id.setdefault(exercise_id, url)
 
     for d in data:  # is not len(data) == 1?
         performance_obj = d["performance_obj"]
         exercises_data = d["performance_data"]
 
-        d["playing_time"] = playing_time(exercises_data)
-        d["playlist_pass_bool"] = playlist_pass_bool(
-            exercises, exercises_data, d["playlist_length"]
-        )  # why not len(exercise_list) ?!
-        d["playlist_pass_date"] = playlist_pass_date(
-            exercises, exercises_data, d["playlist_length"]
-        )  # why not len(exercise_list) ?!
-
-        for exercise in exercises_data:
-            tempo_display_factor = 1
-            # TO DO: include time signature in the performance data for this purpose?
-            # try:
-            #     print(exercise)
-            #     # get beat information from time signature
-            #     time_sig = exercise["time_signature"]
-            #     time_sig_numerator = int(time_sig.split("/")[0])
-            #     tempo_display_factor = int(time_sig.split("/")[1])
-            #     if time_sig_numerator > 3 and time_sig_numerator % 3 == 0:
-            #         # compound meter
-            #         tempo_display_factor /= 3
-            #     try:
-            #         float(tempo_display_factor)
-            #     except ValueError:
-            #         print("Unable to retrieve beat value from time signature")
-            # except:
-            #     print("Unable to retrieve beat value from time signature")
-
-            d.update(
-                **{
-                    exercise["id"]: mark_safe(
-                        f'{"PASS " + datetime.strftime(datetime.strptime(performance_obj.get_exercise_first_pass(exercise["id"]), "%Y-%m-%d %H:%M:%S").replace(tzinfo=pytz.timezone("UTC")).astimezone(pytz.timezone(settings.TIME_ZONE)), "%y_%m_%d %H:%M") + "<br><br>" if (performance_obj.get_exercise_first_pass(exercise["id"]) != False) else "TO DO<br><br>"}'
-                        f'{"Latest: errors (" + str(exercise["error_tally"]) + ")." if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] > 0) else ""}'
-                        f'{"Done " if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] == -1) else ""}'  # when is this shown?
-                        f'{"Latest: without error." if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] == 0) else ""}'
-                        f'{"" if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] > 0 or exercise["tempo_rating"] == None) else ["", "<br>Tempo erratic", "<br>Tempo unsteady", "<br>Tempo steady", "<br>Tempo very steady", "<br>Tempo perfectly steady"][round(exercise["tempo_rating"])]}'
-                        f'{"" if (isinstance(exercise["error_tally"], int) and exercise["error_tally"] > 0 or "tempo_mean_semibreves_per_min" not in exercise) else "<br> at " + str(round(exercise["tempo_mean_semibreves_per_min"] * tempo_display_factor)) + " w.n.p.m.<br>"}'
-                        f'<br><a href="{performance_obj.playlist.get_exercise_url_by_id(exercise["id"], course_id=course_id)}">Play again</a>'
-                    )
-                }
+        d["playing_time"] = playing_time(performance_obj.playing_seconds)
+        d["playlist_pass_bool"] = performance_obj.playlist_passed()
+        d["playlist_pass_date"] = performance_obj.playlist_pass_date
+
+        d.update(
+            exercise_cells(
+                exercises_data,
+                performance_obj.attempt_summary,
+                exercise_urls_by_id,
             )
+        )
 
     table = MyActivityDetailsTable(
         data=data,
@@ -227,9 +177,7 @@ def playlist_performance_view(request, performance_id):
                 Column(
                     verbose_name=str(num + 1),
                     orderable=False,
-                    default=mark_safe(
-                        f'<a href="{performance_obj.playlist.get_exercise_url_by_num(num + 1, course_id=course_id)}">Try</a>'
-                    ),
+                    default=mark_safe(f'<a href="{exercise_urls[num]}">Try</a>'),
                 ),
             )
             for num in range(len(exercises))
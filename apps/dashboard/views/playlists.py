@@ -9,10 +9,24 @@ from django_tables2 import RequestConfig
 from apps.dashboard.forms import DashboardPlaylistForm
 from apps.dashboard.tables import PlaylistsListTable
 from apps.dashboard.filters import ListIDFilter, PlaylistListNameFilter
+from apps.dashboard.services import apply_memberships
 from apps.exercises.models import ExercisePlaylistOrdered, Playlist
+from apps.exercises.utils.playlist_plan import bump_plan_version
 
 import re
 
+
+def save_playlist_exercises(playlist, exercise_pairs):
+    """Add, reorder and remove the EPOs of a playlist as per the form."""
+    if any(
+        apply_memberships(
+            ExercisePlaylistOrdered, "playlist", playlist, "exercise", exercise_pairs
+        )
+    ):
+        # bulk changes send no signal to make the playlist plan stale
+        bump_plan_version(playlist._id)
+
+
 @login_required
 def playlists_list_view(request):
     playlists_author = request.user
@@ -72,13 +86,7 @@ def playlist_add_view(request):
         if form.is_valid():
             playlist = form.save(commit=False)
             playlist.save()
-            exercises = form.cleaned_data["exercises"]
-
-            # create and save new EPOs
-            for exercise, through_data in exercises:
-                ExercisePlaylistOrdered.objects.create(
-                    playlist=playlist, exercise=exercise, **through_data
-                )
+            save_playlist_exercises(playlist, form.cleaned_data["exercises"])
 
             if (
                 "save-and-continue" in request.POST
@@ -146,24 +154,7 @@ def playlist_edit_view(request, playlist_id):
             else:
                 playlist = form.save(commit=False)
                 playlist.save()
-
-                initial_epos = ExercisePlaylistOrdered.objects.filter(playlist=playlist)
-                initial_exercises = [epo.exercise for epo in initial_epos]
-                exercise_pairs = form.cleaned_data["exercises"]
-                new_exercises = [exercise_pair[0] for exercise_pair in exercise_pairs]
-
-                # edit or add new EPOs
-                for exercise, through_data in exercise_pairs:
-                    ExercisePlaylistOrdered.objects.update_or_create(
-                        exercise=exercise, playlist=playlist, defaults=through_data
-                    )
-
-                # delete removed EPOs
-                for exercise in initial_exercises:
-                    if exercise not in new_exercises:
-                        ExercisePlaylistOrdered.objects.filter(
-                            exercise=exercise, playlist=playlist
-                        ).delete()
+                save_playlist_exercises(playlist, form.cleaned_data["exercises"])
 
             if (
                 "save-and-continue" in request.POST
@@ -191,15 +182,7 @@ def playlist_edit_view(request, playlist_id):
                 playlist._id = None
                 playlist.id = None
                 playlist = playlist.save()
-                exercise_pairs = form.cleaned_data["exercises"]
-
-                # edit or add new EPOs
-                for exercise, through_data in exercise_pairs:
-                    ExercisePlaylistOrdered.objects.update_or_create(
-                        exercise=exercise,
-                        playlist=playlist,
-                        defaults=through_data,
-                    )
+                save_playlist_exercises(playlist, form.cleaned_data["exercises"])
                 messages.add_message(
                     request,
                     messages.SUCCESS,
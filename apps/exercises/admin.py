@@ -12,7 +12,14 @@ from apps.exercises.forms import (
     PerformanceDataForm,
     CourseForm,
 )
-from apps.exercises.models import Exercise, Playlist, PerformanceData, Course
+from apps.exercises.models import (
+    Exercise,
+    Playlist,
+    PerformanceData,
+    PerformanceAttempt,
+    Course,
+    CourseProgress,
+)
 
 import re
 import sys
@@ -21,6 +28,23 @@ import os
 from apps.exercises.resources import ExerciseResource, PlaylistResource, CourseResource
 
 
+class ExerciseTypeFilter(admin.SimpleListFilter):
+    """By data type, through the GIN index of Exercise.data."""
+
+    title = "type"
+    parameter_name = "type"
+
+    def lookups(self, request, model_admin):
+        return ExerciseForm.TYPE_CHOICES + (
+            (ExerciseForm.TYPE_CHORALE, "Chorale score"),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(data__contains={"type": self.value()})
+        return queryset
+
+
 @admin.register(Exercise)
 class ExerciseAdmin(ImportExportModelAdmin):
     form = ExerciseForm
@@ -32,7 +56,7 @@ class ExerciseAdmin(ImportExportModelAdmin):
         "created",
         "updated",
     )
-    list_filter = ("authored_by__email", "is_public")
+    list_filter = ("authored_by__email", "is_public", ExerciseTypeFilter)
     search_fields = ("id",)
     readonly_fields = ("id", "authored_by", "created", "updated", "show_on_site")
     raw_id_fields = ("authored_by",)
@@ -129,21 +153,20 @@ class ExerciseAdmin(ImportExportModelAdmin):
                 # Create Exercise
                 # Create exercise with CIR format
                 # Note: type "chorale" tells frontend this is a polyphonic score-based exercise
+                data = {
+                    'type': 'chorale',
+                    'score': cir,
+                    'events': events_json,
+                }
+                if title:
+                    data['metadata'] = {'title': title}
+
                 exercise = Exercise.objects.create(
                     authored_by=request.user,
                     is_public=is_public,
-                    data={
-                        'type': 'chorale',
-                        'score': cir,
-                        'events': events_json,
-                    }
+                    data=data,
                 )
                 
-                if title:
-                    exercise.data['metadata'] = {'title': title}
-                
-                exercise.save()
-                
                 messages.success(
                     request, 
                     f'Successfully imported MusicXML as exercise {exercise.id}. '
@@ -343,6 +366,22 @@ class PerformanceDataAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(PerformanceAttempt)
+class PerformanceAttemptAdmin(admin.ModelAdmin):
+    list_display = ("user", "playlist", "course", "exercise_id", "performed_at")
+    list_filter = ("user__email", "playlist__name")
+    search_fields = ("user__email", "playlist__name", "exercise_id")
+    raw_id_fields = ("performance", "user", "playlist", "course")
+
+
+@admin.register(CourseProgress)
+class CourseProgressAdmin(admin.ModelAdmin):
+    list_display = ("course", "user", "playlist", "pass_mark", "pass_date", "updated")
+    list_filter = ("pass_mark", "course__title")
+    search_fields = ("user__email", "playlist__name", "course__title")
+    raw_id_fields = ("course", "user", "playlist")
+
+
 @admin.register(Course)
 class CourseAdmin(DynamicArrayMixin, ImportExportModelAdmin):
     form = CourseForm
@@ -1,11 +1,14 @@
 import re
 import datetime
+from bisect import bisect_left, bisect_right
 from copy import deepcopy
 from ckeditor.widgets import CKEditorWidget
 from django import forms
+from django.db.models import Q
 from prettyjson import PrettyJSONWidget
 
 from apps.exercises.models import Exercise, Playlist, PerformanceData, Course
+from apps.exercises.utils.content_id import decode_id, encode_id
 from django.utils.html import conditional_escape, format_html
 
 
@@ -32,21 +35,15 @@ class ExpansiveForm(forms.ModelForm):
             n.upper().strip() for n in re.split("-*[,; \n]+-*", expansive_field_data)
         ]
 
-        # to test if item exists
-        all_object_ids = list(
-            self.EXPANSIVE_FIELD_MODEL.objects.values_list("id", flat=True)
-        )
-
-        object_ids = []
+        # ranges only expand to the user's items, up to `allowance` per range
+        user_id = self.context.get("user").id
+        tokens = []
         for string in parsed_input:
             if "-" in string:
-                id_range = string
-                for _id in self._expand_range(id_range, all_object_ids):
-                    # ^ returns only items authored by the user
-                    # ^ _id already verified
-                    object_ids.append(_id)
+                id_range = self._parse_range(string)
+                if id_range is not None:
+                    tokens.append(id_range)
             else:
-
                 _id = string
 
                 if len(_id) <= 6:
@@ -54,103 +51,66 @@ class ExpansiveForm(forms.ModelForm):
 
                 if _id == "":
                     continue
-                if _id not in all_object_ids:
-                    # generate WARNING
-                    continue
+                tokens.append(_id)
+
+        # existence, visibility and authorship of every item, in one query
+        query = Q(
+            id__in=[token for token in tokens if isinstance(token, str)]
+        ) & (Q(is_public=True) | Q(authored_by_id=user_id))
+        for lower_id, upper_id in [
+            token for token in tokens if isinstance(token, tuple)
+        ]:
+            query |= Q(authored_by_id=user_id, id__gte=lower_id, id__lte=upper_id)
+        visible_ids = set()
+        user_authored_ids = []
+        if tokens:
+            for _id, is_public, authored_by_id in self.EXPANSIVE_FIELD_MODEL.objects.filter(
+                query
+            ).values_list("id", "is_public", "authored_by_id"):
+                visible_ids.add(_id)
+                if authored_by_id == user_id:
+                    user_authored_ids.append(_id)
+        # IDs sort as the integers they encode (see content_id)
+        user_authored_ids.sort()
 
-                item_is_public = (
-                    self.EXPANSIVE_FIELD_MODEL.objects.get(id=_id).is_public == True
-                )
-
-                if item_is_public:
-                    object_ids.append(_id)
-                    continue
-
-                user_authored_objects = list(
-                    self.EXPANSIVE_FIELD_MODEL.objects.filter(
-                        authored_by_id=self.context.get("user").id
-                    ).values_list("id", flat=True)
-                )
-
-                if _id in user_authored_objects:
-                    object_ids.append(_id)
+        object_ids = []
+        for token in tokens:
+            if isinstance(token, tuple):
+                object_ids.extend(self._expand_range(token, user_authored_ids))
+            elif token in visible_ids:
+                object_ids.append(token)
+            # else generate WARNING
 
         JOIN_STR = " "  # r'[,; \n]+'
         self.cleaned_data.update({self.EXPANSIVE_FIELD: JOIN_STR.join(object_ids)})
 
     def _integer_from_id(self, ex_str):
-        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        digits = "0123456789"
-        reverse_str = ex_str[::-1]
-        integer = 0
-        base = 1
-        for i in range(len(reverse_str)):
-            char = reverse_str[i]
-            if char in letters:
-                integer += base * letters.index(char)
-                base *= 26
-            elif char in digits:
-                integer += base * digits.index(char)
-                base *= 10
-            else:
-                return None
-        return integer
+        return decode_id(ex_str)
 
     def _id_from_integer(self, num):
-        # must accord with models.py (do not make format changes)
-        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        reverse_id = ""
-        bases = [26, 26, 10, 10, 26]
-        for base in bases:
-            if base == 26:
-                reverse_id += letters[num % base]
-            elif base == 10:
-                reverse_id += str(num % base)
-            num //= base
-        if num != 0 or len(reverse_id) != len(bases):
-            return None
-        reverse_id += self.EXPANSIVE_FIELD_INITIAL
-        return reverse_id[::-1]
-
-    def _expand_range(self, id_range, all_object_ids, allowance=100):
-        user_authored_objects = list(
-            self.EXPANSIVE_FIELD_MODEL.objects.filter(
-                authored_by_id=self.context.get("user").id
-            )
-            .values_list("id", flat=True)
-            .order_by("id")
-        )
-
-        object_ids = []
+        return encode_id(num, self.EXPANSIVE_FIELD_INITIAL)
 
+    def _parse_range(self, id_range):
+        """The first and last IDs of a range such as "EA00AA-EA00ZZ", or None."""
         split_input = re.split("-+", id_range)
-        if len(split_input) >= 2:
-            lower = self._integer_from_id(split_input[0])
-            upper = self._integer_from_id(split_input[-1])
-            if lower is None or upper is None:
-                return object_ids
-            if not lower < upper:
-                return object_ids
-            for num in range(lower, upper + 1):
-                item = self._id_from_integer(num)
-                if item is None or item == "":
-                    continue
-                if item not in all_object_ids:
-                    # generate WARNING
-                    continue
-                    self.add_error(
-                        field=self.EXPANSIVE_FIELD,
-                        error=f"{self.EXPANSIVE_FIELD_MODEL._meta.verbose_name} with ID {item} does not exist.",
-                    )
-                if item in user_authored_objects and item is not None and item != "":
-                    # self-authored exercises only
-                    object_ids.append(item)
-                    allowance += -1
-                if allowance == 0:
-                    # FIXME generate warning message
-                    break
-
-        return object_ids
+        if len(split_input) < 2:
+            return None
+        lower = self._integer_from_id(split_input[0])
+        upper = self._integer_from_id(split_input[-1])
+        if lower is None or upper is None:
+            return None
+        if not lower < upper:
+            return None
+        return self._id_from_integer(lower), self._id_from_integer(upper)
+
+    def _expand_range(self, id_range, user_authored_ids, allowance=100):
+        """The user's IDs within the range, in order, up to `allowance` of them."""
+        lower_id, upper_id = id_range
+        # self-authored items only
+        start = bisect_left(user_authored_ids, lower_id)
+        stop = bisect_right(user_authored_ids, upper_id)
+        # FIXME generate warning message beyond the allowance
+        return user_authored_ids[start:stop][:allowance]
 
 
 # Taken from deprecated music_controls.js prompt form
@@ -0,0 +1,58 @@
+import logging
+
+from django.db import transaction
+
+from apps.exercises.models import (
+    Course,
+    CourseProgress,
+    PerformanceAttempt,
+    PerformanceData,
+)
+from apps.jobs.registry import job_handler
+
+log = logging.getLogger(__name__)
+
+
+@job_handler("gradebook")
+def update_gradebook(key, attempt_ids):
+    """Add the submitted attempts to the progress of the course performers."""
+    attempts_by_performance = {}
+    for attempt in PerformanceAttempt.objects.filter(id__in=attempt_ids).order_by(
+        "performed_at", "id"
+    ):
+        attempts_by_performance.setdefault(attempt.performance_id, [])
+        attempts_by_performance[attempt.performance_id].append(
+            attempt.as_attempt_data()
+        )
+
+    with transaction.atomic():
+        # workers may run gradebook and regrade jobs of the same course
+        # concurrently, as claimed jobs leave the coalescing index
+        course = Course.objects.select_for_update().get(_id=int(key))
+        if not CourseProgress.objects.filter(course=course).exists():
+            # the progress of courses graded before CourseProgress is built
+            # from all their performances, which include the submitted attempts
+            course.refresh_progress()
+            return
+
+        for performance in PerformanceData.objects.filter(
+            id__in=attempts_by_performance.keys()
+        ).select_related("playlist"):
+            course.add_performance(
+                performance, attempts=attempts_by_performance[performance.id]
+            )
+
+
+@job_handler("regrade")
+def regrade_course(key, prev_tardy_thresholds):
+    """Regrade the progress of a course after changes of its tardy_threshold."""
+    with transaction.atomic():
+        # as per update_gradebook
+        course = Course.objects.select_for_update().get(_id=int(key))
+        if not CourseProgress.objects.filter(course=course).exists():
+            course.refresh_progress()
+            return
+        regraded_marks = course.regrade_marks(
+            course.get_regrade_candidates(prev_tardy_thresholds)
+        )
+    log.info(f"{regraded_marks} marks of course {course.id} regraded")
@@ -0,0 +1,55 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from apps.exercises.models import PerformanceData, PerformanceAttempt
+
+
+class Command(BaseCommand):
+    help = "Move attempts stored in PerformanceData.data into PerformanceAttempt rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Number of performances moved per transaction",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        performances_moved = 0
+        attempts_moved = 0
+
+        while True:
+            with transaction.atomic():
+                # rows are emptied once moved, so each pass picks up the next chunk
+                chunk = list(
+                    PerformanceData.objects.exclude(data=[])
+                    .select_for_update(skip_locked=True)
+                    .order_by("id")[:chunk_size]
+                )
+                if not chunk:
+                    break
+
+                attempts = []
+                for performance in chunk:
+                    attempts.extend(
+                        PerformanceAttempt.from_attempt_data(performance, exercise_data)
+                        for exercise_data in performance.data
+                    )
+                PerformanceAttempt.objects.bulk_create(attempts, batch_size=1000)
+                PerformanceData.objects.filter(
+                    id__in=[performance.id for performance in chunk]
+                ).update(data=[])
+
+            performances_moved += len(chunk)
+            attempts_moved += len(attempts)
+            self.stdout.write(
+                f"{performances_moved} performances, {attempts_moved} attempts moved"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully moved {attempts_moved} attempts of {performances_moved} performances."
+            )
+        )
@@ -1,33 +1,35 @@
 """
-Management command to import a single chorale as an exercise.
+Management command to import chorales as exercises, one excerpt each.
 
 Usage:
-  python manage.py import_chorale <corpus_file> --author=<email>
+  python manage.py import_chorale <corpus_file> [<corpus_file> ...] --author=<email> [--playlist=<P-ID>]
 
 Example:
   python manage.py import_chorale bwv1.6.json --author=admin@example.com
 """
 import json
 import os
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
-from apps.exercises.models import Exercise
+from apps.exercises.models import Exercise, Playlist
+from apps.exercises.services import create_exercises
 
 User = get_user_model()
 
 
 class Command(BaseCommand):
-    help = 'Import a chorale from data/corpus/bach as an Exercise'
+    help = 'Import chorales from data/corpus/bach as Exercises'
 
     def add_arguments(self, parser):
-        parser.add_argument('corpus_file', type=str, help='Filename in data/corpus/bach/')
+        parser.add_argument('corpus_files', nargs='+', type=str, help='Filenames in data/corpus/bach/')
         parser.add_argument('--author', type=str, required=True, help='Email of the exercise author')
         parser.add_argument('--start', type=int, default=0, help='Start measure (0-indexed)')
         parser.add_argument('--end', type=int, default=4, help='End measure (exclusive)')
-        parser.add_argument('--public', action='store_true', help='Make the exercise public')
+        parser.add_argument('--public', action='store_true', help='Make the exercises public')
+        parser.add_argument('--playlist', type=str, help='P-ID of a playlist of the author to append the exercises to')
 
     def handle(self, *args, **options):
-        corpus_file = options['corpus_file']
         author_email = options['author']
         start_measure = options['start']
         end_measure = options['end']
@@ -39,6 +41,36 @@ class Command(BaseCommand):
         except User.DoesNotExist:
             raise CommandError(f'User with email "{author_email}" not found')
 
+        playlist = None
+        if options['playlist']:
+            playlist = Playlist.objects.filter(
+                id=options['playlist'], authored_by=author
+            ).first()
+            if playlist is None:
+                raise CommandError(f'Playlist "{options["playlist"]}" of {author_email} not found')
+
+        excerpts = [
+            self.build_exercise(corpus_file, author, start_measure, end_measure, is_public)
+            for corpus_file in options['corpus_files']
+        ]
+        # all excerpts are inserted at once (see create_exercises)
+        try:
+            create_exercises([exercise for exercise, _ in excerpts], playlist=playlist)
+        except ValidationError as e:
+            raise CommandError('; '.join(e.messages))
+
+        for exercise, meta in excerpts:
+            self.stdout.write(self.style.SUCCESS(
+                f'Successfully created exercise {exercise.id}: {exercise.description}'
+            ))
+            self.stdout.write(f'  Measures: {len(exercise.data["score"]["measures"])}')
+            self.stdout.write(f'  Key: {meta.get("key", "?")}')
+            self.stdout.write(f'  Time: {meta.get("time", "?")}')
+        if playlist is not None:
+            self.stdout.write(f'Appended {len(excerpts)} exercises to playlist {playlist.id}')
+
+    def build_exercise(self, corpus_file, author, start_measure, end_measure, is_public):
+        """The unsaved excerpt of a corpus file, and the chorale's metadata."""
         # Load the corpus JSON
         corpus_path = os.path.join('data', 'corpus', 'bach', corpus_file)
         if not os.path.exists(corpus_path):
@@ -94,18 +126,10 @@ class Command(BaseCommand):
             "staffDistribution": "chorale"
         }
 
-        # Create the Exercise
         exercise = Exercise(
             description=title,
             data=exercise_data,
             authored_by=author,
             is_public=is_public
         )
-        exercise.save()
-
-        self.stdout.write(self.style.SUCCESS(
-            f'Successfully created exercise {exercise.id}: {title}'
-        ))
-        self.stdout.write(f'  Measures: {len(excerpt_measures)}')
-        self.stdout.write(f'  Key: {meta.get("key", "?")}')
-        self.stdout.write(f'  Time: {meta.get("time", "?")}')
+        return exercise, meta
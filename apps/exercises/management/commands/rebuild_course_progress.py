@@ -0,0 +1,29 @@
+from django.core.management import BaseCommand
+
+from apps.exercises.models import Course
+
+
+class Command(BaseCommand):
+    help = "Recompute CourseProgress from the performances of each course"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "course_ids",
+            nargs="*",
+            help="C-IDs of the courses to rebuild (default: all courses)",
+        )
+
+    def handle(self, *args, **options):
+        courses = Course.objects.order_by("_id")
+        if options["course_ids"]:
+            courses = courses.filter(id__in=options["course_ids"])
+
+        rebuilt_courses = 0
+        for course in courses.iterator():
+            course.refresh_progress()
+            rebuilt_courses += 1
+            self.stdout.write(f"{course.id} rebuilt")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt {rebuilt_courses} courses.")
+        )
@@ -0,0 +1,45 @@
+from django.core.management import BaseCommand
+
+from apps.exercises.models import Course, CourseVisibility
+
+
+class Command(BaseCommand):
+    help = "Recompute CourseVisibility from course groups and content permits"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "course_ids",
+            nargs="*",
+            help="C-IDs of the courses to rebuild (default: all courses)",
+        )
+
+    def handle(self, *args, **options):
+        course_ids = None
+        if options["course_ids"]:
+            course_ids = list(
+                Course.objects.filter(id__in=options["course_ids"]).values_list(
+                    "_id", flat=True
+                )
+            )
+
+        visibility = CourseVisibility.objects.all()
+        if course_ids is not None:
+            visibility = visibility.filter(course_id__in=course_ids)
+        previous = set(visibility.values_list("course_id", "viewer_id"))
+
+        CourseVisibility.objects.refresh(course_ids=course_ids)
+
+        current = set(visibility.values_list("course_id", "viewer_id"))
+        added, removed = current - previous, previous - current
+        for course_id, viewer_id in sorted(added):
+            self.stdout.write(f"course {course_id} added for user {viewer_id}")
+        for course_id, viewer_id in sorted(removed):
+            self.stdout.write(f"course {course_id} removed for user {viewer_id}")
+
+        style = self.style.WARNING if added or removed else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"Rebuilt {len(current)} visibility rows: "
+                f"{len(added)} were missing, {len(removed)} were stale."
+            )
+        )
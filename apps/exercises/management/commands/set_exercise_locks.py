@@ -1,6 +1,6 @@
 from django.core.management import BaseCommand
 
-from apps.exercises.models import PerformanceData, Exercise
+from apps.exercises.models import PerformanceData, PerformanceAttempt, Exercise
 
 
 class Command(BaseCommand):
@@ -9,9 +9,15 @@ class Command(BaseCommand):
         performances = PerformanceData.objects.all()
 
         for performance in performances:
+            # attempts not yet backfilled into PerformanceAttempt
             for exercise in performance.data:
                 performed_exercises.setdefault(exercise["id"], [])
                 performed_exercises[exercise["id"]].append(performance.user_id)
+        for exercise_id, user_id in PerformanceAttempt.objects.values_list(
+            "exercise_id", "user_id"
+        ).distinct():
+            performed_exercises.setdefault(exercise_id, [])
+            performed_exercises[exercise_id].append(user_id)
         performed_exercises = {k: list(set(v)) for k, v in performed_exercises.items()}
 
         """
@@ -0,0 +1,31 @@
+from django.core.management import BaseCommand
+
+from apps.exercises.models import PerformanceData
+from apps.exercises.utils.summary import summarize
+
+
+class Command(BaseCommand):
+    help = "Store the attempt summary of performances summarized before PerformanceData.summary"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute the summary of every performance",
+        )
+
+    def handle(self, *args, **options):
+        performances = PerformanceData.objects.order_by("id")
+        if not options["all"]:
+            performances = performances.filter(summary={})
+
+        summarized = 0
+        for performance in performances.iterator():
+            PerformanceData.objects.filter(id=performance.id).update(
+                summary=summarize(performance.attempt_data)
+            )
+            summarized += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully summarized {summarized} performances.")
+        )
@@ -1,20 +1,50 @@
 from django.core.management import BaseCommand
-from django.db import connections
+from django.db import connections, transaction
+from django.db.models import Max, Min
 
 from apps.exercises.models import PerformanceData, Exercise, Playlist, Course
 
 
 class Command(BaseCommand):
+    help = (
+        "Remove microseconds from the timestamps saved before they were "
+        "truncated on save (see TruncatedDateTimeField)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Primary keys per UPDATE (default: 5000)",
+        )
+
     def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
         models = [Exercise, Playlist, Course, PerformanceData]
-        with connections["default"].cursor() as cursor:
-            for model in models:
-                cursor.execute(
-                    "UPDATE {} "
-                    "SET created = DATE_TRUNC('second', created), updated = DATE_TRUNC('second', updated) ".format(
-                        model._meta.db_table
+        for model in models:
+            pk_column = model._meta.pk.column
+            pk_range = model.objects.aggregate(min_pk=Min("pk"), max_pk=Max("pk"))
+            if pk_range["min_pk"] is None:
+                continue
+
+            truncated = 0
+            # one transaction per chunk, so that rows are not locked for long
+            for start in range(pk_range["min_pk"], pk_range["max_pk"] + 1, chunk_size):
+                with transaction.atomic(), connections["default"].cursor() as cursor:
+                    cursor.execute(
+                        "UPDATE {table} "
+                        "SET created = DATE_TRUNC('second', created), updated = DATE_TRUNC('second', updated) "
+                        "WHERE {pk} >= %s AND {pk} < %s "
+                        "AND (created <> DATE_TRUNC('second', created) "
+                        "OR updated <> DATE_TRUNC('second', updated))".format(
+                            table=model._meta.db_table, pk=pk_column
+                        ),
+                        [start, start + chunk_size],
                     )
-                )
+                    truncated += cursor.rowcount
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {truncated} rows")
+
         self.stdout.write(
             self.style.SUCCESS("Successfully removed microseconds from timestamps.")
         )
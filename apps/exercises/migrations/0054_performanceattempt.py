@@ -0,0 +1,51 @@
+# Generated by Django 2.2.28 on 2026-10-17 05:39
+
+from django.conf import settings
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('exercises', '0053_auto_20231217_0113'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerformanceAttempt',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exercise_id', models.CharField(max_length=16, verbose_name='E-ID')),
+                ('performed_at', models.DateTimeField(verbose_name='Performed at')),
+                ('error_tally', models.IntegerField(blank=True, null=True, verbose_name='Error tally')),
+                ('performance_duration_in_seconds', models.FloatField(default=0, verbose_name='Duration')),
+                ('tempo_mean_semibreves_per_min', models.FloatField(blank=True, null=True, verbose_name='Mean tempo')),
+                ('tempo_sd_semibreves_per_min', models.FloatField(blank=True, null=True, verbose_name='Tempo standard deviation')),
+                ('tempo_rating', models.FloatField(blank=True, null=True, verbose_name='Tempo rating')),
+                ('extra', django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict, verbose_name='Other Data')),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='performance_attempts', to='exercises.Course')),
+                ('performance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='exercises.PerformanceData')),
+                ('playlist', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='performance_attempts', to='exercises.Playlist')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='performance_attempts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Performance Attempt',
+                'verbose_name_plural': 'Performance Attempts',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='performanceattempt',
+            index=models.Index(fields=['performance', 'performed_at'], name='attempt_performance_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='performanceattempt',
+            index=models.Index(fields=['user', 'playlist', 'course'], name='attempt_user_playlist_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='performanceattempt',
+            index=models.Index(fields=['exercise_id'], name='attempt_exercise_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 2.2.28 on 2026-10-17 05:40
+
+from django.db import migrations, models
+
+
+def merge_duplicate_performances(apps, schema_editor):
+    """Merge performances outside a course that share a user and playlist."""
+    PerformanceData = apps.get_model("exercises", "PerformanceData")
+    PerformanceAttempt = apps.get_model("exercises", "PerformanceAttempt")
+    db_alias = schema_editor.connection.alias
+
+    duplicates = (
+        PerformanceData.objects.using(db_alias)
+        .filter(course=None)
+        .values("user_id", "playlist_id")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        performances = list(
+            PerformanceData.objects.using(db_alias)
+            .filter(
+                course=None,
+                user_id=duplicate["user_id"],
+                playlist_id=duplicate["playlist_id"],
+            )
+            .order_by("created", "id")
+        )
+        kept, merged = performances[0], performances[1:]
+        for performance in merged:
+            kept.data.extend(performance.data)
+        kept.data.sort(key=lambda exercise_data: exercise_data["performed_at"])
+        kept.save()
+        PerformanceAttempt.objects.using(db_alias).filter(
+            performance__in=merged
+        ).update(performance=kept)
+        PerformanceData.objects.using(db_alias).filter(
+            id__in=[performance.id for performance in merged]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0054_performanceattempt'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_performances, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='performancedata',
+            constraint=models.UniqueConstraint(condition=models.Q(course=None), fields=('user', 'playlist'), name='performancedata_unique_without_course'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-17 05:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('exercises', '0055_performancedata_unique_without_course'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseProgress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pass_mark', models.CharField(choices=[('X', 'Incomplete'), ('C', 'Complete'), ('L', 'Late'), ('T', 'Tardy'), ('P', 'On time')], default='X', max_length=1, verbose_name='Pass mark')),
+                ('pass_date', models.DateTimeField(blank=True, null=True, verbose_name='Pass date')),
+                ('time_elapsed', models.FloatField(default=0, verbose_name='Time spent')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='exercises.Course')),
+                ('playlist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_progress', to='exercises.Playlist')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Course Progress',
+                'verbose_name_plural': 'Course Progress',
+                'unique_together': {('course', 'user', 'playlist')},
+            },
+        ),
+    ]
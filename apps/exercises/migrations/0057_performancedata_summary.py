@@ -0,0 +1,19 @@
+# Generated by Django 2.2.28 on 2026-10-17 05:48
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0056_courseprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='performancedata',
+            name='summary',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict, verbose_name='Summary'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 2.2.28 on 2026-10-17 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_course_visibility(apps, schema_editor):
+    """As per CourseVisibility.objects.refresh() of all courses."""
+    CourseVisibility = apps.get_model("exercises", "CourseVisibility")
+    Course = apps.get_model("exercises", "Course")
+    ContentPermit = apps.get_model("accounts", "ContentPermit")
+    Group = apps.get_model("accounts", "Group")
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO {table} (course_id, viewer_id) "
+            "SELECT course._id, permit.grantee_id "
+            "FROM {course_table} AS course "
+            "JOIN {permit_table} AS permit "
+            "ON permit.grantor_id = course.authored_by_id "
+            "WHERE course.open OR EXISTS ("
+            "SELECT 1 FROM {visible_to_table} AS visible_to "
+            "JOIN {members_table} AS members "
+            "ON members.group_id = visible_to.group_id "
+            "WHERE visible_to.course_id = course._id "
+            "AND members.user_id = permit.grantee_id"
+            ")".format(
+                table=CourseVisibility._meta.db_table,
+                course_table=Course._meta.db_table,
+                permit_table=ContentPermit._meta.db_table,
+                visible_to_table=Course.visible_to.through._meta.db_table,
+                members_table=Group.members.through._meta.db_table,
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('accounts', '0025_permit_relations'),
+        ('exercises', '0057_performancedata_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseVisibility',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibility', to='exercises.Course')),
+                ('viewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_visibility', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Course Visibility',
+                'verbose_name_plural': 'Course Visibility',
+                'unique_together': {('viewer', 'course')},
+            },
+        ),
+        migrations.RunPython(
+            build_course_visibility, reverse_code=migrations.RunPython.noop
+        ),
+    ]
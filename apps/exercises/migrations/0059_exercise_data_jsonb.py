@@ -0,0 +1,80 @@
+# Generated by Django 2.2.28 on 2026-10-17 06:04
+
+import django.contrib.postgres.fields.jsonb
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django_better_admin_arrayfield.models.fields
+
+from apps.exercises.utils.data_order import key_order, restore_order
+
+BATCH_SIZE = 500
+
+# data -> 'key' as compared by the lookups data__key etc.
+INDEXED_DATA_KEYS = ["type", "key", "keySignature"]
+
+
+def store_data_orders(apps, schema_editor):
+    """Record the key order of the json data before it becomes jsonb."""
+    Exercise = apps.get_model("exercises", "Exercise")
+    db_alias = schema_editor.connection.alias
+
+    batch = []
+    for exercise in Exercise.objects.using(db_alias).only("_id", "data").iterator():
+        exercise.data_order = key_order(exercise.data)
+        batch.append(exercise)
+        if len(batch) == BATCH_SIZE:
+            Exercise.objects.using(db_alias).bulk_update(batch, ["data_order"])
+            batch = []
+    Exercise.objects.using(db_alias).bulk_update(batch, ["data_order"])
+
+
+def restore_data_orders(apps, schema_editor):
+    """Write the json data back in its recorded key order."""
+    Exercise = apps.get_model("exercises", "Exercise")
+    db_alias = schema_editor.connection.alias
+
+    batch = []
+    for exercise in (
+        Exercise.objects.using(db_alias).only("_id", "data", "data_order").iterator()
+    ):
+        exercise.data = restore_order(exercise.data, exercise.data_order)
+        batch.append(exercise)
+        if len(batch) == BATCH_SIZE:
+            Exercise.objects.using(db_alias).bulk_update(batch, ["data"])
+            batch = []
+    Exercise.objects.using(db_alias).bulk_update(batch, ["data"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0058_coursevisibility'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='data_order',
+            field=django_better_admin_arrayfield.models.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, editable=False, size=None, verbose_name='Data key order'),
+        ),
+        migrations.RunPython(store_data_orders, reverse_code=restore_data_orders),
+        migrations.AlterField(
+            model_name='exercise',
+            name='data',
+            field=django.contrib.postgres.fields.jsonb.JSONField(verbose_name='Data'),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['data'], name='exercise_data_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.RunSQL(
+            sql=[
+                f"CREATE INDEX exercise_data_{key.lower()} "
+                f"ON exercises_exercise ((data -> '{key}'))"
+                for key in INDEXED_DATA_KEYS
+            ],
+            reverse_sql=[
+                f"DROP INDEX exercise_data_{key.lower()}" for key in INDEXED_DATA_KEYS
+            ],
+        ),
+    ]
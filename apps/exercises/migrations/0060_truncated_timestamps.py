@@ -0,0 +1,54 @@
+# Generated by Django 2.2.28 on 2026-10-17 06:05
+
+import apps.exercises.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0059_exercise_data_jsonb'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='course',
+            name='created',
+            field=apps.exercises.models.TruncatedDateTimeField(auto_now_add=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='updated',
+            field=apps.exercises.models.TruncatedDateTimeField(auto_now=True, verbose_name='Updated'),
+        ),
+        migrations.AlterField(
+            model_name='exercise',
+            name='created',
+            field=apps.exercises.models.TruncatedDateTimeField(auto_now_add=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='exercise',
+            name='updated',
+            field=apps.exercises.models.TruncatedDateTimeField(auto_now=True, verbose_name='Updated'),
+        ),
+        migrations.AlterField(
+            model_name='performancedata',
+            name='created',
+            field=apps.exercises.models.TruncatedDateTimeField(auto_now_add=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='performancedata',
+            name='updated',
+            field=apps.exercises.models.TruncatedDateTimeField(auto_now=True, verbose_name='Updated'),
+        ),
+        migrations.AlterField(
+            model_name='playlist',
+            name='created',
+            field=apps.exercises.models.TruncatedDateTimeField(auto_now_add=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='playlist',
+            name='updated',
+            field=apps.exercises.models.TruncatedDateTimeField(auto_now=True, verbose_name='Updated'),
+        ),
+    ]
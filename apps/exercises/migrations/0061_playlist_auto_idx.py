@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-17 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0060_truncated_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='playlist',
+            index=models.Index(fields=['authored_by', 'is_auto', 'updated'], name='playlist_auto_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def queue_course_progress_rebuild(apps, schema_editor):
+    """
+    Queue a gradebook job for each course graded before CourseProgress,
+    which rebuilds its progress from its performances (see
+    apps/exercises/jobs.py), as per JobManager.enqueue.
+    """
+    Course = apps.get_model("exercises", "Course")
+    CourseProgress = apps.get_model("exercises", "CourseProgress")
+    Job = apps.get_model("jobs", "Job")
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO {job_table} "
+            "(queue, key, payload, status, attempts, error, created, updated) "
+            "SELECT 'gradebook', course._id::text, '[]', 'queued', 0, '', NOW(), NOW() "
+            "FROM {course_table} AS course "
+            "WHERE course.performance_dict <> '{{}}' AND NOT EXISTS ("
+            "SELECT 1 FROM {progress_table} AS progress "
+            "WHERE progress.course_id = course._id"
+            ") "
+            "ON CONFLICT (queue, key) WHERE status = 'queued' DO NOTHING".format(
+                job_table=Job._meta.db_table,
+                course_table=Course._meta.db_table,
+                progress_table=CourseProgress._meta.db_table,
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+        ('exercises', '0061_playlist_auto_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            queue_course_progress_rebuild, reverse_code=migrations.RunPython.noop
+        ),
+    ]
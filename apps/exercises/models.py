@@ -8,11 +8,18 @@ import pytz
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
-from django.core.exceptions import ValidationError
-from django.db import models, connections
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import models, connections, transaction
 from django.db.models import When, Case, Q, F
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.urls import reverse, NoReverseMatch
 from django.utils import dateformat
@@ -22,13 +29,19 @@ from django.utils.timezone import now
 from django.utils.safestring import mark_safe
 from django_better_admin_arrayfield.models.fields import ArrayField
 
-from apps.accounts.models import Group
+from apps.accounts.models import ContentPermit, Group
+from apps.accounts.signals import user_pair_changed
 from apps.exercises.constants import (
     SIGNATURE_CHOICES,
     KEY_SIGNATURES,
     pseudo_key_to_sig,
 )
-from apps.exercises.utils.transpose import transpose
+from apps.exercises.utils.content_id import encode_id
+from apps.exercises.utils.data_order import key_order, restore_order
+from apps.exercises.utils.playlist_plan import PlaylistPlan, bump_plan_version
+from apps.exercises.utils.summary import summarize, summary_pass_date, summary_passed
+from apps.exercises.utils.transpose import transpose, transposed_id
+from apps.jobs.models import Job
 
 import re
 
@@ -36,35 +49,55 @@ User = get_user_model()
 
 
 class RawJSONField(JSONField):
-    """To preserve the data order."""
+    """
+    To preserve the data order. No longer used by Exercise.data (see
+    Exercise.data_order), but kept for its migrations.
+    """
 
     def db_type(self, connection):
         return "json"
 
 
+class TruncatedDateTimeField(models.DateTimeField):
+    """A DateTimeField saved without microseconds."""
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if value is not None and value.microsecond:
+            value = value.replace(microsecond=0)
+            setattr(model_instance, self.attname, value)
+        return value
+
+
 class BaseContentModel(models.Model):
     _id = models.AutoField("_ID", unique=True, primary_key=True)
 
     class Meta:
         abstract = True
 
+    @classmethod
+    def reserve_ids(cls, count):
+        """Take the next `count` values of the table's `_id` sequence."""
+        with connections["default"].cursor() as cursor:
+            cursor.execute(
+                "SELECT NEXTVAL(PG_GET_SERIAL_SEQUENCE(%s, %s)) "
+                "FROM GENERATE_SERIES(1, %s)",
+                [cls._meta.db_table, cls._meta.pk.column, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def reserve_id(self):
+        """
+        Take the next `_id` of the table's sequence, so that `id` can be set
+        before the row is inserted. Saves must then force the INSERT.
+        """
+        self._id = self.reserve_ids(1)[0]
+
     def set_id(self, initial):
-        assert len(initial) == 1
-
-        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        reverse_id = ""
-        bases = [26, 26, 10, 10, 26]
-        _id = self._id
-        for base in bases:
-            if base == 26:
-                reverse_id += letters[_id % base]
-            elif base == 10:
-                reverse_id += str(_id % base)
-            _id //= base
-        if _id != 0 or len(reverse_id) != len(bases):
+        content_id = encode_id(self._id, initial)
+        if content_id is None:
             return None
-        reverse_id += initial
-        self.id = reverse_id[::-1]
+        self.id = content_id
 
     def full_clean(self, exclude=None, validate_unique=True):
         super(BaseContentModel, self).full_clean(
@@ -91,7 +124,16 @@ class Exercise(ClonableModelMixin, BaseContentModel):
         null=True,
         # help_text="Brief description",
     )
-    data = RawJSONField("Data")
+    data = JSONField("Data")
+    data_order = ArrayField(
+        base_field=models.TextField(),
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name="Data key order",
+    )
+    # ^ jsonb does not keep key order, so it is stored here and restored on
+    # load (see apps/exercises/utils/data_order.py)
     rhythm = models.CharField(
         "Rhythm",
         max_length=255,
@@ -121,8 +163,8 @@ class Exercise(ClonableModelMixin, BaseContentModel):
 
     locked = models.BooleanField("Locked", default=False)
 
-    created = models.DateTimeField("Created", auto_now_add=True)
-    updated = models.DateTimeField("Updated", auto_now=True)
+    created = TruncatedDateTimeField("Created", auto_now_add=True)
+    updated = TruncatedDateTimeField("Updated", auto_now=True)
 
     zero_padding = "EA00A0"
 
@@ -159,6 +201,25 @@ class Exercise(ClonableModelMixin, BaseContentModel):
     class Meta:
         verbose_name = "Exercise"
         verbose_name_plural = "Exercises"
+        indexes = [
+            # containment, e.g. data__contains={"type": "chorale"}
+            GinIndex(
+                fields=["data"],
+                name="exercise_data_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+            # lookups of data__type, data__key and data__keySignature are
+            # backed by expression indexes (see migration 0059)
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "data" in instance.__dict__ and "data_order" in instance.__dict__:
+            instance.data = restore_order(
+                instance.data, instance.data_order, cls.get_data_order_list()
+            )
+        return instance
 
     @classmethod
     def get_data_order_list(cls):
@@ -194,18 +255,20 @@ class Exercise(ClonableModelMixin, BaseContentModel):
         ).first()
 
     def save(self, *args, **kwargs):
-        if not self._id:
-            super(Exercise, self).save(*args, **kwargs)
-            self.set_id(initial="E")
-            self.save()
-            self.set_auto_playlist()
+        adding = not self._id
+        if adding:
+            self.reserve_id()
+            kwargs["force_insert"] = True
 
         # self.validate_unique()
         self.set_id(initial="E")
         self.sort_data()
         self.set_rhythm_values()
+        self.data_order = key_order(self.data)
 
         super(Exercise, self).save(*args, **kwargs)
+        if adding:
+            self.set_auto_playlist()
 
     def sort_data(self):
         if not all([key in self.data for key in self.get_data_order_list()]):
@@ -239,20 +302,8 @@ class Exercise(ClonableModelMixin, BaseContentModel):
         self.data["chord"] = chord_data
 
     def set_auto_playlist(self):
-        auto_playlist = Playlist.objects.filter(
-            authored_by=self.authored_by,
-            is_auto=True,
-            updated__gt=now()
-            - timedelta(hours=8),  # capture playlists authored in the last eight hours
-        ).last()
+        auto_playlist = Playlist.get_auto_playlist(self.authored_by)
         if auto_playlist is None:
-            auto_playlist = Playlist.create_auto_playlist(
-                authored_by=self.authored_by, initial_exercise_id=self.id
-            )
-        lately_edited_playlists = Playlist.objects.filter(
-            updated__gt=auto_playlist.updated
-        )
-        if lately_edited_playlists.exists():
             Playlist.create_auto_playlist(
                 authored_by=self.authored_by, initial_exercise_id=self.id
             )
@@ -326,8 +377,8 @@ class Playlist(ClonableModelMixin, BaseContentModel):
         verbose_name="Author of Playlist",
     )
 
-    created = models.DateTimeField("Created", auto_now_add=True)
-    updated = models.DateTimeField("Updated", auto_now=True)
+    created = TruncatedDateTimeField("Created", auto_now_add=True)
+    updated = TruncatedDateTimeField("Updated", auto_now=True)
 
     # exercises = models.CharField(
     #     "Exercise IDs",
@@ -380,9 +431,18 @@ class Playlist(ClonableModelMixin, BaseContentModel):
 
     zero_padding = "PA00A0"
 
+    # capture playlists authored in the last eight hours (see get_auto_playlist)
+    AUTO_PLAYLIST_PERIOD = timedelta(hours=8)
+
     class Meta:
         verbose_name = "Playlist"
         verbose_name_plural = "Playlists"
+        indexes = [
+            models.Index(
+                fields=["authored_by", "is_auto", "updated"],
+                name="playlist_auto_idx",
+            ),
+        ]
 
     @cached_property
     def untransposed_exercises_ids(self):
@@ -449,11 +509,14 @@ class Playlist(ClonableModelMixin, BaseContentModel):
         if not self.transposition_matrix:
             return []
 
+        exercise_dict = self.exercise_dict
         result = []
         for transposition in self.transposition_matrix:
             exercise_id, staff_sig_request = transposition
             result.append(
-                transpose(self.exercise_dict[exercise_id], staff_sig_request).id
+                transposed_id(
+                    exercise_id, exercise_dict[exercise_id].data, staff_sig_request
+                )
             )
         return result
 
@@ -471,12 +534,26 @@ class Playlist(ClonableModelMixin, BaseContentModel):
 
         return exercises
 
+    @property
+    def plan(self):
+        """The cached PlaylistPlan of the playlist."""
+        return PlaylistPlan.get(self)
+
     def append_exercise(self, exercise_id):
+        """Append the exercise of ID `exercise_id` after the last, in one statement."""
         # TODO: add checks to ensure order integrity
-        self.exercises.add(
-            Exercise.objects.get(id=exercise_id),
-            through_defaults={"order": len(self.exercises.all()) + 1},
-        )
+        with connections["default"].cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {table} (exercise_id, playlist_id, "order") '
+                "SELECT exercise._id, %s, ("
+                'SELECT COALESCE(MAX("order"), 0) + 1 FROM {table} WHERE playlist_id = %s'
+                ") FROM {exercise_table} AS exercise WHERE exercise.id = %s".format(
+                    table=ExercisePlaylistOrdered._meta.db_table,
+                    exercise_table=Exercise._meta.db_table,
+                ),
+                [self._id, self._id, exercise_id],
+            )
+        # also makes the plan stale, as the INSERT sends no signal
         self.save()
 
     def is_transposed(self):
@@ -519,6 +596,25 @@ class Playlist(ClonableModelMixin, BaseContentModel):
         except NoReverseMatch:
             return None
 
+    def get_exercise_urls(self, course_id=None):
+        """The URLs of all exercises, as per get_exercise_url_by_num."""
+        urls = []
+        for num in range(1, len(self.exercise_list) + 1):
+            try:
+                urls.append(
+                    reverse(
+                        "lab:playlist-view",
+                        kwargs={
+                            "playlist_id": self.id,
+                            "course_id": course_id,
+                            "exercise_num": num,
+                        },
+                    )
+                )
+            except NoReverseMatch:
+                urls.append(None)
+        return urls
+
     def get_exercise_url_by_id(self, id, course_id=None):
         try:
             exercise_num = self.exercise_list.index(id) + 1
@@ -578,7 +674,8 @@ class Playlist(ClonableModelMixin, BaseContentModel):
 
     def save(self, *args, **kwargs):
         if not self._id:
-            super(Playlist, self).save(*args, **kwargs)
+            self.reserve_id()
+            kwargs["force_insert"] = True
         self.set_id(initial="P")
         self.set_auto_name()
         # self.clean_exercises()
@@ -596,15 +693,34 @@ class Playlist(ClonableModelMixin, BaseContentModel):
             .exists()
         )
 
+    @classmethod
+    def get_auto_playlist(cls, authored_by):
+        """
+        The auto playlist to append new exercises of the author to, if any:
+        their latest, if updated lately and since their other playlists.
+        """
+        auto_playlist = (
+            cls.objects.filter(
+                authored_by=authored_by,
+                is_auto=True,
+                updated__gt=now() - cls.AUTO_PLAYLIST_PERIOD,
+            )
+            .order_by("-updated")
+            .first()
+        )
+        if auto_playlist is None:
+            return None
+        if cls.objects.filter(
+            authored_by=authored_by, is_auto=False, updated__gt=auto_playlist.updated
+        ).exists():
+            return None
+        return auto_playlist
+
     @classmethod
     def create_auto_playlist(cls, initial_exercise_id, authored_by):
         auto_playlist = Playlist(authored_by=authored_by, is_auto=True)
         auto_playlist.save()
-        auto_playlist.exercises.add(
-            Exercise.objects.get(id=initial_exercise_id),
-            through_defaults={"order": 1},
-        )
-        auto_playlist.save()
+        auto_playlist.append_exercise(initial_exercise_id)
         return auto_playlist
 
     @classmethod
@@ -703,9 +819,12 @@ class Course(ClonableModelMixin, BaseContentModel):
     )
 
     performance_dict = JSONField(default=dict, verbose_name="Performances", blank=True)
+    # ^ legacy storage of the course progress, no longer written nor read: the
+    # courses holding it are rebuilt into CourseProgress by the gradebook jobs
+    # queued by migration 0062 (or by the rebuild_course_progress command)
 
-    created = models.DateTimeField("Created", auto_now_add=True)
-    updated = models.DateTimeField("Updated", auto_now=True)
+    created = TruncatedDateTimeField("Created", auto_now_add=True)
+    updated = TruncatedDateTimeField("Updated", auto_now=True)
 
     timely_credit = models.DecimalField(
         "Points per playlist if timely",
@@ -761,16 +880,25 @@ class Course(ClonableModelMixin, BaseContentModel):
         return self.id
 
     def save(self, *args, **kwargs):
+        prev_tardy_threshold = None
         if not self._id:
-            super(Course, self).save(*args, **kwargs)
+            self.reserve_id()
+            kwargs["force_insert"] = True
+        else:
+            # Check the database to see if the tardy_threshold has changed,
+            #   database call preferred to some of the other solutions talked about here: https://stackoverflow.com/questions/1355150/
+            prev_tardy_threshold = (
+                Course.objects.filter(_id=self._id)
+                .values_list("tardy_threshold", flat=True)
+                .first()
+            )
         self.set_id(initial="C")
-        # Check the database to see if the tardy_threshold has changed,
-        #   database call preferred to some of the other solutions talked about here: https://stackoverflow.com/questions/1355150/
-        prev_course = Course.objects.filter(_id=self._id).first()
-        if prev_course:
-            if prev_course.tardy_threshold != self.tardy_threshold:
-                self.refresh_performance_dict(commit=False)
         super(Course, self).save(*args, **kwargs)
+        # number of marks regraded, None if regrading is left to the worker
+        self.regraded_marks = 0
+        if prev_tardy_threshold is not None:
+            if prev_tardy_threshold != self.tardy_threshold:
+                self.regraded_marks = self.regrade(prev_tardy_threshold)
         return self
 
     def clean(self):
@@ -841,16 +969,14 @@ class Course(ClonableModelMixin, BaseContentModel):
         # due dates are defined by course authors and should be understood in terms of their own or their institution's timezone
         # the due_date is NOT to be read as UTC
 
-    def add_performance_to_dict(self, performance_data, commit=True):
-        # Assigns numerical value to each pass mark to prevent "better" pass marks from being overwritten
-        pass_marks_worst_to_best = ["X", "C", "L", "T", "P"]
-
-        pco = PlaylistCourseOrdered.objects.get(
-            course_id=self._id, playlist_id=performance_data.playlist_id
-        )
-        # TODO: it might be bad to rely upon str, which is liable to change, but then again we could just refresh when that happens
-        performer = str(User.objects.get(id=performance_data.user_id)) # looks like e.g. "Joe Student - student@college.edu"
+    def get_pass_mark(self, performance_data, pco=None):
+        """
+        Return the pass mark of a performance in this course with its
+        pass date: "X" if not passed, "C" if passed without a due date,
+        otherwise "P", "T" or "L" (on time, tardy or late).
+        """
         pass_mark = "X"
+        pass_date = None
         if performance_data.playlist_passed():
             pass_mark = "C"
             try:
@@ -862,63 +988,164 @@ class Course(ClonableModelMixin, BaseContentModel):
             try:
                 pass_date = performance_data.get_local_pass_date()
             except:
-                pass_date = False
+                pass_date = None
                 # ERROR MESSAGE SHOULD READ: 'Failed to get local_pass_date, so course activity table may not show lateness accurately.'
             if due_date and pass_date:
-                if pass_date <= due_date:
-                    pass_mark = "P"
-                if pass_date > due_date:
-                    pass_mark = "L"
-                    late_diff = pass_date - due_date
-                    hours = late_diff.days * 24 + late_diff.seconds // 3600
-                    if hours == 0:
-                        pass_mark = "P"
-                        # grace period of up to one hour due to // operation above
-                    elif hours < self.tardy_threshold:
-                        pass_mark = "T"
-                        # tardy category
-        if not (performer in self.performance_dict):
-            self.performance_dict[performer] = {}
-        # Only overwrite previous performance if new performance is better
+                pass_mark = self.get_lateness_mark(pass_date, due_date)
+        return pass_mark, pass_date
+
+    def get_lateness_mark(self, pass_date, due_date):
+        if pass_date <= due_date:
+            return "P"
+        late_diff = pass_date - due_date
+        hours = late_diff.days * 24 + late_diff.seconds // 3600
+        if hours == 0:
+            # grace period of up to one hour due to // operation above
+            return "P"
+        if hours < self.tardy_threshold:
+            # tardy category
+            return "T"
+        return "L"
+
+    # courses with more tardy or late marks to regrade are regraded by the worker
+    REGRADE_INLINE_LIMIT = 500
+
+    def regrade(self, prev_tardy_threshold):
+        """
+        Regrade the course progress after a change of tardy_threshold.
+        Returns the number of marks changed, or None if the regrading was
+        queued for the worker (see apps/exercises/jobs.py).
+        """
+        candidates = self.get_regrade_candidates([prev_tardy_threshold])
         if (
-            pass_marks_worst_to_best.index(
-                self.performance_dict.get(performer, {}).get(pco.playlist.id, "X")
-            )
-            <= pass_marks_worst_to_best.index(pass_mark)
+            not CourseProgress.objects.filter(course_id=self._id).exists()
+            or candidates.count() > self.REGRADE_INLINE_LIMIT
         ):
-            # important that the dictionary key is pco.playlist.id, not pco.order nor pco.playlist_id
-            self.performance_dict[performer][pco.playlist.id] = pass_mark
-        # self.performance_dict[performer].pop("reset") # UNCOMMENT TO MAINTAIN PREVIOUS INEFFICIENT LOGIC
-        try:
-            if not "reset" in self.performance_dict[performer]:
-                self.performance_dict[performer]["reset"] = True # bug fix for pre-2024-10 data
-                self.performance_dict[performer]["time_elapsed"] = 0
-                for exercise_data in performance_data.data:
-                    self.performance_dict[performer]["time_elapsed"] += \
-                        exercise_data["performance_duration_in_seconds"]
-                    print(exercise_data["performance_duration_in_seconds"])
-            else:
-                # self.performance_dict[performer] is the record used for the course activity table
-                # it keeps track of whether each playlist has been passed and how long has been spent on each course
-                # performance_data.data is the complete array of performances for the individual user
-                exercise_data = performance_data.data[-1:][0]
-                self.performance_dict[performer]["time_elapsed"] += \
-                    exercise_data["performance_duration_in_seconds"]
-                print(exercise_data["performance_duration_in_seconds"])
-        except:
-            pass
-        if commit:
-            self.save()
-
-    def refresh_performance_dict(self, commit=True):
-        self.performance_dict = {}
+            Job.objects.enqueue(
+                "regrade", key=str(self._id), payload=[prev_tardy_threshold]
+            )
+            return None
+        return self.regrade_marks(candidates)
+
+    def get_regrade_candidates(self, prev_tardy_thresholds):
+        """
+        The progress whose mark may change from the previous thresholds to
+        the current one: only tardy marks when the threshold was lowered,
+        only late marks when it was raised.
+        """
+        pass_marks = set()
+        for prev_tardy_threshold in prev_tardy_thresholds:
+            if prev_tardy_threshold > self.tardy_threshold:
+                pass_marks.add("T")
+            elif prev_tardy_threshold < self.tardy_threshold:
+                pass_marks.add("L")
+        return CourseProgress.objects.filter(
+            course_id=self._id, pass_mark__in=pass_marks, pass_date__isnull=False
+        )
+
+    def regrade_marks(self, candidates):
+        """
+        Reclassify the marks of `candidates` per their stored pass dates,
+        with one update per new mark. Returns the number of marks changed.
+        """
+        due_dates = {
+            playlist_id: due_date.replace(tzinfo=pytz.timezone(settings.TIME_ZONE))
+            for playlist_id, due_date in PlaylistCourseOrdered.objects.filter(
+                course_id=self._id, due_date__isnull=False
+            ).values_list("playlist_id", "due_date")
+        }
+        regraded = {}
+        for progress_id, playlist_id, pass_mark, pass_date in candidates.values_list(
+            "id", "playlist_id", "pass_mark", "pass_date"
+        ).iterator():
+            if playlist_id not in due_dates:
+                continue
+            new_pass_mark = self.get_lateness_mark(pass_date, due_dates[playlist_id])
+            if new_pass_mark != pass_mark:
+                regraded.setdefault(new_pass_mark, [])
+                regraded[new_pass_mark].append(progress_id)
+        for pass_mark, progress_ids in regraded.items():
+            CourseProgress.objects.filter(id__in=progress_ids).update(
+                pass_mark=pass_mark
+            )
+        return sum(len(progress_ids) for progress_ids in regraded.values())
+
+    def add_performance(self, performance_data, attempts=None):
+        """
+        Record the pass mark of a performance in the course progress.
+
+        attempts: the attempt data not yet counted in the time spent,
+        by default the latest attempt of performance_data
+        """
+        pco = PlaylistCourseOrdered.objects.filter(
+            course_id=self._id, playlist_id=performance_data.playlist_id
+        ).first()
+        pass_mark, pass_date = self.get_pass_mark(performance_data, pco)
+        if attempts is None:
+            attempts = performance_data.attempt_data[-1:]
+        CourseProgress.objects.record(
+            course_id=self._id,
+            user_id=performance_data.user_id,
+            playlist_id=performance_data.playlist_id,
+            pass_mark=pass_mark,
+            pass_date=pass_date,
+            time_elapsed=sum(
+                exercise_data["performance_duration_in_seconds"]
+                for exercise_data in attempts
+            ),
+        )
+
+    def refresh_progress(self):
+        """Recompute the course progress from all performances of the course."""
+        pcos = {
+            pco.playlist_id: pco
+            for pco in PlaylistCourseOrdered.objects.filter(course_id=self._id)
+        }
+        progress = {}
         course_performances = PerformanceData.objects.filter(
             Q(course=self) | Q(course=None, playlist__in=self.playlists.all())
         ).order_by("updated")
         for pd in course_performances:
-            self.add_performance_to_dict(pd, commit=False)
-        if commit:
-            self.save()
+            pass_mark, pass_date = self.get_pass_mark(pd, pcos.get(pd.playlist_id))
+            time_elapsed = pd.playing_seconds
+            key = (pd.user_id, pd.playlist_id)
+            if key in progress:
+                # performances with and without the course: keep the best mark
+                previous = progress[key]
+                time_elapsed += previous.time_elapsed
+                if CourseProgress.rank(previous.pass_mark) > CourseProgress.rank(
+                    pass_mark
+                ):
+                    pass_mark, pass_date = previous.pass_mark, previous.pass_date
+            progress[key] = CourseProgress(
+                course_id=self._id,
+                user_id=pd.user_id,
+                playlist_id=pd.playlist_id,
+                pass_mark=pass_mark,
+                pass_date=pass_date,
+                time_elapsed=time_elapsed,
+            )
+        with transaction.atomic():
+            CourseProgress.objects.filter(course_id=self._id).delete()
+            CourseProgress.objects.bulk_create(progress.values(), batch_size=1000)
+
+    @property
+    def progress_dict(self):
+        """
+        The course progress in the format of performance_dict, e.g.
+        {"Joe Student - student@college.edu": {"PA00AB": "P", "time_elapsed": 62.0}}.
+        """
+        progress = CourseProgress.objects.filter(course_id=self._id).select_related(
+            "user", "playlist"
+        )
+        return CourseProgress.as_performance_dict(progress)
+
+    def get_progress_of(self, performer):
+        """The entry of `performer` in progress_dict."""
+        progress = CourseProgress.objects.filter(
+            course_id=self._id, user=performer
+        ).select_related("user", "playlist")
+        return CourseProgress.as_performance_dict(progress).get(str(performer), {})
 
 
 class PlaylistCourseOrdered(ClonableModelMixin, BaseContentModel):
@@ -951,14 +1178,27 @@ class PerformanceData(models.Model):
         null=True,
     )
     data = JSONField("Raw Data", default=list)
+    # Legacy storage: attempts are now written to PerformanceAttempt, and
+    # `data` only holds attempts that have not yet been backfilled.
+    summary = JSONField("Summary", default=dict, blank=True)
+    # ^ see attempt_summary
 
-    created = models.DateTimeField("Created", auto_now_add=True)
-    updated = models.DateTimeField("Updated", auto_now=True)
+    created = TruncatedDateTimeField("Created", auto_now_add=True)
+    updated = TruncatedDateTimeField("Updated", auto_now=True)
 
     class Meta:
         verbose_name = "Performance"
         verbose_name_plural = "Performance Data"
         unique_together = (("user", "playlist", "course"),)
+        constraints = [
+            # unique_together does not cover performances outside a course,
+            # since NULL course_ids never collide
+            models.UniqueConstraint(
+                fields=["user", "playlist"],
+                condition=Q(course=None),
+                name="performancedata_unique_without_course",
+            ),
+        ]
 
     def __str__(self):
         return f"Playlist:{self.playlist}, Course:{self.course} - User:{self.user}"
@@ -980,7 +1220,7 @@ class PerformanceData(models.Model):
         exercise_id: str,
         data: dict,
     ):
-        pd, _ = cls.objects.get_or_create(
+        pd = cls(
             user_id=user_id,
             course_id=course_id,
             playlist_id=playlist_id,
@@ -993,77 +1233,227 @@ class PerformanceData(models.Model):
             # server_date = datetime.isoformat(datetime.now())[:-3]+'Z' # UTC
         )
 
-        pd.data.append(exercise_data)
-        pd.full_clean()
-        pd.save()
-        try:
+        attempt = PerformanceAttempt.from_attempt_data(pd, exercise_data)
+        with transaction.atomic():
+            # the upsert keeps the performance row locked until the end of
+            # the transaction, so concurrent submits are summarized in turn
+            pd.summary, pd.data = cls.append_attempt(attempt)
+            pd.id = attempt.performance_id
+            if not pd.summary:
+                # a performance not summarized yet, whose legacy attempts
+                # are the stored `data` returned by the upsert
+                pd.summary = summarize(pd.attempt_data)
+                cls.objects.filter(id=pd.id).update(summary=pd.summary)
             if course_id:
-                course = Course.objects.get(_id=course_id)
-                print("\n")
-                print(course, "len(pd.data):", len(pd.data))
-                course.add_performance_to_dict(pd)
-        except:
-            pass
-            # ERROR MESSAGE SHOULD READ: 'Failed to save course performance dictionary but proceeding to return performance data.''
-
-        # the slicing of exercise_id ensures exercises are locked when performed in transposition
-        exercise = Exercise.objects.get(id=exercise_id[0:6])
-        if exercise.authored_by_id != user_id and not exercise.locked:
-            exercise.lock()
+                # the course progress is updated by the worker
+                # (see apps/exercises/jobs.py) rather than during the request
+                Job.objects.enqueue(
+                    "gradebook", key=str(course_id), payload=[attempt.id]
+                )
+
+            # the slicing of exercise_id ensures exercises are locked when performed
+            # in transposition; an update rather than Exercise.lock, whose save
+            # would make the plans of the exercise's playlists stale
+            Exercise.objects.filter(id=exercise_id[0:6], locked=False).exclude(
+                authored_by_id=user_id
+            ).update(locked=True)
         return pd
 
+    # The stored summary updated with the attempt, as per summarize (see
+    # apps/exercises/utils/summary.py). An empty summary is left as is, as
+    # its performance has legacy attempts to summarize first (see submit).
+    SUMMARY_UPDATE_SQL = (
+        "CASE WHEN {summary} = '{{}}' THEN {summary} ELSE jsonb_build_object("
+        "'attempts', ({summary} ->> 'attempts')::integer + 1, "
+        "'seconds', ({summary} ->> 'seconds')::numeric + %(seconds)s, "
+        "'exercises', ({summary} -> 'exercises') || jsonb_build_object("
+        "%(exercise_id)s::text, jsonb_build_object("
+        "'count', COALESCE(({exercise} ->> 'count')::integer, 0) + 1, "
+        "'first_pass', COALESCE("
+        "NULLIF({exercise} -> 'first_pass', 'null'), "
+        "CASE WHEN {na} OR %(error_tally)s::integer IN (0, -1) "
+        "THEN to_jsonb(%(performed_at)s::text) END, "
+        "'null'), "
+        "'pass_date', CASE WHEN {na} OR %(error_tally)s::integer = 0 "
+        "THEN to_jsonb(LEAST("
+        "({exercise} ->> 'pass_date') COLLATE \"C\", %(performed_at)s::text"
+        ")) "
+        "ELSE COALESCE({exercise} -> 'pass_date', 'null') END, "
+        "'least_errors', CASE WHEN {na} "
+        "THEN COALESCE({exercise} -> 'least_errors', 'null') "
+        "ELSE to_jsonb(LEAST("
+        "({exercise} ->> 'least_errors')::integer, %(error_tally)s::integer"
+        ")) END, "
+        "'error_count', COALESCE("
+        "to_jsonb(%(error_tally)s::integer), {exercise} -> 'error_count', '0'"
+        ")"
+        "))) END"
+    )
+
+    @classmethod
+    def append_attempt(cls, attempt):
+        """
+        Get or create the performance of the attempt's user, playlist and
+        course, store the attempt in it and update its summary, in a single
+        statement which writes the performance row once.
+
+        Concurrent submits for the same performance cannot lose attempts:
+        the upsert is arbitrated by the unique constraints on
+        (user, playlist, course), and each attempt is its own row.
+        Sets the ids of the attempt and its performance, and returns the
+        summary of the performance with the attempt and its legacy `data`.
+        Raises ObjectDoesNotExist if the playlist or the course does not
+        exist, in which case nothing is stored.
+        """
+        performance_table = cls._meta.db_table
+        attempt_table = PerformanceAttempt._meta.db_table
+        if attempt.course_id is None:
+            conflict_target = "(user_id, playlist_id) WHERE course_id IS NULL"
+        else:
+            conflict_target = "(user_id, playlist_id, course_id)"
+        attempt_data = attempt.as_attempt_data()
+
+        with connections["default"].cursor() as cursor:
+            attempt_fields = [
+                field
+                for field in PerformanceAttempt._meta.concrete_fields
+                if not field.primary_key and field.name != "performance"
+            ]
+            attempt_columns = ", ".join(field.column for field in attempt_fields)
+            params = {
+                f"attempt_{field.column}": field.get_db_prep_save(
+                    getattr(attempt, field.attname), cursor.db
+                )
+                for field in attempt_fields
+            }
+            params.update(
+                user_id=attempt.user_id,
+                playlist_id=attempt.playlist_id,
+                course_id=attempt.course_id,
+                # the summary of a new performance
+                summary=cls._meta.get_field("summary").get_db_prep_save(
+                    summarize([attempt_data]), cursor.db
+                ),
+                exercise_id=attempt.exercise_id,
+                seconds=attempt.performance_duration_in_seconds,
+                performed_at=attempt_data["performed_at"],
+                error_tally=attempt.error_tally,
+            )
+            cursor.execute(
+                "WITH performance AS ("
+                "INSERT INTO {performance_table} AS stored "
+                "(user_id, playlist_id, course_id, data, summary, created, updated) "
+                "SELECT %(user_id)s, playlist.{playlist_pk}, %(course_id)s, "
+                "'[]'::jsonb, %(summary)s::jsonb, "
+                "DATE_TRUNC('second', NOW()), DATE_TRUNC('second', NOW()) "
+                "FROM {playlist_table} AS playlist "
+                "WHERE playlist.{playlist_pk} = %(playlist_id)s "
+                "AND (%(course_id)s::integer IS NULL OR EXISTS ("
+                "SELECT 1 FROM {course_table} AS course "
+                "WHERE course.{course_pk} = %(course_id)s"
+                ")) "
+                "ON CONFLICT {conflict_target} "
+                "DO UPDATE SET updated = EXCLUDED.updated, summary = {summary_update} "
+                "RETURNING id, summary, data"
+                "), attempt AS ("
+                "INSERT INTO {attempt_table} (performance_id, {attempt_columns}) "
+                "SELECT performance.id, {attempt_placeholders} FROM performance "
+                "RETURNING id, performance_id"
+                ") "
+                "SELECT attempt.id, attempt.performance_id, "
+                "performance.summary, performance.data "
+                "FROM attempt, performance".format(
+                    performance_table=performance_table,
+                    playlist_table=Playlist._meta.db_table,
+                    playlist_pk=Playlist._meta.pk.column,
+                    course_table=Course._meta.db_table,
+                    course_pk=Course._meta.pk.column,
+                    conflict_target=conflict_target,
+                    summary_update=cls.SUMMARY_UPDATE_SQL.format(
+                        summary="stored.summary",
+                        exercise=(
+                            "(stored.summary -> 'exercises' -> %(exercise_id)s::text)"
+                        ),
+                        na="%(error_tally)s::integer IS NULL",
+                    ),
+                    attempt_table=attempt_table,
+                    attempt_columns=attempt_columns,
+                    attempt_placeholders=", ".join(
+                        f"%(attempt_{field.column})s" for field in attempt_fields
+                    ),
+                ),
+                params,
+            )
+            row = cursor.fetchone()
+        if row is None:
+            # no performance was selected for insertion, nor any attempt
+            raise ObjectDoesNotExist(
+                "The playlist or the course of the attempt does not exist."
+            )
+        attempt.id, attempt.performance_id, summary, data = row
+        return summary, data
+
+    @cached_property
+    def attempt_data(self):
+        """
+        All attempts of this performance, oldest first, as dicts in the
+        format historically stored in `data`: attempts not yet backfilled
+        into PerformanceAttempt followed by the stored attempt rows.
+        """
+        stored = [
+            attempt.as_attempt_data()
+            for attempt in PerformanceAttempt.objects.filter(performance=self).order_by(
+                "performed_at", "id"
+            )
+        ]
+        return list(self.data) + stored
+
+    @property
+    def attempt_summary(self):
+        """
+        The summary of all attempts (see apps/exercises/utils/summary.py),
+        computed and stored on first use for performances summarized
+        before `summary` existed.
+        """
+        if not self.summary:
+            self.summary = summarize(self.attempt_data)
+            PerformanceData.objects.filter(id=self.id).update(summary=self.summary)
+        return self.summary
+
     def get_exercise_first_pass(self, exercise_id):
-        for exercise in self.data:
-            if exercise["id"] == exercise_id and exercise["error_tally"] in [
-                0,
-                -1,
-                "n/a",
-            ]:
-                return exercise["performed_at"]
-            elif exercise["id"] == exercise_id:
-                continue
-        return False
+        exercise = self.attempt_summary["exercises"].get(exercise_id)
+        if exercise is None or exercise["first_pass"] is None:
+            return False
+        return exercise["first_pass"]
 
     def playlist_passed(self):
-        from apps.dashboard.views.performance import playlist_pass_bool
-
-        return playlist_pass_bool(
-            self.playlist.exercise_list, self.data, len(self.playlist.exercise_list)
-        )
+        return summary_passed(self.attempt_summary, self.playlist.exercise_list)
 
     @cached_property
     def playlist_pass_date(self):
-        from apps.dashboard.views.performance import playlist_pass_date
+        pass_date = self.get_local_pass_date()
+        if pass_date is None:
+            return None
+        return datetime.strftime(pass_date, "%Y_%m_%d (%a) %H:%M")
 
-        return playlist_pass_date(
-            self.playlist.exercise_list, self.data, len(self.playlist.exercise_list)
-        )
+    @property
+    def playing_seconds(self):
+        return self.attempt_summary["seconds"]
 
     def exercise_is_performed(self, exercise_id):
-        return any([exercise["id"] == exercise_id for exercise in self.data])
+        return exercise_id in self.attempt_summary["exercises"]
 
     def exercise_error_count(self, exercise_id):
-        error_count = 0
-        for exercise in self.data:
-            if exercise["id"] == exercise_id and exercise["error_tally"] == 0:
-                error_count = 0
-            if exercise["id"] == exercise_id and exercise["error_tally"] not in [
-                0,
-                "n/a",
-            ]:
-                error_count = exercise["error_tally"]
-        return error_count
+        exercise = self.attempt_summary["exercises"].get(exercise_id)
+        return exercise["error_count"] if exercise else 0
 
     # @cached_property # this being a cached property caused the function call to fail
     def get_local_pass_date(self):
-        from apps.dashboard.views.performance import playlist_pass_date
-
-        pass_date_str = playlist_pass_date(
-            exercise_list=self.playlist.exercise_list,
-            exercises_data=self.data,
-            playlist_length=len(self.playlist.exercise_list),
-            make_concise_and_localize=False,
+        pass_date_str = summary_pass_date(
+            self.attempt_summary, self.playlist.exercise_list
         )
+        if pass_date_str is None:
+            return None
         # UTC is assumed here since the performed_at property is written to the performance database per UTC
         pass_date_utc = datetime.strptime(pass_date_str, "%Y-%m-%d %H:%M:%S").replace(
             tzinfo=pytz.timezone("UTC")
@@ -1072,17 +1462,365 @@ class PerformanceData(models.Model):
         return pass_date_utc.astimezone(pytz.timezone(settings.TIME_ZONE))
 
 
-@receiver(post_save, sender=Exercise)
+class PerformanceAttempt(models.Model):
+    """A single submitted attempt at one exercise of a performed playlist."""
+
+    performance = models.ForeignKey(
+        PerformanceData, related_name="attempts", on_delete=models.CASCADE
+    )
+    user = models.ForeignKey(
+        User, related_name="performance_attempts", on_delete=models.PROTECT
+    )
+    playlist = models.ForeignKey(
+        Playlist, related_name="performance_attempts", on_delete=models.PROTECT
+    )
+    course = models.ForeignKey(
+        Course,
+        related_name="performance_attempts",
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True,
+    )
+    exercise_id = models.CharField("E-ID", max_length=16)
+    performed_at = models.DateTimeField("Performed at")
+    error_tally = models.IntegerField("Error tally", blank=True, null=True)
+    # ^ None stands for the legacy "n/a" tally
+    performance_duration_in_seconds = models.FloatField("Duration", default=0)
+    tempo_mean_semibreves_per_min = models.FloatField(
+        "Mean tempo", blank=True, null=True
+    )
+    tempo_sd_semibreves_per_min = models.FloatField(
+        "Tempo standard deviation", blank=True, null=True
+    )
+    tempo_rating = models.FloatField("Tempo rating", blank=True, null=True)
+    extra = JSONField("Other Data", default=dict, blank=True)
+    # ^ any other keys submitted with the attempt, e.g. client_completion_date
+
+    # keys of the attempt dict with a column of their own
+    column_keys = {
+        "id": "exercise_id",
+        "performed_at": "performed_at",
+        "error_tally": "error_tally",
+        "performance_duration_in_seconds": "performance_duration_in_seconds",
+        "tempo_mean_semibreves_per_min": "tempo_mean_semibreves_per_min",
+        "tempo_SD_semibreves_per_min": "tempo_sd_semibreves_per_min",
+        "tempo_rating": "tempo_rating",
+    }
+    performed_at_format = "%Y-%m-%d %H:%M:%S"
+
+    class Meta:
+        verbose_name = "Performance Attempt"
+        verbose_name_plural = "Performance Attempts"
+        indexes = [
+            models.Index(
+                fields=["performance", "performed_at"],
+                name="attempt_performance_idx",
+            ),
+            models.Index(
+                fields=["user", "playlist", "course"], name="attempt_user_playlist_idx"
+            ),
+            models.Index(fields=["exercise_id"], name="attempt_exercise_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.exercise_id} - {self.performed_at}"
+
+    @classmethod
+    def from_attempt_data(cls, performance, exercise_data):
+        """Build an (unsaved) attempt from a dict in the legacy `data` format."""
+        exercise_data = dict(exercise_data)
+        attempt = cls(
+            performance=performance,
+            user_id=performance.user_id,
+            playlist_id=performance.playlist_id,
+            course_id=performance.course_id,
+        )
+        for key, field_name in cls.column_keys.items():
+            if key in exercise_data:
+                setattr(attempt, field_name, exercise_data.pop(key))
+        # performed_at is written per UTC, see PerformanceData.submit
+        attempt.performed_at = datetime.strptime(
+            attempt.performed_at, cls.performed_at_format
+        ).replace(tzinfo=pytz.utc)
+        if not isinstance(attempt.error_tally, int):
+            attempt.error_tally = None
+        attempt.performance_duration_in_seconds = (
+            attempt.performance_duration_in_seconds or 0
+        )
+        attempt.extra = exercise_data
+        return attempt
+
+    def as_attempt_data(self):
+        """Return the attempt as a dict in the legacy `data` format."""
+        exercise_data = dict(self.extra)
+        for key, field_name in self.column_keys.items():
+            exercise_data[key] = getattr(self, field_name)
+        exercise_data["performed_at"] = self.performed_at.astimezone(
+            pytz.utc
+        ).strftime(self.performed_at_format)
+        if self.error_tally is None:
+            exercise_data["error_tally"] = "n/a"
+        return exercise_data
+
+
+class CourseProgressManager(models.Manager):
+    def record(
+        self, course_id, user_id, playlist_id, pass_mark, pass_date, time_elapsed
+    ):
+        """
+        Add a pass mark and time spent to the progress of a performer in a
+        course. The mark only replaces a worse one, and concurrent records
+        for different performers touch different rows.
+        """
+        with connections["default"].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO {table} AS progress "
+                "(course_id, user_id, playlist_id, pass_mark, pass_date, time_elapsed, updated) "
+                "VALUES (%s, %s, %s, %s, %s, %s, NOW()) "
+                "ON CONFLICT (course_id, user_id, playlist_id) DO UPDATE SET "
+                "pass_mark = CASE WHEN {new_rank} >= {rank} "
+                "THEN EXCLUDED.pass_mark ELSE progress.pass_mark END, "
+                "pass_date = CASE WHEN {new_rank} >= {rank} "
+                "THEN EXCLUDED.pass_date ELSE progress.pass_date END, "
+                "time_elapsed = progress.time_elapsed + EXCLUDED.time_elapsed, "
+                "updated = EXCLUDED.updated".format(
+                    table=self.model._meta.db_table,
+                    new_rank="STRPOS(%s, EXCLUDED.pass_mark)",
+                    rank="STRPOS(%s, progress.pass_mark)",
+                ),
+                [course_id, user_id, playlist_id, pass_mark, pass_date, time_elapsed]
+                + [self.model.PASS_MARKS_WORST_TO_BEST] * 4,
+            )
+
+
+class CourseProgress(models.Model):
+    """The best pass mark and the time spent of a performer per course playlist."""
+
+    # Assigns numerical value to each pass mark to prevent "better" pass marks from being overwritten
+    PASS_MARKS_WORST_TO_BEST = "XCLTP"
+    PASS_MARK_CHOICES = (
+        ("X", "Incomplete"),
+        ("C", "Complete"),
+        ("L", "Late"),
+        ("T", "Tardy"),
+        ("P", "On time"),
+    )
+
+    course = models.ForeignKey(Course, related_name="progress", on_delete=models.CASCADE)
+    user = models.ForeignKey(
+        User, related_name="course_progress", on_delete=models.CASCADE
+    )
+    playlist = models.ForeignKey(
+        Playlist, related_name="course_progress", on_delete=models.CASCADE
+    )
+    pass_mark = models.CharField(
+        "Pass mark", max_length=1, choices=PASS_MARK_CHOICES, default="X"
+    )
+    pass_date = models.DateTimeField("Pass date", blank=True, null=True)
+    time_elapsed = models.FloatField("Time spent", default=0)
+    updated = models.DateTimeField("Updated", auto_now=True)
+
+    objects = CourseProgressManager()
+
+    class Meta:
+        verbose_name = "Course Progress"
+        verbose_name_plural = "Course Progress"
+        unique_together = ("course", "user", "playlist")
+
+    def __str__(self):
+        return f"{self.user} - {self.playlist} - {self.pass_mark}"
+
+    @classmethod
+    def rank(cls, pass_mark):
+        return cls.PASS_MARKS_WORST_TO_BEST.index(pass_mark)
+
+    @staticmethod
+    def as_performance_dict(progress):
+        performance_dict = {}
+        for row in progress:
+            performer = str(row.user)  # looks like e.g. "Joe Student - student@college.edu"
+            performance_dict.setdefault(performer, {"time_elapsed": 0})
+            # important that the dictionary key is playlist.id, not pco.order nor playlist_id
+            performance_dict[performer][row.playlist.id] = row.pass_mark
+            performance_dict[performer]["time_elapsed"] += row.time_elapsed
+        return performance_dict
+
+
+class CourseVisibilityManager(models.Manager):
+    def refresh(self, course_ids=None, author_ids=None, viewer_ids=None):
+        """
+        Recompute the visibility rows of the given courses, courses by the
+        given authors and viewers (default: all), in two statements.
+
+        A course is visible to the users its author permits to access their
+        content, if it is open or they are members of one of its groups.
+        """
+        course_table = Course._meta.db_table
+        conditions = []
+        params = []
+        for column, ids in (
+            ("course._id", course_ids),
+            ("course.authored_by_id", author_ids),
+            ("{viewer}", viewer_ids),
+        ):
+            if ids is not None:
+                conditions.append(f"{column} = ANY(%s)")
+                params.append(list(ids))
+        condition = " AND ".join(conditions) or "TRUE"
+
+        with transaction.atomic(), connections["default"].cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {table} AS visibility USING {course_table} AS course "
+                "WHERE visibility.course_id = course._id AND {condition}".format(
+                    table=self.model._meta.db_table,
+                    course_table=course_table,
+                    condition=condition.format(viewer="visibility.viewer_id"),
+                ),
+                params,
+            )
+            cursor.execute(
+                "INSERT INTO {table} (course_id, viewer_id) "
+                "SELECT course._id, permit.grantee_id "
+                "FROM {course_table} AS course "
+                "JOIN {permit_table} AS permit "
+                "ON permit.grantor_id = course.authored_by_id "
+                "WHERE (course.open OR EXISTS ("
+                "SELECT 1 FROM {visible_to_table} AS visible_to "
+                "JOIN {members_table} AS members "
+                "ON members.group_id = visible_to.group_id "
+                "WHERE visible_to.course_id = course._id "
+                "AND members.user_id = permit.grantee_id"
+                ")) AND {condition} "
+                "ON CONFLICT DO NOTHING".format(
+                    table=self.model._meta.db_table,
+                    course_table=course_table,
+                    permit_table=ContentPermit._meta.db_table,
+                    visible_to_table=Course.visible_to.through._meta.db_table,
+                    members_table=Group.members.through._meta.db_table,
+                    condition=condition.format(viewer="permit.grantee_id"),
+                ),
+                params,
+            )
+
+
+class CourseVisibility(models.Model):
+    """
+    A course by another user listed to a viewer (see courses_by_others_view),
+    kept up to date by the receivers below and rebuilt by
+    rebuild_course_visibility.
+    """
+
+    course = models.ForeignKey(
+        Course, related_name="visibility", on_delete=models.CASCADE
+    )
+    viewer = models.ForeignKey(
+        User, related_name="course_visibility", on_delete=models.CASCADE
+    )
+
+    objects = CourseVisibilityManager()
+
+    class Meta:
+        verbose_name = "Course Visibility"
+        verbose_name_plural = "Course Visibility"
+        unique_together = ("viewer", "course")
+
+
 @receiver(post_save, sender=Playlist)
+@receiver(post_delete, sender=Playlist)
+def invalidate_playlist_plan(sender, instance, *args, **kwargs):
+    bump_plan_version(instance._id)
+
+
+@receiver(post_save, sender=ExercisePlaylistOrdered)
+@receiver(post_delete, sender=ExercisePlaylistOrdered)
+def invalidate_playlist_plan_of_entry(sender, instance, *args, **kwargs):
+    bump_plan_version(instance.playlist_id)
+
+
+@receiver(m2m_changed, sender=Playlist.exercises.through)
+def invalidate_playlist_plan_of_entries(
+    sender, instance, action, reverse, pk_set, *args, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        playlist_pks = [instance._id]
+    elif pk_set:
+        playlist_pks = pk_set
+    else:
+        playlist_pks = instance.playlists.values_list("_id", flat=True)
+    for playlist_pk in playlist_pks:
+        bump_plan_version(playlist_pk)
+
+
+@receiver(post_save, sender=Exercise)
+def invalidate_playlist_plans_of_exercise(sender, instance, *args, **kwargs):
+    for playlist_pk in ExercisePlaylistOrdered.objects.filter(
+        exercise=instance
+    ).values_list("playlist_id", flat=True):
+        bump_plan_version(playlist_pk)
+
+
 @receiver(post_save, sender=Course)
-@receiver(post_save, sender=PerformanceData)
-def truncate_timestamps(sender, instance, *args, **kwargs):
-    """Remove microseconds from 'created' and 'updated' fields"""
-    with connections["default"].cursor() as cursor:
-        cursor.execute(
-            "UPDATE {} "
-            "SET created = DATE_TRUNC('second', created), updated = DATE_TRUNC('second', updated) "
-            "WHERE {} = {}".format(
-                instance._meta.db_table, instance._meta.pk.name, instance.pk
-            )
+def refresh_visibility_of_course(sender, instance, update_fields, *args, **kwargs):
+    if update_fields and not {"open", "authored_by"} & set(update_fields):
+        return
+    CourseVisibility.objects.refresh(course_ids=[instance._id])
+
+
+@receiver(m2m_changed, sender=Course.visible_to.through)
+def refresh_visibility_of_course_groups(
+    sender, instance, action, reverse, pk_set, *args, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        CourseVisibility.objects.refresh(course_ids=[instance._id])
+    elif pk_set:
+        CourseVisibility.objects.refresh(course_ids=pk_set)
+    else:
+        # the cleared courses of a group are unknown, but not its members
+        CourseVisibility.objects.refresh(
+            viewer_ids=instance.members.values_list("pk", flat=True)
         )
+
+
+@receiver(m2m_changed, sender=Group.members.through)
+def refresh_visibility_of_group_members(
+    sender, instance, action, reverse, pk_set, *args, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        CourseVisibility.objects.refresh(
+            course_ids=instance.visible_courses.values_list("_id", flat=True),
+            viewer_ids=pk_set,
+        )
+    elif pk_set:
+        CourseVisibility.objects.refresh(
+            course_ids=Course.objects.filter(visible_to__in=pk_set).values_list(
+                "_id", flat=True
+            ),
+            viewer_ids=[instance.pk],
+        )
+    else:
+        CourseVisibility.objects.refresh(viewer_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=Group)
+def collect_visibility_of_group(sender, instance, *args, **kwargs):
+    # the memberships are deleted with the group, without m2m_changed
+    instance._member_ids = list(instance.members.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Group)
+def refresh_visibility_of_group(sender, instance, *args, **kwargs):
+    CourseVisibility.objects.refresh(viewer_ids=getattr(instance, "_member_ids", []))
+
+
+@receiver(user_pair_changed, sender=ContentPermit)
+def refresh_visibility_of_permit(sender, pair, *args, **kwargs):
+    CourseVisibility.objects.refresh(
+        author_ids=[getattr(pair["grantor"], "pk", pair["grantor"])],
+        viewer_ids=[getattr(pair["grantee"], "pk", pair["grantee"])],
+    )
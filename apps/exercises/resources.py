@@ -3,6 +3,7 @@ from import_export.fields import Field
 from import_export.results import RowResult
 
 from apps.exercises.models import Exercise, Playlist, Course
+from apps.exercises.services import create_exercises
 
 
 class BaseContentResource(resources.ModelResource):
@@ -73,6 +74,52 @@ class ExerciseResource(BaseContentResource):
             # "locked",
         )
 
+    def __init__(self, *args, **kwargs):
+        super(ExerciseResource, self).__init__(*args, **kwargs)
+        self.new_exercises = []
+        self.new_row_results = []
+
+    def import_row(self, row, instance_loader, **kwargs):
+        num_new = len(self.new_exercises)
+        import_result = super(ExerciseResource, self).import_row(
+            row, instance_loader, **kwargs
+        )
+        if len(self.new_exercises) > num_new:
+            # its id is filled in after the exercise is inserted
+            self.new_row_results.append(import_result)
+        return import_result
+
+    def save_instance(self, instance, using_transactions=True, dry_run=False):
+        # new exercises are inserted together after the last row
+        if instance.pk:
+            return super(ExerciseResource, self).save_instance(
+                instance, using_transactions, dry_run
+            )
+        self.before_save_instance(instance, using_transactions, dry_run)
+        if using_transactions or not dry_run:
+            self.new_exercises.append(instance)
+        self.after_save_instance(instance, using_transactions, dry_run)
+
+    def after_import(self, dataset, result, using_transactions, dry_run, **kwargs):
+        if self.new_exercises:
+            # as per Exercise.save, new exercises go to the author's auto playlist
+            author = self.new_exercises[0].authored_by
+            playlist = Playlist.get_auto_playlist(author)
+            if playlist is None:
+                playlist = Playlist(authored_by=author, is_auto=True)
+                playlist.save()
+            # rows were validated as they were imported (clean_model_instances)
+            create_exercises(self.new_exercises, playlist=playlist, validate=False)
+            for import_result, exercise in zip(
+                self.new_row_results, self.new_exercises
+            ):
+                import_result.add_instance_info(exercise)
+        self.new_exercises = []
+        self.new_row_results = []
+        super(ExerciseResource, self).after_import(
+            dataset, result, using_transactions, dry_run, **kwargs
+        )
+
 
 class PlaylistResource(BaseContentResource):
     class Meta(BaseContentResource.Meta):
@@ -0,0 +1,63 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Coalesce
+
+from apps.exercises.models import Exercise, ExercisePlaylistOrdered
+from apps.exercises.utils.data_order import key_order
+
+BATCH_SIZE = 500
+
+
+def create_exercises(exercises, playlist=None, validate=True, batch_size=BATCH_SIZE):
+    """
+    Insert unsaved exercises in bulk, e.g. for importers, and append them
+    to `playlist` if given. Returns the exercises, with their ids.
+
+    The exercises are validated and normalized in memory as per
+    Exercise.save, their ids are reserved in one statement, and they are
+    inserted `batch_size` at a time. Unlike Exercise.save, they are not
+    added to the auto playlist of their author, and no signals are sent.
+    """
+    exercises = list(exercises)
+    if not exercises:
+        return exercises
+
+    if validate:
+        errors = []
+        for num, exercise in enumerate(exercises, 1):
+            try:
+                exercise.full_clean(validate_unique=False)
+            except ValidationError as e:
+                errors.extend(f"Exercise {num}: {message}" for message in e.messages)
+        if errors:
+            raise ValidationError(errors)
+
+    for exercise in exercises:
+        exercise.sort_data()
+        exercise.set_rhythm_values()
+        exercise.data_order = key_order(exercise.data)
+
+    with transaction.atomic():
+        for exercise, _id in zip(exercises, Exercise.reserve_ids(len(exercises))):
+            exercise._id = _id
+            exercise.set_id(initial="E")
+        Exercise.objects.bulk_create(exercises, batch_size=batch_size)
+
+        if playlist is not None:
+            last_order = ExercisePlaylistOrdered.objects.filter(
+                playlist=playlist
+            ).aggregate(last_order=Coalesce(Max("order"), 0))["last_order"]
+            ExercisePlaylistOrdered.objects.bulk_create(
+                [
+                    ExercisePlaylistOrdered(
+                        playlist=playlist, exercise=exercise, order=last_order + num
+                    )
+                    for num, exercise in enumerate(exercises, 1)
+                ],
+                batch_size=batch_size,
+            )
+            # as per Playlist.append_exercise, also makes its plan stale
+            playlist.save()
+
+    return exercises
@@ -0,0 +1,101 @@
+from django.test import SimpleTestCase
+
+from apps.exercises.utils.content_id import (
+    MAX_INTEGER,
+    decode_id,
+    decode_ids,
+    encode_id,
+    encode_ids,
+)
+
+
+def legacy_set_id(_id, initial):
+    """BaseContentModel.set_id and ExpansiveForm._id_from_integer, as they were."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    reverse_id = ""
+    bases = [26, 26, 10, 10, 26]
+    for base in bases:
+        if base == 26:
+            reverse_id += letters[_id % base]
+        elif base == 10:
+            reverse_id += str(_id % base)
+        _id //= base
+    if _id != 0 or len(reverse_id) != len(bases):
+        return None
+    reverse_id += initial
+    return reverse_id[::-1]
+
+
+def legacy_integer_from_id(ex_str):
+    """ExpansiveForm._integer_from_id, as it was."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    digits = "0123456789"
+    reverse_str = ex_str[::-1]
+    integer = 0
+    base = 1
+    for i in range(len(reverse_str)):
+        char = reverse_str[i]
+        if char in letters:
+            integer += base * letters.index(char)
+            base *= 26
+        elif char in digits:
+            integer += base * digits.index(char)
+            base *= 10
+        else:
+            return None
+    return integer
+
+
+# boundaries, every carry of each place, and a spread of the range
+SAMPLE_INTEGERS = sorted(
+    {0, 1, 25, 26, 675, 676, 6759, 6760, 67599, 67600, MAX_INTEGER}
+    | set(range(0, MAX_INTEGER, 7919))
+)
+
+
+class ContentIdTest(SimpleTestCase):
+    def test_boundaries(self):
+        self.assertEqual(MAX_INTEGER, 1757599)
+        self.assertEqual(encode_id(0, "E"), "EA00AA")
+        self.assertEqual(encode_id(MAX_INTEGER, "E"), "EZ99ZZ")
+        self.assertEqual(decode_id("EA00AA"), 0)
+        self.assertEqual(decode_id("EZ99ZZ"), MAX_INTEGER)
+
+    def test_out_of_range(self):
+        self.assertIsNone(encode_id(-1, "E"))
+        self.assertIsNone(encode_id(MAX_INTEGER + 1, "E"))
+
+    def test_round_trip(self):
+        for integer in SAMPLE_INTEGERS:
+            for initial in "EPC":
+                content_id = encode_id(integer, initial)
+                self.assertEqual(content_id[0], initial)
+                self.assertEqual(decode_id(content_id), integer)
+                self.assertEqual(decode_id(content_id[1:]), integer)
+
+    def test_matches_legacy_encoding(self):
+        for integer in SAMPLE_INTEGERS:
+            self.assertEqual(encode_id(integer, "P"), legacy_set_id(integer, "P"))
+        self.assertIsNone(legacy_set_id(MAX_INTEGER + 1, "P"))
+
+    def test_matches_legacy_decoding(self):
+        for integer in SAMPLE_INTEGERS:
+            content_id = encode_id(integer, "E")[1:]
+            self.assertEqual(decode_id(content_id), legacy_integer_from_id(content_id))
+
+    def test_short_input(self):
+        self.assertEqual(decode_id("AB"), 1)
+        self.assertEqual(decode_id("AB"), legacy_integer_from_id("AB"))
+        self.assertEqual(decode_id("B"), 1)
+        self.assertEqual(decode_id("0AB"), decode_id("A00AB"))
+
+    def test_malformed_input(self):
+        malformed = [None, "", "EA00A!", "ea00aa", "E00AAA", "EAA0AA", "EEA00AAA"]
+        for content_id in malformed:
+            self.assertIsNone(decode_id(content_id), content_id)
+
+    def test_batches(self):
+        self.assertEqual(
+            encode_ids([0, 1, MAX_INTEGER + 1], "C"), ["CA00AA", "CA00AB", None]
+        )
+        self.assertEqual(decode_ids(["CA00AA", "AB", "?"]), [0, 1, None])
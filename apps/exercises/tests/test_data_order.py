@@ -0,0 +1,86 @@
+import json
+
+from django.test import SimpleTestCase
+
+from apps.exercises.utils.data_order import key_order, restore_order
+
+
+def as_jsonb(value):
+    """`value` with its keys in the order Postgres jsonb stores them."""
+    if isinstance(value, dict):
+        return {
+            key: as_jsonb(value[key])
+            for key in sorted(value, key=lambda key: (len(key.encode()), key.encode()))
+        }
+    if isinstance(value, list):
+        return [as_jsonb(item) for item in value]
+    return value
+
+
+class DataOrderTest(SimpleTestCase):
+    def assert_round_trip(self, data):
+        loaded = restore_order(as_jsonb(data), key_order(data))
+        # compared as JSON, for dicts compare equal whatever their key order
+        self.assertEqual(json.dumps(loaded), json.dumps(data))
+
+    def test_nested_objects(self):
+        self.assert_round_trip(
+            {
+                "type": "matching",
+                "introText": "",
+                "analysis": {
+                    "enabled": True,
+                    "mode": {"note_names": True, "fixed_do": False, "abc": True},
+                },
+                "key": "jC_",
+            }
+        )
+
+    def test_arrays_with_mixed_item_orders(self):
+        self.assert_round_trip(
+            {
+                "chord": [
+                    {"visible": [60], "hidden": [], "rhythmValue": "w"},
+                    {"rhythmValue": "h", "visible": [62], "hidden": [64]},
+                    {"hidden": [], "rhythmValue": "q", "visible": []},
+                ],
+                "type": "matching",
+                "highlight": [[{"z": 1, "a": 2}, {"a": 3, "z": 4}], []],
+            }
+        )
+
+    def test_keys_with_separators(self):
+        self.assert_round_trip(
+            {
+                "a/b": {"zz": 1, "y": 2},
+                "a": {"b": {"y": 3, "zz": 4}},
+                "~1": {"zz": 5, "y": 6},
+                "c~": [{"zz": 7, "y": 8}],
+            }
+        )
+        self.assertEqual(key_order({"a/b": {"c~d": 1}}), ["a~1b", "a~1b/c~0d"])
+
+    def test_legacy_order(self):
+        # stored before items had orders of their own: all share the first's
+        data = {
+            "type": "matching",
+            "chord": [
+                {"visible": [60], "hidden": [], "rhythmValue": "w"},
+                {"visible": [62], "hidden": [], "rhythmValue": "h"},
+            ],
+        }
+        legacy_order = [
+            "type",
+            "chord",
+            "chord/*/visible",
+            "chord/*/hidden",
+            "chord/*/rhythmValue",
+        ]
+        loaded = restore_order(as_jsonb(data), legacy_order)
+        self.assertEqual(json.dumps(loaded), json.dumps(data))
+
+    def test_default_order(self):
+        data = {"key": "jC_", "type": "matching", "chord": []}
+        loaded = restore_order(data, [], default_order=["type", "key", "chord"])
+        self.assertEqual(list(loaded), ["type", "key", "chord"])
+        self.assertIs(restore_order(data, [], default_order=["missing"]), data)
@@ -0,0 +1,56 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.exercises.models import Course, Exercise, Playlist
+from apps.exercises.tests.test_content_id import legacy_set_id
+from apps.exercises.tests.utils import (
+    create_course,
+    create_exercise,
+    create_playlist,
+    create_user,
+)
+
+
+class ReservedIdTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author@example.com")
+
+    def assert_legacy_id(self, obj, initial):
+        self.assertEqual(obj.id, legacy_set_id(obj._id, initial))
+        stored_id = type(obj).objects.filter(_id=obj._id).values_list("id", flat=True)
+        self.assertEqual(stored_id.get(), obj.id)
+
+    def test_ids_match_legacy_encoding(self):
+        for _ in range(3):
+            self.assert_legacy_id(create_exercise(self.author), "E")
+            self.assert_legacy_id(create_playlist(self.author), "P")
+            self.assert_legacy_id(create_course(self.author), "C")
+
+    def test_created_with_a_single_write(self):
+        for model, create in [
+            (Exercise, create_exercise),
+            (Playlist, create_playlist),
+            (Course, create_course),
+        ]:
+            table = model._meta.db_table
+            with CaptureQueriesContext(connection) as queries:
+                obj = create(self.author)
+            writes = [
+                query["sql"]
+                for query in queries
+                if query["sql"].startswith(
+                    (f'INSERT INTO "{table}"', f'UPDATE "{table}"')
+                )
+            ]
+            self.assertEqual(len(writes), 1, writes)
+            self.assertTrue(writes[0].startswith("INSERT"))
+            self.assertEqual(obj.id, legacy_set_id(obj._id, obj.id[0]))
+
+    def test_reserve_ids(self):
+        ids = Exercise.reserve_ids(5)
+        self.assertEqual(len(set(ids)), 5)
+        exercise = create_exercise(self.author)
+        self.assertGreater(exercise._id, max(ids))
+        self.assertEqual(exercise.id, legacy_set_id(exercise._id, "E"))
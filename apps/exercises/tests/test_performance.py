@@ -0,0 +1,163 @@
+import threading
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from apps.exercises.models import PerformanceAttempt, PerformanceData
+from apps.exercises.utils.summary import summarize
+from apps.exercises.tests.utils import (
+    create_course,
+    create_exercise,
+    create_playlist,
+    create_user,
+)
+
+
+class ConcurrentSubmitTest(TransactionTestCase):
+    threads = 8
+
+    def setUp(self):
+        self.author = create_user("author@example.com")
+        self.performer = create_user("performer@example.com")
+        self.exercise = create_exercise(self.author)
+        self.playlist = create_playlist(self.author, exercises=[self.exercise])
+        self.course = create_course(self.author, playlists=[self.playlist])
+
+    def submit_in_parallel(self, course_id):
+        barrier = threading.Barrier(self.threads)
+        errors = []
+
+        def submit(num):
+            try:
+                barrier.wait()
+                PerformanceData.submit(
+                    user_id=self.performer.id,
+                    course_id=course_id,
+                    playlist_id=self.playlist._id,
+                    exercise_id=self.exercise.id,
+                    data={"error_tally": num, "performance_duration_in_seconds": 1},
+                )
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=submit, args=(num,)) for num in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def assert_no_attempt_lost(self, course_id):
+        performances = PerformanceData.objects.filter(
+            user=self.performer, playlist=self.playlist, course_id=course_id
+        )
+        self.assertEqual(performances.count(), 1)
+        performance = performances.get()
+        self.assertEqual(
+            sorted(
+                PerformanceAttempt.objects.filter(
+                    performance=performance
+                ).values_list("error_tally", flat=True)
+            ),
+            list(range(self.threads)),
+        )
+        self.assertEqual(performance.summary["attempts"], self.threads)
+        self.assertEqual(
+            performance.summary["exercises"][self.exercise.id]["count"], self.threads
+        )
+
+    def test_submit_in_course(self):
+        self.submit_in_parallel(self.course._id)
+        self.assert_no_attempt_lost(self.course._id)
+
+    def test_submit_without_course(self):
+        self.submit_in_parallel(None)
+        self.assert_no_attempt_lost(None)
+
+
+class LegacySummaryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author@example.com")
+        cls.performer = create_user("performer@example.com")
+        cls.exercises = [create_exercise(cls.author) for _ in range(2)]
+        cls.playlist = create_playlist(cls.author, exercises=cls.exercises)
+
+    def test_submit_summarizes_legacy_attempts(self):
+        # a performance whose attempts were not backfilled into
+        # PerformanceAttempt, nor summarized
+        PerformanceData.objects.create(
+            user=self.performer,
+            playlist=self.playlist,
+            data=[
+                {
+                    "id": self.exercises[0].id,
+                    "error_tally": 2,
+                    "performed_at": "2024-10-01 14:00:00",
+                    "performance_duration_in_seconds": 10,
+                },
+                {
+                    "id": self.exercises[0].id,
+                    "error_tally": 0,
+                    "performed_at": "2024-10-01 14:01:00",
+                    "performance_duration_in_seconds": 20,
+                },
+            ],
+        )
+
+        PerformanceData.submit(
+            user_id=self.performer.id,
+            course_id=None,
+            playlist_id=self.playlist._id,
+            exercise_id=self.exercises[1].id,
+            data={"error_tally": 0, "performance_duration_in_seconds": 30},
+        )
+
+        performance = PerformanceData.objects.get(
+            user=self.performer, playlist=self.playlist
+        )
+        self.assertEqual(performance.summary["attempts"], 3)
+        self.assertEqual(performance.summary["seconds"], 60)
+        self.assertEqual(
+            performance.summary["exercises"][self.exercises[0].id]["pass_date"],
+            "2024-10-01 14:01:00",
+        )
+        self.assertTrue(performance.playlist_passed())
+
+
+class SubmitSummaryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author@example.com")
+        cls.performer = create_user("performer@example.com")
+        cls.exercises = [create_exercise(cls.author) for _ in range(2)]
+        cls.playlist = create_playlist(cls.author, exercises=cls.exercises)
+
+    def test_summary_updated_as_per_summarize(self):
+        attempts = [
+            (self.exercises[0].id, 2, 10),
+            (self.exercises[0].id, "n/a", 12.5),
+            (self.exercises[1].id, -1, 0),
+            (self.exercises[0].id, 0, 8),
+            (self.exercises[1].id, 3, None),
+            (f"{self.exercises[1].id}-2", 0, 20),
+        ]
+        for exercise_id, error_tally, seconds in attempts:
+            pd = PerformanceData.submit(
+                user_id=self.performer.id,
+                course_id=None,
+                playlist_id=self.playlist._id,
+                exercise_id=exercise_id,
+                data={
+                    "error_tally": error_tally,
+                    "performance_duration_in_seconds": seconds,
+                },
+            )
+            performance = PerformanceData.objects.get(id=pd.id)
+            self.assertEqual(performance.summary, pd.summary)
+            self.assertEqual(performance.summary, summarize(performance.attempt_data))
+        self.assertEqual(performance.summary["attempts"], len(attempts))
@@ -0,0 +1,47 @@
+import json
+from types import SimpleNamespace
+
+import tablib
+from django.test import TestCase
+
+from apps.exercises.models import Exercise, Playlist
+from apps.exercises.resources import ExerciseResource
+from apps.exercises.tests.utils import EXERCISE_DATA, create_user
+
+
+class ExerciseResourceImportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author@example.com")
+
+    def import_exercises(self, num):
+        dataset = tablib.Dataset(headers=["description", "data", "is_public"])
+        for i in range(num):
+            dataset.append([f"Exercise {i}", json.dumps(EXERCISE_DATA), "1"])
+        resource = ExerciseResource(request=SimpleNamespace(user=self.author))
+        result = resource.import_data(dataset, dry_run=False)
+        self.assertFalse(result.has_errors())
+        self.assertFalse(result.has_validation_errors())
+        return result
+
+    def test_rows_report_new_exercises(self):
+        result = self.import_exercises(3)
+        exercises = Exercise.objects.filter(authored_by=self.author).order_by("_id")
+        self.assertEqual(
+            [row.object_id for row in result.rows], [e.pk for e in exercises]
+        )
+        self.assertEqual(
+            [row.object_repr for row in result.rows], [str(e) for e in exercises]
+        )
+
+    def test_new_exercises_go_to_auto_playlist(self):
+        self.import_exercises(2)
+        self.import_exercises(2)
+        playlist = Playlist.objects.get(authored_by=self.author, is_auto=True)
+        self.assertEqual(
+            list(
+                playlist.exercises.order_by("exerciseplaylistordered__order")
+                .values_list("description", flat=True)
+            ),
+            ["Exercise 0", "Exercise 1", "Exercise 0", "Exercise 1"],
+        )
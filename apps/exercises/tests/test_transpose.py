@@ -0,0 +1,35 @@
+from copy import deepcopy
+from datetime import datetime
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from apps.exercises.tests.utils import EXERCISE_DATA
+from apps.exercises.utils.transpose import transpose
+
+
+class TransposeCacheTest(SimpleTestCase):
+    def exercise(self, data):
+        # `updated` as truncated to the second on save
+        return SimpleNamespace(
+            id="EA00AA", updated=datetime(2024, 10, 1, 14, 0, 0), data=data
+        )
+
+    def test_edit_within_a_second(self):
+        data = deepcopy(EXERCISE_DATA)
+        transposed = transpose(self.exercise(data), "#")
+        self.assertEqual(transposed.data["chord"][0]["visible"], [55, 71, 74, 79])
+
+        edited_data = deepcopy(data)
+        edited_data["chord"][0]["visible"] = [50, 64, 67, 72]
+        transposed = transpose(self.exercise(edited_data), "#")
+        self.assertEqual(transposed.data["chord"][0]["visible"], [57, 71, 74, 79])
+
+    def test_data_is_not_modified(self):
+        data = deepcopy(EXERCISE_DATA)
+        exercise = self.exercise(data)
+        transposed = transpose(exercise, "bb")
+        self.assertEqual(exercise.data, EXERCISE_DATA)
+        self.assertEqual(exercise.id, "EA00AA")
+        self.assertNotEqual(transposed.id, exercise.id)
+        self.assertEqual(transposed.data["keySignature"], "bb")
@@ -0,0 +1,100 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.exercises.models import PerformanceAttempt
+from apps.exercises.tests.utils import (
+    create_course,
+    create_exercise,
+    create_playlist,
+    create_user,
+)
+
+
+class SubmitExercisePerformanceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author@example.com")
+        cls.performer = create_user("performer@example.com")
+        cls.exercises = [create_exercise(cls.author) for _ in range(2)]
+        cls.other_exercise = create_exercise(cls.author)
+        cls.playlist = create_playlist(cls.author, exercises=cls.exercises)
+        cls.course = create_course(cls.author, playlists=[cls.playlist])
+
+    def setUp(self):
+        self.client.force_login(self.performer)
+
+    def submit(self, **report):
+        report = dict(
+            {
+                "course_ID": self.course.id,
+                "playlist_ID": self.playlist.id,
+                "exercise_num": 2,
+                "exercise_ID": self.exercises[1].id,
+                "error_tally": 0,
+                "performance_duration_in_seconds": 12.5,
+            },
+            **report
+        )
+        report = {key: value for key, value in report.items() if value is not None}
+        return self.client.post(
+            reverse("lab:exercise-performance"), {"data": json.dumps(report)}
+        )
+
+    def test_submit(self):
+        response = self.submit()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(PerformanceAttempt.objects.values_list("exercise_id", flat=True)),
+            [self.exercises[1].id],
+        )
+        self.exercises[1].refresh_from_db()
+        self.assertTrue(self.exercises[1].locked)
+
+    def test_submit_without_exercise_id(self):
+        # as compiled before exercise_ID was added to reports
+        response = self.submit(exercise_num=1, exercise_ID=None)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(PerformanceAttempt.objects.values_list("exercise_id", flat=True)),
+            [self.exercises[0].id],
+        )
+
+    def test_exercise_no_longer_in_playlist(self):
+        # e.g. removed by the author while the performer was at it
+        response = self.submit(exercise_ID=self.other_exercise.id)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(PerformanceAttempt.objects.values_list("exercise_id", flat=True)),
+            [self.other_exercise.id],
+        )
+
+    def test_transposed_exercise(self):
+        exercise_id = f"{self.exercises[1].id}-2"
+        response = self.submit(exercise_ID=exercise_id)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(PerformanceAttempt.objects.values_list("exercise_id", flat=True)),
+            [exercise_id],
+        )
+        self.exercises[1].refresh_from_db()
+        self.assertTrue(self.exercises[1].locked)
+
+    def test_malformed_exercise_id(self):
+        for exercise_id in ["bogus", "PA00AA", "EA00A!", "EA00AA+", 123]:
+            response = self.submit(exercise_ID=exercise_id)
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(PerformanceAttempt.objects.exists())
+
+    def test_unknown_playlist(self):
+        response = self.submit(playlist_ID="PZ99ZZ")
+        self.assertEqual(response.status_code, 400)
+        response = self.submit(playlist_ID="PZ99ZZ", exercise_ID=None)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PerformanceAttempt.objects.exists())
+
+    def test_unknown_course(self):
+        response = self.submit(course_ID="CZ99ZZ")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PerformanceAttempt.objects.exists())
@@ -0,0 +1,55 @@
+from copy import deepcopy
+
+from apps.accounts.models import User
+from apps.exercises.models import (
+    Course,
+    Exercise,
+    ExercisePlaylistOrdered,
+    Playlist,
+    PlaylistCourseOrdered,
+)
+
+EXERCISE_DATA = {
+    "type": "matching",
+    "key": "jC_",
+    "keySignature": "",
+    "chord": [
+        {"visible": [48, 64, 67, 72], "hidden": [], "rhythmValue": "w"},
+        {"visible": [43, 62, 67, 71], "hidden": [], "rhythmValue": "w"},
+    ],
+}
+
+
+def create_user(email):
+    return User.objects.create_user(email=email, password="password")
+
+
+def create_exercise(authored_by, **kwargs):
+    kwargs.setdefault("data", deepcopy(EXERCISE_DATA))
+    exercise = Exercise(authored_by=authored_by, **kwargs)
+    exercise.save()
+    return exercise
+
+
+def create_playlist(authored_by, exercises=(), **kwargs):
+    playlist = Playlist(authored_by=authored_by, name="Playlist", **kwargs)
+    playlist.save()
+    ExercisePlaylistOrdered.objects.bulk_create(
+        [
+            ExercisePlaylistOrdered(playlist=playlist, exercise=exercise, order=order)
+            for order, exercise in enumerate(exercises, 1)
+        ]
+    )
+    return playlist
+
+
+def create_course(authored_by, playlists=(), **kwargs):
+    course = Course(authored_by=authored_by, title="Course", **kwargs)
+    course.save()
+    PlaylistCourseOrdered.objects.bulk_create(
+        [
+            PlaylistCourseOrdered(course=course, playlist=playlist, order=order)
+            for order, playlist in enumerate(playlists, 1)
+        ]
+    )
+    return course
@@ -0,0 +1,72 @@
+"""
+Conversion between content primary keys and content IDs.
+
+Exercises, playlists and courses are identified by an initial followed by
+five characters encoding the integer `_id`, least significant last:
+
+  E A 0 0 A A
+    | | | | `- base 26
+    | | | `--- base 26
+    | | `----- base 10
+    | `------- base 10
+    `--------- base 26
+
+so that integers 0 thru 1,757,599 map to A00AA thru Z99ZZ.
+Do not make format changes: IDs are stored and shared as URLs.
+"""
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+DIGITS = "0123456789"
+
+# least significant first
+BASES = [26, 26, 10, 10, 26]
+ALPHABETS = [LETTERS if base == 26 else DIGITS for base in BASES]
+
+MAX_INTEGER = 26 * 26 * 10 * 10 * 26 - 1
+
+
+def encode_id(integer, initial):
+    """Return the content ID of `integer`, or None if it is out of range."""
+    assert len(initial) == 1
+
+    if not 0 <= integer <= MAX_INTEGER:
+        return None
+    reverse_id = ""
+    for base, alphabet in zip(BASES, ALPHABETS):
+        reverse_id += alphabet[integer % base]
+        integer //= base
+    reverse_id += initial
+    return reverse_id[::-1]
+
+
+def decode_id(content_id):
+    """
+    Return the integer encoded by `content_id`, or None if it is malformed.
+
+    The initial is optional, and so are leading characters (e.g. "AB" is
+    read as A00AB), as when IDs are typed by users.
+    """
+    if not content_id:
+        return None
+    if len(content_id) == len(BASES) + 1:
+        content_id = content_id[1:]
+    if len(content_id) > len(BASES):
+        return None
+
+    integer = 0
+    place_value = 1
+    for char, base, alphabet in zip(reversed(content_id), BASES, ALPHABETS):
+        digit = alphabet.find(char)
+        if digit == -1:
+            return None
+        integer += place_value * digit
+        place_value *= base
+    return integer
+
+
+def encode_ids(integers, initial):
+    return [encode_id(integer, initial) for integer in integers]
+
+
+def decode_ids(content_ids):
+    return [decode_id(content_id) for content_id in content_ids]
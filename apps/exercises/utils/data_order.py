@@ -0,0 +1,85 @@
+"""
+Key order of exercise data, which Postgres jsonb does not keep.
+
+The order is a list of the key paths of the data's objects, in document
+order. Paths are JSON Pointers (RFC 6901) without their leading "/": keys
+are escaped ("~" as "~0", "/" as "~1"), and the items of arrays are
+designated by their index, so that each item keeps its own key order:
+
+["type", "analysis", "analysis/enabled", "analysis/mode",
+ "analysis/mode/note_names", ..., "chord", "chord/0/visible", ...]
+
+Orders stored before designated every item of an array by "*", and keys
+unescaped; they are still restored.
+"""
+PATH_SEPARATOR = "/"
+LEGACY_ITEM_SEGMENT = "*"
+
+
+def escape_key(key):
+    """`key` as a path segment."""
+    return str(key).replace("~", "~0").replace(PATH_SEPARATOR, "~1")
+
+
+def join_path(path, segment):
+    return f"{path}{PATH_SEPARATOR}{segment}" if path else segment
+
+
+def key_order(data, path=""):
+    """The key order of `data`, as stored in Exercise.data_order."""
+    order = []
+    _collect_key_order(data, path, order)
+    return order
+
+
+def _collect_key_order(value, path, order):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            key_path = join_path(path, escape_key(key))
+            order.append(key_path)
+            _collect_key_order(item, key_path, order)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            _collect_key_order(item, join_path(path, str(index)), order)
+
+
+def restore_order(data, order, default_order=()):
+    """
+    `data` with its keys in `order`. Without an order, only the top-level
+    keys are sorted, by `default_order`. Keys missing from the order follow
+    the others.
+    """
+    if not order:
+        if not isinstance(data, dict) or not all(key in data for key in default_order):
+            return data
+        order = default_order
+    index_map = {key_path: i for i, key_path in enumerate(order)}
+    return _restore_order(data, "", "", index_map)
+
+
+def _restore_order(value, path, legacy_path, index_map):
+    if isinstance(value, dict):
+        key_paths = {
+            key: (join_path(path, escape_key(key)), join_path(legacy_path, key))
+            for key in value
+        }
+
+        def position(key):
+            key_path, legacy_key_path = key_paths[key]
+            return index_map.get(
+                key_path, index_map.get(legacy_key_path, len(index_map))
+            )
+
+        return {
+            key: _restore_order(value[key], *key_paths[key], index_map)
+            for key in sorted(value, key=position)
+        }
+    if isinstance(value, list):
+        legacy_item_path = join_path(legacy_path, LEGACY_ITEM_SEGMENT)
+        return [
+            _restore_order(
+                item, join_path(path, str(index)), legacy_item_path, index_map
+            )
+            for index, item in enumerate(value)
+        ]
+    return value
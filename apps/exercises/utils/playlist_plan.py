@@ -0,0 +1,128 @@
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.urls import reverse, NoReverseMatch
+
+from apps.exercises.utils.transpose import transpose
+
+# Lifetime of a cached plan; a plan is replaced sooner if its playlist changes.
+PLAN_TIMEOUT = 60 * 60 * 24
+
+# An exercise of a playlist, transposed as the playlist requests.
+# Like an Exercise, it has an `id` and `data`.
+PlanEntry = namedtuple("PlanEntry", ["num", "id", "data", "url"])
+
+
+def plan_version_key(playlist_pk):
+    return f"playlist_plan_version:{playlist_pk}"
+
+
+def get_plan_version(playlist_pk):
+    version = cache.get(plan_version_key(playlist_pk))
+    if version is None:
+        version = bump_plan_version(playlist_pk)
+    return version
+
+
+def bump_plan_version(playlist_pk):
+    """Make the cached plans of the playlist stale."""
+    # a timestamp rather than a counter, so that a version evicted from the
+    # cache is never reissued
+    version = time.time_ns()
+    cache.set(plan_version_key(playlist_pk), version, None)
+    return version
+
+
+class PlaylistPlan:
+    """
+    The ordered exercises of a playlist, with their (transposed) data and
+    their URLs, built once per version of the playlist and cached.
+    """
+
+    def __init__(self, playlist_id, entries):
+        self.playlist_id = playlist_id
+        self.entries = entries
+
+    @classmethod
+    def get(cls, playlist):
+        key = "playlist_plan:{}:{}:{}:{}".format(
+            playlist._id,
+            get_plan_version(playlist._id),
+            playlist.transposition_type,
+            ",".join(playlist.transpose_requests or []),
+        )
+        plan = cache.get(key)
+        if plan is None:
+            plan = cls.build(playlist)
+            cache.set(key, plan, PLAN_TIMEOUT)
+        return plan
+
+    @classmethod
+    def build(cls, playlist):
+        exercises = playlist.exercise_dict
+        if playlist.is_transposed():
+            transposition_matrix = playlist.transposition_matrix or []
+            exercises_list = [
+                transpose(exercises[exercise_id], staff_sig_request)
+                for exercise_id, staff_sig_request in transposition_matrix
+            ]
+        else:
+            exercises_list = [
+                exercises[exercise_id]
+                for exercise_id in playlist.untransposed_exercises_ids
+            ]
+        entries = [
+            PlanEntry(
+                num=num,
+                id=exercise.id,
+                data=exercise.data,
+                url=cls.reverse_url(playlist.id, num),
+            )
+            for num, exercise in enumerate(exercises_list, 1)
+        ]
+        return cls(playlist.id, entries)
+
+    @staticmethod
+    def reverse_url(playlist_id, num, course_id=None):
+        try:
+            return reverse(
+                "lab:playlist-view",
+                kwargs={
+                    "playlist_id": playlist_id,
+                    "course_id": course_id,
+                    "exercise_num": num,
+                },
+            )
+        except NoReverseMatch:
+            return None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def entry(self, num=1):
+        """As per Playlist.get_exercise_obj_by_num."""
+        if len(self.entries) == 0 or num == None:
+            return None
+        try:
+            return self.entries[num - 1]
+        except (IndexError, TypeError):
+            return self.entries[-1]
+
+    def url(self, num=1, course_id=None):
+        """As per Playlist.get_exercise_url_by_num."""
+        if num == None or num > len(self.entries):
+            return None
+        if course_id is None:
+            return self.entries[num - 1].url
+        return self.reverse_url(self.playlist_id, num, course_id)
+
+    def next_num(self, num=1):
+        if num < len(self.entries):
+            return num + 1
+        return None
+
+    def prev_num(self, num=1):
+        if 1 < num <= len(self.entries):
+            return num - 1
+        return None
@@ -0,0 +1,93 @@
+"""
+Summary of the attempts of a performance, computed in a single traversal
+and stored on PerformanceData so that pass flags, pass dates and error
+counts need not re-scan the attempts.
+
+Attempts are dicts in the legacy PerformanceData.data format, oldest first.
+Dates are UTC strings formatted "%Y-%m-%d %H:%M:%S", which sort in time order.
+
+{
+    "attempts": 3,
+    "seconds": 74.5,
+    "exercises": {
+        "EA00AA": {
+            "count": 2,
+            "first_pass": "2024-10-01 14:02:11",  # first attempt without errors (or not graded)
+            "pass_date": "2024-10-01 14:02:11",  # earliest error-free attempt
+            "least_errors": 0,  # least error tally, None if none was reported
+            "error_count": 0,  # error tally of the latest graded attempt
+        },
+        ...
+    },
+}
+"""
+from copy import deepcopy
+
+
+def summarize(attempts, summary=None):
+    """Return `summary` (by default an empty one) updated with `attempts`."""
+    if summary:
+        summary = deepcopy(summary)
+    else:
+        summary = {"attempts": 0, "seconds": 0, "exercises": {}}
+
+    for exercise_data in attempts:
+        exercise_id = exercise_data["id"]
+        error_tally = exercise_data["error_tally"]
+        performed_at = exercise_data["performed_at"]
+
+        summary["attempts"] += 1
+        summary["seconds"] += exercise_data["performance_duration_in_seconds"] or 0
+
+        exercise = summary["exercises"].setdefault(
+            exercise_id,
+            {
+                "count": 0,
+                "first_pass": None,
+                "pass_date": None,
+                "least_errors": None,
+                "error_count": 0,
+            },
+        )
+        exercise["count"] += 1
+        if exercise["first_pass"] is None and error_tally in [0, -1, "n/a"]:
+            exercise["first_pass"] = performed_at
+        if not isinstance(error_tally, int) or error_tally == 0:
+            if exercise["pass_date"] is None or performed_at < exercise["pass_date"]:
+                exercise["pass_date"] = performed_at
+        if isinstance(error_tally, int):
+            if exercise["least_errors"] is None or error_tally < exercise["least_errors"]:
+                exercise["least_errors"] = error_tally
+        if error_tally == 0:
+            exercise["error_count"] = 0
+        elif error_tally != "n/a":
+            exercise["error_count"] = error_tally
+
+    return summary
+
+
+def summary_passed(summary, exercise_list):
+    """Whether every exercise of the playlist was performed and none failed."""
+    exercises = summary["exercises"]
+    if len(exercises) < len(exercise_list):
+        return False
+    if any(exercise_id not in exercises for exercise_id in exercise_list):
+        return False
+    return all(
+        exercise["least_errors"] is None or exercise["least_errors"] <= 0
+        for exercise in exercises.values()
+    )
+
+
+def summary_pass_date(summary, exercise_list):
+    """The UTC date by which the playlist was passed, or None."""
+    if not summary_passed(summary, exercise_list):
+        return None
+    ex_pass_dates = [
+        exercise["pass_date"]
+        for exercise in summary["exercises"].values()
+        if exercise["pass_date"] is not None
+    ]
+    if not ex_pass_dates or len(ex_pass_dates) < len(exercise_list):
+        return None
+    return max(ex_pass_dates)
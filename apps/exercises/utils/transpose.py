@@ -1,63 +1,57 @@
-# """
-# Transpose exercise content per a new text field in playlist editor.
-#
-# User input example: `C G c#'
-# Result: populate playlist with each exercise in 0, 1, 4 sharps
-#
-# The distinction of major and minor is immaterial; this is a convenient shorthand.
-#
-# Exercise ID will appear as EA00DD+16 or EA00DD-2 where you see the midi_vector.
-#
-# Options:
-# (1) loop transpositions per exercise,
-# (2) loop transpositions per playlist,
-# (3) shuffle transpositions per exercise (pseudo-random),
-# (4) shuffle transpositions per playlist (pseudo-random).
-#
-# That is:
-# (1) A+1,A+2,A+3,B+1,B+2,B+3
-# (2) A+1,B+1,A+2,B+2,A+3,B+3
-# (3) A+2,A+1,A+3,B+1,B+3,B+2
-# (4) A+3,B+1,B+3,A+2,B+2,A+1
-# """
-from copy import deepcopy
+"""
+Transpose exercise content per a new text field in playlist editor.
+
+User input example: `C G c#'
+Result: populate playlist with each exercise in 0, 1, 4 sharps
+
+The distinction of major and minor is immaterial; this is a convenient shorthand.
+
+Exercise ID will appear as EA00DD+16 or EA00DD-2 where you see the midi_vector.
+
+Options:
+(1) loop transpositions per exercise,
+(2) loop transpositions per playlist,
+(3) shuffle transpositions per exercise (pseudo-random),
+(4) shuffle transpositions per playlist (pseudo-random).
+
+That is:
+(1) A+1,A+2,A+3,B+1,B+2,B+3
+(2) A+1,B+1,A+2,B+2,A+3,B+3
+(3) A+2,A+1,A+3,B+1,B+3,B+2
+(4) A+3,B+1,B+3,A+2,B+2,A+1
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from copy import copy
 
 from apps.exercises.constants import sig_to_pc, pseudo_key_to_sig, all_sigs, all_keys
 
+# Number of transposed exercises kept by transpose(), per process.
+TRANSPOSE_CACHE_SIZE = 4096
 
-def transpose(exercise, staff_sig_request):
-    exercise = deepcopy(exercise)
-    sig_orig = exercise.data.get("keySignature")
-    pc_ref_orig = sig_to_pc[sig_orig]
-    key_orig = exercise.data.get("key")
-    if staff_sig_request not in all_sigs:
-        return exercise
-        # Bogus requests should never get this far, due to Django validation
-        # of tranpose_requests and tests in transposition_matrix.
-        # If they did, returning the untransposed exercise more than once
-        # would cause grading problems.
-
-    pc_ref_target = sig_to_pc[staff_sig_request]
+# TODO: enable this as an option in the playlist transposition controls
+# (n.b. the range of the chords must then be read to compute transposed IDs)
+FIT_KEYBOARD = False
 
-    if key_orig == "h":
-        key_target = key_orig
-    else:
-        try:
-            fifth_chain_move = all_sigs.index(staff_sig_request) - all_sigs.index(sig_orig)
-            key_target = all_keys[all_keys.index(key_orig) + 2 * fifth_chain_move]
-        except IndexError:
-            return exercise
-            # ditto comment on return statement above
+_transposed_cache = OrderedDict()
+_transposed_cache_lock = threading.Lock()
 
-    # 12 + not necessary here but keep it in case this function copied to Javascript
-    pc_vector = (12 + pc_ref_target - pc_ref_orig) % 12
 
+def get_midi_range(data):
     midi_all_ex = []
-    for chord in exercise.data["chord"]:
+    for chord in data["chord"]:
         midi_all_ex.extend(chord["visible"] + chord["hidden"])
+    return max(midi_all_ex), min(midi_all_ex)
+
 
-    midi_max_ex = max(midi_all_ex)
-    midi_min_ex = min(midi_all_ex)
+def fit_keyboard(data, pc_vector):
+    """
+    The transposition by `pc_vector` plus octaves that fits the exercise onto
+    the smallest standard keyboard that will accommodate all keys, or None.
+    """
+    midi_max_ex, midi_min_ex = get_midi_range(data)
     midi_mean_floor_ex = (midi_max_ex + midi_min_ex) // 2
     midi_range_ex = midi_max_ex + 1 - midi_min_ex
 
@@ -83,23 +77,52 @@ def transpose(exercise, staff_sig_request):
         midi_mean_floor_target_min, midi_mean_floor_target_min + 12
     )
 
-    midi_vector = None
-
-    if False:
-        # TODO: enable this as an option in the playlist transposition controls
-        # algorithm that fits exercise onto smallest standard keyboard
-        # that will accommodate all keys
-        octave_displ = 0
-        arbitrary_limit = 7
-        while octave_displ < arbitrary_limit and octave_displ > -arbitrary_limit:
-            if (
-                midi_mean_floor_ex + pc_vector + 12 * octave_displ
-            ) in midi_mean_floor_target_range:
-                midi_vector = pc_vector + 12 * octave_displ
-                break
-            if octave_displ >= 0:
-                octave_displ += 1
-            octave_displ *= -1
+    octave_displ = 0
+    arbitrary_limit = 7
+    while octave_displ < arbitrary_limit and octave_displ > -arbitrary_limit:
+        if (
+            midi_mean_floor_ex + pc_vector + 12 * octave_displ
+        ) in midi_mean_floor_target_range:
+            return pc_vector + 12 * octave_displ
+        if octave_displ >= 0:
+            octave_displ += 1
+        octave_displ *= -1
+    return None
+
+
+def get_transposition(data, staff_sig_request):
+    """
+    (midi_vector, key_target) to transpose the exercise `data` to
+    `staff_sig_request`, or None if it is not to be transposed.
+    Unless FIT_KEYBOARD, the chords are not read.
+    """
+    sig_orig = data.get("keySignature")
+    pc_ref_orig = sig_to_pc[sig_orig]
+    key_orig = data.get("key")
+    if staff_sig_request not in all_sigs:
+        return None
+        # Bogus requests should never get this far, due to Django validation
+        # of tranpose_requests and tests in transposition_matrix.
+        # If they did, returning the untransposed exercise more than once
+        # would cause grading problems.
+
+    pc_ref_target = sig_to_pc[staff_sig_request]
+
+    if key_orig == "h":
+        key_target = key_orig
+    else:
+        try:
+            fifth_chain_move = all_sigs.index(staff_sig_request) - all_sigs.index(sig_orig)
+            key_target = all_keys[all_keys.index(key_orig) + 2 * fifth_chain_move]
+        except IndexError:
+            return None
+            # ditto comment on return statement above
+
+    # 12 + not necessary here but keep it in case this function copied to Javascript
+    pc_vector = (12 + pc_ref_target - pc_ref_orig) % 12
+
+    if FIT_KEYBOARD:
+        midi_vector = fit_keyboard(data, pc_vector)
     else:
         # simply transpose upwards
         midi_vector = pc_vector
@@ -107,20 +130,75 @@ def transpose(exercise, staff_sig_request):
 
     if midi_vector == None:
         # No transposition operation was identified
-        return exercise
+        return None
         # ditto comment on return statement above
 
-    # make the transposition
-    for chord in exercise.data["chord"]:
-        transposed = [note + midi_vector for note in chord["visible"]]
-        chord.update(visible=transposed)
+    return midi_vector, key_target
 
-        transposed = [note + midi_vector for note in chord["hidden"]]
-        chord.update(hidden=transposed)
 
-    exercise.data["key"] = key_target
-    exercise.data["keySignature"] = staff_sig_request
+def transposed_id(exercise_id, data, staff_sig_request):
+    """The ID of the exercise transposed to `staff_sig_request`."""
+    transposition = get_transposition(data, staff_sig_request)
+    if transposition is None:
+        return exercise_id
+    midi_vector, _ = transposition
+    return f"{exercise_id}{midi_vector}"
 
-    exercise.id = f"{exercise.id}{midi_vector}"
 
+def transpose_data(exercise_id, data, staff_sig_request):
+    """
+    The ID and data of the exercise transposed to `staff_sig_request`.
+    `data` is not modified; the returned data shares its untransposed parts.
+    """
+    transposition = get_transposition(data, staff_sig_request)
+    if transposition is None:
+        return exercise_id, data
+    midi_vector, key_target = transposition
+
+    # make the transposition
+    transposed_data = {
+        **data,
+        "chord": [
+            {
+                **chord,
+                "visible": [note + midi_vector for note in chord["visible"]],
+                "hidden": [note + midi_vector for note in chord["hidden"]],
+            }
+            for chord in data["chord"]
+        ],
+        "key": key_target,
+        "keySignature": staff_sig_request,
+    }
+    return f"{exercise_id}{midi_vector}", transposed_data
+
+
+def data_digest(data):
+    """
+    A digest of exercise data, to key transpositions by: unlike `updated`,
+    which is truncated to the second, it changes with every edit.
+    """
+    return hashlib.sha1(
+        json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def transpose(exercise, staff_sig_request):
+    """
+    A copy of `exercise` transposed to `staff_sig_request`. Transpositions
+    are cached per exercise content, so their data must not be modified.
+    """
+    key = (exercise.id, data_digest(exercise.data), staff_sig_request)
+    with _transposed_cache_lock:
+        transposed = _transposed_cache.get(key)
+        if transposed is not None:
+            _transposed_cache.move_to_end(key)
+    if transposed is None:
+        transposed = transpose_data(exercise.id, exercise.data, staff_sig_request)
+        with _transposed_cache_lock:
+            _transposed_cache[key] = transposed
+            if len(_transposed_cache) > TRANSPOSE_CACHE_SIZE:
+                _transposed_cache.popitem(last=False)
+
+    exercise = copy(exercise)
+    exercise.id, exercise.data = transposed
     return exercise
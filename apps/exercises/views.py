@@ -1,9 +1,11 @@
 import json
+import re
 
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse, HttpResponseBadRequest
 from django.shortcuts import render
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -11,9 +13,21 @@ from django_tables2 import Column
 
 from apps.exercises.models import Course, Playlist, PerformanceData, User as Performers
 from apps.exercises.tables import PlaylistActivityTable
+from apps.exercises.utils.content_id import decode_id, decode_ids
 
 User = get_user_model()
 
+# the ID of an exercise, followed by its transposition if any (see transposed_id)
+EXERCISE_ID_RE = re.compile(r"(E.{5})([+-]?[0-9]+)?")
+
+
+def is_exercise_id(exercise_id):
+    """Whether `exercise_id` is well-formed, as told without a query."""
+    if not isinstance(exercise_id, str):
+        return False
+    match = EXERCISE_ID_RE.fullmatch(exercise_id)
+    return match is not None and decode_id(match.group(1)) is not None
+
 
 # @staff_member_required
 def playlist_performance_view(request, playlist_id):
@@ -47,7 +61,7 @@ def playlist_performance_view(request, playlist_id):
                     if n != ""
                 ]
             ),
-            "performance_data": performances.filter(user__email=user).first().data,
+            "performance_data": performances.filter(user__email=user).first().attempt_data,
         }
         user_data.update({"exercise_count": len(user_data["performance_data"])})
         data.append(user_data)
@@ -87,29 +101,38 @@ def submit_exercise_performance(request):
     data_playlist_id = performance_data["playlist_ID"]
     data_exercise_num = performance_data["exercise_num"]
 
-    # This shouldn't require a lookup but only a format conversion
-    # between integers (0 thru 1,757,599) and strings (A00AA thru Z99ZZ)
-    course_id = Course.objects.get(id=data_course_id)._id
-    playlist_id = Playlist.objects.get(id=data_playlist_id)._id
-
-    # Convoluted procedure because the Playlist object is not imported to exercise_context.js
-    # so the accuracy of this database write depends on the playlist not having changed since
-    # the call of compileExerciseReport
-    exercise_id = (
-        Playlist.objects.filter(id=data_playlist_id)
-        .first()
-        .get_exercise_obj_by_num(int(data_exercise_num))
-        .id
-    )
+    # IDs are a format conversion between integers (0 thru 1,757,599)
+    # and strings (A00AA thru Z99ZZ), so they need no lookup
+    course_id, playlist_id = decode_ids([data_course_id, data_playlist_id])
+    if course_id is None or playlist_id is None:
+        return HttpResponseBadRequest()
+
+    exercise_id = performance_data.pop("exercise_ID", None)
+    if exercise_id is None:
+        # Reports compiled before exercise_ID was added: the accuracy of this
+        # database write depends on the playlist not having changed since
+        # the call of compileExerciseReport
+        playlist = Playlist.objects.filter(_id=playlist_id).first()
+        entry = playlist.plan.entry(int(data_exercise_num)) if playlist else None
+        if entry is None:
+            return HttpResponseBadRequest()
+        exercise_id = entry.id
+    elif not is_exercise_id(exercise_id):
+        return HttpResponseBadRequest()
+    # an exercise no longer in the playlist, as edited since the performer
+    # loaded it, is still recorded
 
     # Intercept this meaningless prop from being written to the database
     performance_data.pop("exercise_num")
 
-    PerformanceData.submit(
-        user_id=user_id,  # integer
-        course_id=course_id,  # integer
-        playlist_id=playlist_id,  # integer
-        exercise_id=exercise_id,  # string
-        data=performance_data,
-    )
+    try:
+        PerformanceData.submit(
+            user_id=user_id,  # integer
+            course_id=course_id,  # integer
+            playlist_id=playlist_id,  # integer
+            exercise_id=exercise_id,  # string
+            data=performance_data,
+        )
+    except ObjectDoesNotExist:
+        return HttpResponseBadRequest()
     return HttpResponse(status=201)
@@ -0,0 +1,62 @@
+from django.contrib import admin
+from django.db.models import Count, Min
+from django.utils.timezone import now
+
+from apps.jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "queue",
+        "key",
+        "status",
+        "items",
+        "attempts",
+        "created",
+        "lag",
+    )
+    list_filter = ("queue", "status")
+    search_fields = ("key",)
+    readonly_fields = (
+        "queue",
+        "key",
+        "payload",
+        "status",
+        "attempts",
+        "error",
+        "created",
+        "updated",
+        "started",
+    )
+    actions = ("requeue",)
+
+    change_list_template = "admin/jobs/job/change_list.html"
+
+    def has_add_permission(self, request):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        queues = (
+            Job.objects.filter(status=Job.QUEUED)
+            .values("queue")
+            .annotate(depth=Count("id"), oldest=Min("created"))
+            .order_by("queue")
+        )
+        extra_context = extra_context or {}
+        extra_context["queues"] = [
+            dict(queue, lag=now() - queue["oldest"]) for queue in queues
+        ]
+        return super(JobAdmin, self).changelist_view(request, extra_context)
+
+    def items(self, obj):
+        return len(obj.payload)
+
+    items.short_description = "Items"
+
+    def requeue(self, request, queryset):
+        jobs = list(queryset.exclude(status=Job.QUEUED))
+        Job.objects.requeue(jobs)
+        self.message_user(request, f"{len(jobs)} jobs requeued.")
+
+    requeue.short_description = "Requeue selected jobs"
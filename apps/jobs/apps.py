@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    name = "apps.jobs"
+    verbose_name = "Jobs"
+
+    def ready(self):
+        # handlers are registered by the jobs.py module of each app
+        autodiscover_modules("jobs")
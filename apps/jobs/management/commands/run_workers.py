@@ -0,0 +1,68 @@
+import threading
+import time
+
+from django.core.management import BaseCommand
+from django.db import connection
+
+from apps.jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Process queued jobs until interrupted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Only process jobs of this queue (repeatable)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Number of worker threads",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before polling an empty queue again",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once there are no queued jobs left",
+        )
+
+    def handle(self, *args, **options):
+        workers = [
+            threading.Thread(target=self.work, kwargs=options, daemon=True)
+            for _ in range(options["concurrency"])
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            pass
+
+    def work(self, queues=None, sleep=1.0, burst=False, **options):
+        try:
+            while True:
+                job = Job.objects.claim(queues)
+                if job is None:
+                    if burst:
+                        return
+                    time.sleep(sleep)
+                    continue
+                if job.run():
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Job {job} done ({len(job.payload)} items).")
+                    )
+                else:
+                    self.stderr.write(f"Job {job} failed.")
+        finally:
+            # each thread has its own database connection
+            connection.close()
@@ -0,0 +1,76 @@
+import json
+
+from django.db import connections, models, transaction
+from django.utils.timezone import now
+
+
+class JobManager(models.Manager):
+    def enqueue(self, queue, key, payload):
+        """
+        Queue a job, or extend the payload of the job already queued
+        under the same queue and key, so that e.g. many submits to one
+        course are processed together. Returns the id of the job.
+        """
+        with connections["default"].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO {table} "
+                "(queue, key, payload, status, attempts, error, created, updated) "
+                "VALUES (%s, %s, %s, %s, 0, '', NOW(), NOW()) "
+                "ON CONFLICT (queue, key) WHERE status = %s "
+                "DO UPDATE SET payload = {table}.payload || EXCLUDED.payload, "
+                "updated = EXCLUDED.updated "
+                "RETURNING id".format(table=self.model._meta.db_table),
+                [
+                    queue,
+                    key,
+                    json.dumps(payload),
+                    self.model.QUEUED,
+                    self.model.QUEUED,
+                ],
+            )
+            return cursor.fetchone()[0]
+
+    def claim(self, queues=None):
+        """
+        Mark the oldest queued job as running and return it, or None.
+
+        Claimed jobs leave the coalescing index, so jobs enqueued for the
+        same key while one runs are queued anew rather than lost. Jobs left
+        running by a worker that died are queued again first.
+        """
+        self.requeue_stale()
+        with transaction.atomic():
+            jobs = self.filter(status=self.model.QUEUED)
+            if queues:
+                jobs = jobs.filter(queue__in=queues)
+            job = (
+                jobs.select_for_update(skip_locked=True).order_by("created").first()
+            )
+            if job is None:
+                return None
+            job.status = self.model.RUNNING
+            job.attempts += 1
+            job.started = now()
+            job.save(update_fields=["status", "attempts", "started", "updated"])
+        return job
+
+    def requeue_stale(self, timeout=None):
+        """
+        Queue again the jobs running for longer than `timeout` (by default
+        Job.STALE_TIMEOUT), which a worker must have left unfinished.
+        Returns the number of jobs requeued.
+        """
+        timeout = timeout or self.model.STALE_TIMEOUT
+        with transaction.atomic():
+            jobs = list(
+                self.filter(
+                    status=self.model.RUNNING, started__lt=now() - timeout
+                ).select_for_update(skip_locked=True)
+            )
+            self.requeue(jobs)
+        return len(jobs)
+
+    def requeue(self, jobs):
+        for job in jobs:
+            self.enqueue(job.queue, job.key, job.payload)
+            job.delete()
@@ -0,0 +1,42 @@
+# Generated by Django 2.2.28 on 2026-10-17 05:43
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queue', models.CharField(max_length=32, verbose_name='Queue')),
+                ('key', models.CharField(help_text='Jobs queued under the same key are coalesced', max_length=64, verbose_name='Key')),
+                ('payload', django.contrib.postgres.fields.jsonb.JSONField(default=list, verbose_name='Payload')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('failed', 'Failed')], default='queued', max_length=8, verbose_name='Status')),
+                ('attempts', models.IntegerField(default=0, verbose_name='Attempts')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Error')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                ('started', models.DateTimeField(blank=True, null=True, verbose_name='Started')),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'queue', 'created'], name='job_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(status='queued'), fields=('queue', 'key'), name='job_unique_queued_key'),
+        ),
+    ]
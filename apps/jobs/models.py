@@ -0,0 +1,75 @@
+import traceback
+from datetime import timedelta
+
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+from django.db.models import Q
+from django.utils.timezone import now
+
+from apps.jobs.managers import JobManager
+from apps.jobs.registry import get_handler
+
+
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+    )
+    # running jobs not done after this long are deemed abandoned by their
+    # worker, and queued again (see JobManager.requeue_stale)
+    STALE_TIMEOUT = timedelta(hours=1)
+
+    queue = models.CharField("Queue", max_length=32)
+    key = models.CharField(
+        "Key", max_length=64, help_text="Jobs queued under the same key are coalesced"
+    )
+    payload = JSONField("Payload", default=list)
+    status = models.CharField(
+        "Status", max_length=8, choices=STATUS_CHOICES, default=QUEUED
+    )
+    attempts = models.IntegerField("Attempts", default=0)
+    error = models.TextField("Error", blank=True, default="")
+
+    created = models.DateTimeField("Created", auto_now_add=True)
+    updated = models.DateTimeField("Updated", auto_now=True)
+    started = models.DateTimeField("Started", blank=True, null=True)
+
+    objects = JobManager()
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        indexes = [
+            models.Index(fields=["status", "queue", "created"], name="job_status_idx"),
+        ]
+        constraints = [
+            # arbiter of the coalescing upsert in JobManager.enqueue
+            models.UniqueConstraint(
+                fields=["queue", "key"],
+                condition=Q(status="queued"),
+                name="job_unique_queued_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.queue}:{self.key}"
+
+    @property
+    def lag(self):
+        return now() - self.created
+
+    def run(self):
+        """Run the handler of the job, deleting the job once it succeeds."""
+        try:
+            get_handler(self.queue)(self.key, self.payload)
+        except Exception:
+            self.status = self.FAILED
+            self.error = traceback.format_exc()
+            self.save(update_fields=["status", "error", "updated"])
+            return False
+        self.delete()
+        return True
@@ -0,0 +1,20 @@
+handlers = {}
+
+
+def job_handler(queue):
+    """
+    Register the decorated function as the handler of `queue`.
+
+    The handler is called with the key and the payload list of a job,
+    e.g. handler("12", [101, 102]) for two jobs coalesced under key "12".
+    """
+
+    def register(func):
+        handlers[queue] = func
+        return func
+
+    return register
+
+
+def get_handler(queue):
+    return handlers[queue]
@@ -1,6 +1,26 @@
 """
 Custom middleware for HarmonyLab.
 """
+from django.utils.functional import SimpleLazyObject
+
+from apps.accounts.permissions import PermissionResolver
+
+
+class PermissionResolverMiddleware:
+    """
+    Attach a PermissionResolver of the request user as `request.permissions`.
+    It is created on first use, so requests that check no permission cost no
+    query. Must follow AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.permissions = SimpleLazyObject(
+            lambda: PermissionResolver(request.user)
+        )
+        return self.get_response(request)
 
 
 class DisableCSPMiddleware:
@@ -94,6 +94,7 @@ MIDDLEWARE = (
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "harmony.middleware.PermissionResolverMiddleware",
     # "cached_auth.Middleware",
     # Uncomment the next line for simple clickjacking protection:
     # 'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -130,6 +131,7 @@ INSTALLED_APPS = (
     "apps.accounts",
     "apps.exercises",
     "apps.dashboard",
+    "apps.jobs",
     "lab",
     # Third parties
     "django_extensions",
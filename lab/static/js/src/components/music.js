@@ -113,6 +113,56 @@ define([
      */
     initComponent: function () {
       this.initListeners();
+      this.loadPlaylistBundle();
+    },
+    /**
+     * Prefetches the definitions of all exercises of the playlist.
+     * The server answers 304 Not Modified when the bundle is unchanged.
+     *
+     * @return undefined
+     */
+    loadPlaylistBundle: function () {
+      var sheetComponent = this.getComponent("sheet");
+      var bundleUrl = sheetComponent?.exerciseContext?.settings?.definition
+        ?.settings?.definition?.bundleUrl;
+      if (!bundleUrl) {
+        return;
+      }
+      $.ajax({
+        type: "GET",
+        url: bundleUrl,
+        dataType: "json",
+        success: (bundle) => {
+          this.playlistBundle = bundle;
+        },
+      });
+    },
+    /**
+     * Returns the prefetched definition of an exercise of the playlist,
+     * or null if it has not been prefetched. The bundle holds no performer
+     * state, which is read from the playlist progress.
+     *
+     * @param {number} exerciseNum
+     * @return {object|null}
+     */
+    getBundledDefinition: function (exerciseNum) {
+      var definition = this.playlistBundle?.definitions[exerciseNum - 1];
+      if (!definition || definition.exerciseNum !== exerciseNum) {
+        return null;
+      }
+      var progress = this.getComponent("sheet").getPlaylistProgress();
+      var exerciseData = progress?.exercises.find(
+        (exercise) => exercise.exerciseNum === exerciseNum
+      );
+      return Object.assign({}, definition, {
+        exerciseIsPerformed: exerciseData?.exerciseIsPerformed ?? false,
+        exerciseErrorCount: exerciseData?.exerciseErrorCount ?? 0,
+        exerciseList: this.playlistBundle.exerciseList.map((exercise) =>
+          Object.assign({}, exercise, {
+            selected: exercise.name === String(exerciseNum),
+          })
+        ),
+      });
     },
     /**
      * Initializes event listeners.
@@ -188,6 +238,15 @@ define([
         // let currentData = JSON.stringify(setdef.settings.definition, null, 0);
         let newData = {};
         // var testing = (window.location.href.split(".")[0].slice(-5) == "-beta" ? true : false);
+        // definitions prefetched with the playlist bundle spare the requests below
+        const bundledNum = {
+          next: setdef.settings.definition.nextExerciseNum,
+          previous: setdef.settings.definition.previousExerciseNum,
+          first: 1,
+        }[exerciseAction];
+        const bundledData = bundledNum
+          ? this.getBundledDefinition(bundledNum)
+          : null;
         if (exerciseAction === "reload") {
           $.ajax({
             type: "GET",
@@ -214,6 +273,7 @@ define([
         ) {
           if (setdef.settings.definition.forceRedirect)
             window.location.href = setdef.settings.definition.nextExercise;
+          else if (bundledData) newData = bundledData;
           else
             $.ajax({
               type: "GET",
@@ -242,6 +302,7 @@ define([
         ) {
           if (setdef.settings.definition.forceRedirect)
             window.location.href = setdef.settings.definition.previousExercise;
+          else if (bundledData) newData = bundledData;
           else
             $.ajax({
               type: "GET",
@@ -265,20 +326,22 @@ define([
             return null;
           }
         } else if (exerciseAction === "first") {
-          $.ajax({
-            type: "GET",
-            url: "definition",
-            async: false,
-            data: {
-              playlist_name: setdef.settings.definition.playlistName,
-              exercise_id: setdef.settings.definition.firstExerciseId,
-              exercise_num: 1,
-            },
-            dataType: "json",
-            success: function (data) {
-              newData = data;
-            },
-          });
+          if (bundledData) newData = bundledData;
+          else
+            $.ajax({
+              type: "GET",
+              url: "definition",
+              async: false,
+              data: {
+                playlist_name: setdef.settings.definition.playlistName,
+                exercise_id: setdef.settings.definition.firstExerciseId,
+                exercise_num: 1,
+              },
+              dataType: "json",
+              success: function (data) {
+                newData = data;
+              },
+            });
 
           if (!Object.keys(newData).length) {
             console.log("Error finding first exercise!");
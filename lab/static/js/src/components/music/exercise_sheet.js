@@ -333,6 +333,35 @@ define([
 
       return this;
     },
+    /**
+     * Returns the user's progress on all exercises of the playlist,
+     * requested once and again after each saved performance.
+     *
+     * @return {object|null}
+     */
+    getPlaylistProgress: function () {
+      var definition = this.exerciseContext.getDefinition();
+      var progressUrl = definition.settings.definition.progressUrl;
+      if (!this.playlistProgress && progressUrl) {
+        if (!this.playlistProgressListener) {
+          this.playlistProgressListener = () => (this.playlistProgress = null);
+          $(document).on("exercisePerformanceSaved", this.playlistProgressListener);
+        }
+        $.ajax({
+          type: "GET",
+          url: progressUrl,
+          async: false,
+          dataType: "json",
+          success: (progress) => {
+            this.playlistProgress = progress;
+          },
+          error: function (error) {
+            alert("An error occurred while getting the exercise history.");
+          },
+        });
+      }
+      return this.playlistProgress || null;
+    },
     renderExerciseHistory: function () {
       var exc = this.exerciseContext;
       var definition = exc.getDefinition();
@@ -345,25 +374,15 @@ define([
       var html = "";
       var tpl_data = {};
 
-      $.ajax({
-        type: "GET",
-        url:
-          window.location.origin +
-          "/ajax" +
-          window.location.pathname +
-          "history/",
-        async: false,
-        success: function (response) {
-          if (!response["valid"]) {
-            var exerciseData = JSON.parse(response);
-            tpl_data.is_performed = exerciseData.exerciseIsPerformed;
-            tpl_data.latest_err_count = exerciseData.exerciseErrorCount;
-          }
-        },
-        error: function (error) {
-          alert("An error occurred while getting the exercise history.");
-        },
-      });
+      var progress = this.getPlaylistProgress();
+      var exerciseNum = definition.settings.definition.exerciseNum;
+      var exerciseData = progress?.exercises.find(
+        (exercise) => exercise.exerciseNum === exerciseNum
+      );
+      if (exerciseData) {
+        tpl_data.is_performed = exerciseData.exerciseIsPerformed;
+        tpl_data.latest_err_count = exerciseData.exerciseErrorCount;
+      }
 
       html = tpl(tpl_data);
       $historyEl.html(html);
@@ -513,6 +513,7 @@ define([
           exercise_num: parseInt(
             this.definition.getExerciseList()[idx].id.split("/")[1]
           ),
+          exercise_ID: this.definition.exercise.performing_exercise, // string, e.g. EA00AA or EA00AA+2 when transposed
           client_completion_date: new Date(this.timer.end).toJSON(),
           error_tally:
             /* -1 means that errors are not reported (can't recall why not) */
@@ -551,6 +552,7 @@ define([
       })
         .done(function (data) {
           console.log("Exercise performance saved");
+          $(document).trigger("exercisePerformanceSaved");
         })
         .fail(function (jqXHR, textStatus, errorThrown) {
           console.log("Possible save failure", textStatus, errorThrown);
@@ -455,6 +455,7 @@ define(["lodash", "app/config"], function (_, Config) {
       }
 
       exercise.performing_course = definition.courseId;
+      exercise.performing_exercise = definition.exerciseId;
 
       return exercise;
     },
@@ -0,0 +1,105 @@
+import gzip
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.exercises.models import PerformanceData
+from apps.exercises.tests.utils import create_exercise, create_playlist, create_user
+
+
+class PlaylistBundleViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("author@example.com")
+        cls.exercises = [create_exercise(cls.user) for _ in range(12)]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get_bundle(self, playlist):
+        response = self.client.get(self.bundle_url(playlist))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def bundle_url(self, playlist):
+        return reverse("lab:playlist-bundle", kwargs={"playlist_id": playlist.id})
+
+    def test_bundle(self):
+        playlist = create_playlist(self.user, exercises=self.exercises[:3])
+        bundle = self.get_bundle(playlist)
+        self.assertEqual(
+            [exercise["name"] for exercise in bundle["exerciseList"]], ["1", "2", "3"]
+        )
+        self.assertFalse(
+            any(exercise["selected"] for exercise in bundle["exerciseList"])
+        )
+        self.assertEqual(
+            [definition["exerciseId"] for definition in bundle["definitions"]],
+            [exercise.id for exercise in self.exercises[:3]],
+        )
+        self.assertNotIn("exerciseList", bundle["definitions"][0])
+        self.assertNotIn("exerciseIsPerformed", bundle["definitions"][0])
+        self.assertEqual(bundle["definitions"][1]["nextExerciseNum"], 3)
+
+    def test_constant_queries(self):
+        # the plan, which is cached in the database, is read once per bundle
+        small_playlist = create_playlist(self.user, exercises=self.exercises[:2])
+        with CaptureQueriesContext(connection) as queries:
+            self.get_bundle(small_playlist)
+
+        large_playlist = create_playlist(self.user, exercises=self.exercises)
+        with self.assertNumQueries(len(queries)):
+            bundle = self.get_bundle(large_playlist)
+        self.assertEqual(len(bundle["definitions"]), len(self.exercises))
+
+    def test_conditional_get(self):
+        playlist = create_playlist(self.user, exercises=self.exercises[:3])
+        url = self.bundle_url(playlist)
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))  # strong
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        # performances do not change the bundle, which holds no performer state
+        PerformanceData.submit(
+            user_id=self.user.id,
+            course_id=None,
+            playlist_id=playlist._id,
+            exercise_id=self.exercises[0].id,
+            data={"error_tally": 0, "performance_duration_in_seconds": 1},
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.exercises[1].save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_gzip(self):
+        playlist = create_playlist(self.user, exercises=self.exercises[:3])
+        url = self.bundle_url(playlist)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"') and etag.endswith('-gzip"'))
+        self.assertEqual(
+            json.loads(gzip.decompress(response.content)),
+            self.get_bundle(playlist),
+        )
+
+        response = self.client.get(
+            url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        # the uncompressed representation has an ETag of its own
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
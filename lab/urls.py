@@ -18,8 +18,9 @@ from .views import (
     ExerciseView,
     RefreshExerciseDefinition,
     CourseView,
-    exercise_performance_history,
+    playlist_progress_view,
     dev_corpus_bach_json,
+    playlist_bundle_view,
     ChoraleAnalysisDebugView,
 )
 
@@ -34,14 +35,14 @@ urlpatterns = [
     path("ajax/set-volume/", set_preferred_volume, name="user-preferred-volume"),
     # Exercise Performance History
     path(
-        "ajax/playlists/<str:playlist_id>/<int:exercise_num>/history/",
-        exercise_performance_history,
-        name="exercise-performance-history",
+        "ajax/playlists/<str:playlist_id>/progress/",
+        playlist_progress_view,
+        name="playlist-progress",
     ),
     path(
-        "ajax/playlists/<str:playlist_id>/history/",
-        exercise_performance_history,
-        name="exercise-performance-history",
+        "ajax/playlists/<str:course_id>/<str:playlist_id>/progress/",
+        playlist_progress_view,
+        name="playlist-progress",
     ),
     path("exercises/add/", AddExerciseView.as_view(), name="add-exercise"),
     # Performance
@@ -72,6 +73,16 @@ urlpatterns = [
         RefreshExerciseDefinition.as_view(),
         name="refresh-definition",
     ),
+    path(
+        "playlists/<str:playlist_id>/bundle/",
+        playlist_bundle_view,
+        name="playlist-bundle",
+    ),
+    path(
+        "playlists/<str:course_id>/<str:playlist_id>/bundle/",
+        playlist_bundle_view,
+        name="playlist-bundle",
+    ),
     path(
         "playlists/<str:playlist_id>/<int:exercise_num>/",
         PlaylistView.as_view(),
@@ -7,8 +7,15 @@ from django.db.models import When, Case, Q
 from django.urls import reverse
 from django.http import HttpResponse, Http404, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
 from django.utils.decorators import method_decorator
-from django.utils.http import urlencode
+from django.utils.http import quote_etag, urlencode
+from django.utils.text import compress_string
 from django.views.generic import View, TemplateView, RedirectView
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
 
@@ -28,7 +35,9 @@ from apps.exercises.models import (
     PerformanceData,
     PlaylistCourseOrdered,
 )
+from apps.exercises.utils.playlist_plan import get_plan_version
 
+import hashlib
 import json
 import copy
 import os
@@ -128,86 +137,103 @@ class PlayView(RequirejsTemplateView):
 
 # Reusable function to generate exercise_context. Accounts for null inputs.
 # Catered to the current desired behavior of the 3 views below. If adding more views or changing desired behavior, changes to this function will be needed
+def get_exercise_list(plan, playlist_id, exercise_num=None):
+    """The entries of a playlist's plan, as listed in the lab."""
+    return [
+        dict(
+            id=f"{playlist_id}/{entry.num}",
+            name=f"{entry.num}",
+            url=entry.url,
+            selected=exercise_num == entry.num,
+        )
+        for entry in plan.entries
+    ]
+
+
 def generate_exercise_context(
     exercise_num=None,
     exercise=None,
     user=None,
     playlist=None,
     course=None,
+    playlist_performance=None,
+    plan=None,
+    exercise_list=None,
 ):
+    """
+    `playlist_performance` is the user's performance of the playlist in the
+    course; it is looked up unless given, or False if known to be missing.
+    `plan` and `exercise_list` are those of the playlist, read and built
+    unless given, e.g. once for all the exercises of a playlist.
+    """
     course_id = course.id if course else None
     playlist_id = playlist.id if playlist else None
+    if plan is None and playlist:
+        plan = playlist.plan
     exercise_context = {}
-    prev_num = playlist.prev_num(exercise_num) if playlist else None
-    next_num = playlist.next_num(exercise_num) if playlist else None
+    prev_num = plan.prev_num(exercise_num) if plan else None
+    next_num = plan.next_num(exercise_num) if plan else None
 
     next_exercise_obj = (
-        playlist.get_exercise_obj_by_num(next_num)
-        if playlist
+        plan.entry(next_num)
+        if plan
         else Exercise.objects.filter(authored_by=user, id__gt=exercise.id)
         .order_by("id")
         .first()
     )
     next_exercise_id = next_exercise_obj.id if next_exercise_obj != None else None
     next_exercise_url = (
-        playlist.get_exercise_url_by_num(num=next_num, course_id=course_id)
-        if playlist
+        plan.url(num=next_num, course_id=course_id)
+        if plan
         else reverse("lab:exercise-view", kwargs={"exercise_id": next_exercise_id})
         if next_exercise_id
         else None
     )
 
     prev_exercise_obj = (
-        playlist.get_exercise_obj_by_num(prev_num)
-        if playlist
+        plan.entry(prev_num)
+        if plan
         else Exercise.objects.filter(authored_by=user, id__lt=exercise.id)
         .order_by("-id")
         .first()
     )
     prev_exercise_id = prev_exercise_obj.id if prev_exercise_obj != None else None
     prev_exercise_url = (
-        playlist.get_exercise_url_by_num(num=prev_num, course_id=course_id)
-        if playlist
+        plan.url(num=prev_num, course_id=course_id)
+        if plan
         else reverse("lab:exercise-view", kwargs={"exercise_id": prev_exercise_id})
         if prev_exercise_id
         else None
     )
-    first_exercise_obj = playlist.get_exercise_obj_by_num(1) if playlist else None
+    first_exercise_obj = plan.entry(1) if plan else None
     first_exercise_id = (
         first_exercise_obj.id
         if first_exercise_obj and first_exercise_obj.id != exercise.id
         else None
     )
     force_redirect = False
-    exercise_list = []
-    if playlist:
-        for num, _ in enumerate(playlist.exercise_list, 1):
-            exercise_list.append(
-                dict(
-                    id=f"{playlist_id}/{num}",
-                    name=f"{num}",
-                    url=playlist.get_exercise_url_by_num(num),
-                    selected=exercise_num == num,
-                )
-            )
+    if plan:
+        if exercise_list is None:
+            exercise_list = get_exercise_list(plan, playlist_id, exercise_num)
     else:
         force_redirect = True
         url = reverse("lab:exercise-view", kwargs={"exercise_id": exercise.id})
-        exercise_list.append(
+        exercise_list = [
             dict(
                 id=f"{exercise.id}",
                 name=f"{exercise.id}",
                 url=url,
                 selected=True,
             )
-        )
+        ]
 
     # TODO: what is the current functionality of this?
     exercise_is_performed = False
     exercise_error_count = 0
-    playlist_performance = PerformanceData.objects.filter(
-        playlist=playlist, user=user, course=course
-    ).last()
+    if playlist_performance is None:
+        playlist_performance = PerformanceData.objects.filter(
+            playlist=playlist, user=user, course=course
+        ).last()
     if playlist_performance:
         exercise_is_performed = playlist_performance.exercise_is_performed(exercise.id)
         exercise_error_count = playlist_performance.exercise_error_count(exercise.id)
@@ -228,6 +254,22 @@ def generate_exercise_context(
             "exerciseErrorCount": exercise_error_count,
             "playlistName": playlist_id,
             "courseId": course_id,
+            "progressUrl": reverse(
+                "lab:playlist-progress",
+                kwargs={"playlist_id": playlist_id, "course_id": course_id}
+                if course_id
+                else {"playlist_id": playlist_id},
+            )
+            if playlist
+            else None,
+            "bundleUrl": reverse(
+                "lab:playlist-bundle",
+                kwargs={"playlist_id": playlist_id, "course_id": course_id}
+                if course_id
+                else {"playlist_id": playlist_id},
+            )
+            if playlist
+            else None,
             # this variable is used in the exercise preview mode, where the only way to change the displayed exercise is to redirect the URL
             "forceRedirect": force_redirect,
         }
@@ -247,11 +289,7 @@ class PlaylistView(RequirejsView):
         if playlist is None:
             raise Http404("Playlist with this name or ID does not exist.")
 
-        if (
-            not playlist.is_public
-            and not playlist.authored_by == request.user
-            and not request.user.pk in playlist.authored_by.content_permits
-        ):
+        if not request.permissions.can_view(playlist):
             raise PermissionDenied
 
         # Prevents "None" in URL by redirecting to view without course_id in URL
@@ -269,7 +307,7 @@ class PlaylistView(RequirejsView):
                 exercise_num=1,
             )
 
-        exercise = playlist.get_exercise_obj_by_num(exercise_num)
+        exercise = playlist.plan.entry(exercise_num)
         if exercise is None:
             raise Http404("This playlist has no exercises.")
 
@@ -292,10 +330,9 @@ class PlaylistView(RequirejsView):
             course_link = reverse("lab:course-view", kwargs={"course_id": course_id})
             context["course_link"] = course_link
             if (
-                course_performed.performance_dict.get(str(request.user), {}).get(
-                    playlist_id, "X"
-                )
-            ) != "X":
+                course_performed.get_progress_of(request.user).get(playlist_id, "X")
+                != "X"
+            ):
                 playlist_previously_passed = True
 
         context["playlist_previously_passed"] = playlist_previously_passed
@@ -358,7 +395,7 @@ class RefreshExerciseDefinition(RequirejsView):
         exercise = (
             Exercise.objects.filter(id=exercise_id).first()
             if exercise_id
-            else playlist.get_exercise_obj_by_num(exercise_num)
+            else playlist.plan.entry(exercise_num)
         )
         if exercise is None:
             raise Http404("Exercise not found.")
@@ -384,6 +421,83 @@ class RefreshExerciseDefinition(RequirejsView):
         return JsonResponse(data=exercise_context)
 
 
+@login_required
+def playlist_bundle_view(request, playlist_id, course_id=None):
+    """
+    The exercise definitions of every exercise of a playlist, as per
+    RefreshExerciseDefinition, so that the lab can prefetch them.
+    The exercise list is shared by all definitions, without its selection.
+    The definitions hold no performer state, which the lab reads from the
+    playlist progress (see playlist_progress_view).
+    """
+    playlist = Playlist.objects.filter(id=playlist_id).first()
+    if playlist is None:
+        raise Http404("Playlist with this name or ID does not exist.")
+
+    if not request.permissions.can_view(playlist):
+        raise PermissionDenied
+
+    course = get_object_or_404(Course, id=course_id) if course_id else None
+
+    # the plan version changes with the playlist entries (see PlaylistPlan)
+    exercises_updated = playlist.exercises.aggregate(models.Max("updated"))
+    digest = hashlib.md5(
+        json.dumps(
+            [
+                playlist._id,
+                get_plan_version(playlist._id),
+                str(playlist.updated),
+                str(exercises_updated["updated__max"]),
+            ]
+        ).encode()
+    ).hexdigest()
+    # compressed here rather than by gzip_page, which would weaken the ETag:
+    # the encoding suffix keeps it strong, as it differs per representation
+    accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    use_gzip = bool(re_accepts_gzip.search(accept_encoding))
+    etag = quote_etag(f"{digest}-gzip" if use_gzip else digest)
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        plan = playlist.plan
+        # none selected, and shared by all definitions
+        exercise_list = get_exercise_list(plan, playlist.id)
+        definitions = []
+        for entry in plan.entries:
+            definition = generate_exercise_context(
+                entry.num,
+                entry,
+                request.user,
+                playlist,
+                course,
+                playlist_performance=False,
+                plan=plan,
+                exercise_list=exercise_list,
+            )
+            del definition["exerciseList"]
+            del definition["exerciseIsPerformed"]
+            del definition["exerciseErrorCount"]
+            definitions.append(definition)
+
+        response = JsonResponse(
+            {
+                "playlistName": playlist.id,
+                "courseId": course_id,
+                "exerciseList": exercise_list,
+                "definitions": definitions,
+            }
+        )
+        if use_gzip:
+            response.content = compress_string(response.content)
+            response["Content-Encoding"] = "gzip"
+            response["Content-Length"] = str(len(response.content))
+    response["ETag"] = etag
+    patch_vary_headers(response, ("Accept-Encoding",))
+    # browsers revalidate the bundle with If-None-Match on each use
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 def dev_corpus_bach_json(request, filename):
     """Serve exported corpus JSON files from data/corpus/bach during development.
 
@@ -428,11 +542,7 @@ class ExerciseView(RequirejsView):
     def get(self, request, exercise_id, *args, **kwargs):
         exercise = get_object_or_404(Exercise, id=exercise_id)
 
-        if (
-            not exercise.is_public
-            and not exercise.authored_by == request.user
-            and not request.user.pk in exercise.authored_by.content_permits
-        ):
+        if not request.permissions.can_view(exercise):
             raise PermissionDenied
 
         context = {"group_list": []}
@@ -460,11 +570,7 @@ class CourseView(RequirejsView):
     def get(self, request, course_id, *args, **kwargs):
         course = get_object_or_404(Course, id=course_id)
 
-        if (
-            not course.is_public
-            and not course.authored_by == request.user
-            and not request.user.pk in course.authored_by.content_permits
-        ):
+        if not request.permissions.can_view(course):
             raise PermissionDenied
 
         whens = []
@@ -491,7 +597,7 @@ class CourseView(RequirejsView):
         )
 
         user_instance = User.objects.get(pk=request.user.id)
-        user_completion = course.performance_dict.get(str(user_instance), None)
+        user_completion = course.get_progress_of(user_instance)
 
         if user_completion:
             augmented_playlists = map(
@@ -572,44 +678,48 @@ class AddExerciseView(View):
         return JsonResponse(status=201, data={"id": exercise.id})
 
 
-@login_required()
-@method_decorator(csrf_exempt)
-def exercise_performance_history(
-    request, playlist_name, exercise_num=1, *args, **kwargs
-):
-    # TODO: change this
-    # yes, why is course id not also passed to this function?
-    playlist = Playlist.objects.filter(
-        Q(name=playlist_name) | Q(id=playlist_name)
-    ).first()
+@login_required
+def playlist_progress_view(request, playlist_id, course_id=None):
+    """
+    Whether the user performed each exercise of a playlist in a course, the
+    error count of their latest graded attempt and their first pass,
+    from the summary of their performance.
+    """
+    playlist = Playlist.objects.filter(id=playlist_id).first()
     if playlist is None:
-        raise Http404("Playlist with this name or ID does not exist.")
+        raise Http404("Playlist with this ID does not exist.")
 
-    if (
-        not playlist.is_public
-        and not playlist.authored_by == request.user
-        and not request.user.pk in playlist.authored_by.content_permits
-    ):
+    if not request.permissions.can_view(playlist):
         raise PermissionDenied
 
-    exercise = playlist.get_exercise_obj_by_num(exercise_num)
-    if exercise is None:
-        raise Http404("This playlist has no exercises.")
-
-    playlist_performance = PerformanceData.objects.filter(
-        playlist=playlist, user=request.user
-    ).last()
+    performances = PerformanceData.objects.filter(playlist=playlist, user=request.user)
+    if course_id:
+        performances = performances.filter(course__id=course_id)
+    else:
+        performances = performances.filter(course=None)
+    playlist_performance = performances.defer("data").first()
+    summary = (
+        playlist_performance.attempt_summary
+        if playlist_performance
+        else {"exercises": {}}
+    )
 
-    exercise_data = json.dumps(
-        {
-            "exerciseIsPerformed": playlist_performance.exercise_is_performed(
-                exercise.id
-            )
-            if playlist_performance
-            else False,
-            "exerciseErrorCount": playlist_performance.exercise_error_count(exercise.id)
-            if playlist_performance
-            else 0,
-        }
+    exercises = []
+    for entry in playlist.plan.entries:
+        exercise_summary = summary["exercises"].get(entry.id)
+        exercises.append(
+            {
+                "exerciseNum": entry.num,
+                "exerciseId": entry.id,
+                "exerciseIsPerformed": exercise_summary is not None,
+                "exerciseErrorCount": exercise_summary["error_count"]
+                if exercise_summary
+                else 0,
+                "exerciseFirstPass": exercise_summary["first_pass"]
+                if exercise_summary
+                else None,
+            }
+        )
+    return JsonResponse(
+        {"playlistName": playlist.id, "courseId": course_id, "exercises": exercises}
     )
-    return HttpResponse(exercise_data, status=200)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Time a search of exercises by data type and key signature, done as before
+Exercise.data became jsonb (every exercise loaded and its data filtered in
+Python) and as now (filtered in the database through the indexes of
+migration 0059), and print the query plan of the latter.
+
+Runs against the configured database, read-only.
+
+Usage (from repo root):
+  python scripts/benchmark_exercise_search.py --type chorale --key-signature b
+"""
+
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "harmony.settings.local")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connections  # noqa: E402
+
+from apps.exercises.models import Exercise  # noqa: E402
+
+
+def python_search(exercise_type, key_signature):
+    return [
+        exercise.pk
+        for exercise in Exercise.objects.only("_id", "data", "data_order")
+        if exercise.data.get("type") == exercise_type
+        and (key_signature is None or exercise.data.get("keySignature") == key_signature)
+    ]
+
+
+def database_search_queryset(exercise_type, key_signature):
+    queryset = Exercise.objects.filter(data__contains={"type": exercise_type})
+    if key_signature is not None:
+        queryset = queryset.filter(data__keySignature=key_signature)
+    return queryset.values_list("_id", flat=True)
+
+
+def database_search(exercise_type, key_signature):
+    return list(database_search_queryset(exercise_type, key_signature))
+
+
+def best_time(search, repeat, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = search(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--type", default="chorale")
+    parser.add_argument("--key-signature", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{Exercise.objects.count()} exercises")
+    python_seconds, python_pks = best_time(
+        python_search, args.repeat, args.type, args.key_signature
+    )
+    database_seconds, database_pks = best_time(
+        database_search, args.repeat, args.type, args.key_signature
+    )
+    assert sorted(python_pks) == sorted(database_pks)
+
+    print(f"{'search':>10} {'matches':>8} {'ms':>10}")
+    print(f"{'python':>10} {len(python_pks):>8} {python_seconds * 1000:>10.2f}")
+    print(f"{'database':>10} {len(database_pks):>8} {database_seconds * 1000:>10.2f}")
+
+    sql, params = database_search_queryset(
+        args.type, args.key_signature
+    ).query.sql_with_params()
+    with connections["default"].cursor() as cursor:
+        cursor.execute(f"EXPLAIN ANALYZE {sql}", params)
+        print()
+        for (line,) in cursor.fetchall():
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Time the rendering of the performance details table (dashboard
+playlist_performance_view) against the number of attempts, to check that
+its cost grows linearly: the time per attempt should stay flat as the
+attempt count doubles.
+
+No database is needed: synthetic attempts are summarized and rendered
+with the same helpers the view uses.
+
+Usage (from repo root):
+  python scripts/benchmark_performance_details.py --exercises 20 --max-attempts 32000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "harmony.settings.local")
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.dashboard.views.performance import exercise_cells  # noqa: E402
+from apps.exercises.utils.summary import summarize  # noqa: E402
+
+
+def synthetic_attempts(count, exercise_ids):
+    attempts = []
+    for i in range(count):
+        attempts.append(
+            {
+                "id": random.choice(exercise_ids),
+                "performed_at": f"2024-{1 + i // 40000 % 12:02d}-{1 + i // 1440 % 28:02d} "
+                f"{i // 60 % 24:02d}:{i % 60:02d}:00",
+                "error_tally": random.choice([0, 0, 1, 2, "n/a"]),
+                "performance_duration_in_seconds": random.uniform(5, 120),
+                "tempo_mean_semibreves_per_min": random.uniform(10, 30),
+                "tempo_rating": random.uniform(0, 5),
+            }
+        )
+    return attempts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--exercises", type=int, default=20)
+    parser.add_argument("--min-attempts", type=int, default=500)
+    parser.add_argument("--max-attempts", type=int, default=32000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    exercise_ids = [
+        f"EA00{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(args.exercises)
+    ]
+    exercise_urls_by_id = {
+        exercise_id: f"/playlists/PA00AA/{num}"
+        for num, exercise_id in enumerate(exercise_ids, 1)
+    }
+
+    print(f"{'attempts':>10} {'total ms':>10} {'us/attempt':>11}")
+    count = args.min_attempts
+    while count <= args.max_attempts:
+        attempts = synthetic_attempts(count, exercise_ids)
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            summary = summarize(attempts)
+            exercise_cells(attempts, summary, exercise_urls_by_id)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{count:>10} {best * 1000:>10.2f} {best / count * 1e6:>11.2f}")
+        count *= 2
+
+
+if __name__ == "__main__":
+    main()